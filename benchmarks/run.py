@@ -0,0 +1,277 @@
+"""
+Benchmarks for the core backup paths.
+
+    python -m benchmarks.run --scale small --output results.json
+    python -m benchmarks.run --scale medium --baseline baseline.json
+    python -m benchmarks.run --save-baseline baseline.json
+
+Every case works in a temporary backup root built from synthetic saves,
+so the real config and backups are never touched.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from godforsaken_save_manager.common.constants import INDEX_FILE_NAME, get_app_version
+from godforsaken_save_manager.core import config_manager
+from godforsaken_save_manager.core.backup_manager import BackupManager
+from godforsaken_save_manager.core.manifest import Manifest
+from godforsaken_save_manager.i18n.translator import init_translator, t
+
+from .synthetic import make_save_tree, mutate_save_tree, point_config_at, populate_snapshots
+
+MIB = 1024 * 1024
+
+SCALES = {
+    "small": {"files": 50, "bytes": 5 * MIB, "histories": [10, 100], "repeat": 5},
+    "medium": {"files": 200, "bytes": 50 * MIB, "histories": [10, 1000], "repeat": 5},
+    "large": {"files": 1000, "bytes": 200 * MIB, "histories": [10, 1000, 10000], "repeat": 3},
+}
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: List[float]
+    params: Dict[str, object] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "median": statistics.median(self.seconds),
+            "min": min(self.seconds),
+            "runs": len(self.seconds),
+            "params": self.params,
+        }
+
+
+def measure(func: Callable, repeat: int, setup: Optional[Callable] = None, loops: int = 1) -> List[float]:
+    """Times func `repeat` times; setup runs untimed before each run and its result is passed to func."""
+    times = []
+    # Core code reports progress with print(); keep that out of the output
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            for _ in range(loops):
+                func(state) if setup else func()
+            times.append((time.perf_counter() - start) / loops)
+    return times
+
+
+class Workspace:
+    """A temporary game save plus backup root that the config points at."""
+
+    def __init__(self, base: Path, name: str, **config):
+        self.root = base / name
+        self.game_save = self.root / "game_save"
+        self.backup_root = self.root / "game_save_my_bak"
+        self.config = config
+        point_config_at(self.backup_root, self.game_save, **config)
+
+    def activate(self) -> BackupManager:
+        """Returns a new manager on this workspace, as a fresh process would create it."""
+        config_manager.flush_config()
+        config_manager.DEFAULT_BACKUP_ROOT_PATH = self.backup_root
+        return BackupManager()
+
+    def fresh_backup_root(self) -> BackupManager:
+        config_manager.flush_config()
+        shutil.rmtree(self.backup_root, ignore_errors=True)
+        point_config_at(self.backup_root, self.game_save, **self.config)
+        return BackupManager()
+
+
+def bench_backup_restore(base: Path, scale: dict, change_ratio: float) -> List[Result]:
+    params = {"files": scale["files"], "bytes": scale["bytes"], "change_ratio": change_ratio}
+    repeat = scale["repeat"]
+    ws = Workspace(base, "backup")
+    files = make_save_tree(ws.game_save, scale["files"], scale["bytes"])
+    results = [Result("backup.full", measure(
+        lambda manager: manager.backup(incremental=False), repeat, setup=ws.fresh_backup_root
+    ), params)]
+
+    with contextlib.redirect_stdout(sys.stderr):
+        manager = ws.fresh_backup_root()
+        manager.backup()
+    generation = iter(range(1, 1_000_000))
+
+    def changed_save() -> BackupManager:
+        mutate_save_tree(ws.game_save, files, change_ratio, next(generation))
+        return manager
+
+    results.append(Result("backup.incremental", measure(
+        lambda m: m.backup(), repeat, setup=changed_save
+    ), params))
+    latest = manager.list_backups()[0].path
+    results.append(Result("restore", measure(lambda: manager.restore(latest), repeat), params))
+    return results
+
+
+def bench_history(base: Path, snapshots: int, repeat: int) -> List[Result]:
+    params = {"snapshots": snapshots}
+    ws = Workspace(base, f"history_{snapshots}")
+    make_save_tree(ws.game_save, 20, MIB)
+    manager = ws.activate()
+    with contextlib.redirect_stdout(sys.stderr):
+        manager.backup()
+    template = Manifest.load(manager.list_backups()[0].path)
+    populate_snapshots(ws.backup_root, template, snapshots)
+
+    def cold_manager() -> BackupManager:
+        (ws.backup_root / INDEX_FILE_NAME).unlink(missing_ok=True)
+        return ws.activate()
+
+    results = [
+        Result(f"list_backups.cold[n={snapshots}]",
+               measure(lambda m: m.list_backups(), repeat, setup=cold_manager), params),
+    ]
+    warm = ws.activate()
+    warm.list_backups()
+    results.append(Result(f"list_backups.warm[n={snapshots}]", measure(warm.list_backups, repeat), params))
+
+    def history_over_limit() -> BackupManager:
+        # Drop 10% of each kind on every run
+        pruned = ws.fresh_backup_root()
+        pruned.backup()
+        populate_snapshots(ws.backup_root, template, snapshots)
+        pruned = ws.activate()
+        pruned.config["max_history"] = max(1, int(snapshots * 0.9) // 2)
+        pruned._save_config()
+        return pruned
+
+    results.append(Result(f"enforce_max_history[n={snapshots}]",
+                          measure(lambda m: m._enforce_max_history(), repeat, setup=history_over_limit), params))
+    return results
+
+
+def bench_config(base: Path, repeat: int) -> List[Result]:
+    ws = Workspace(base, "config")
+    ws.activate()
+    config_file = ws.backup_root / config_manager.CONFIG_FILE_NAME
+    loops = 1000
+
+    def touched():
+        # A newer mtime makes the store re-read the file
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    config = config_manager.load_config()
+    counter = iter(range(1_000_000_000))
+
+    def save_changed(immediate: bool):
+        # Unchanged configs are never written, so change a note on every save
+        config["notes"]["benchmark"] = str(next(counter))
+        config_manager.save_config(config, immediate=immediate)
+
+    results = [
+        Result("config.load.cached", measure(config_manager.load_config, repeat, loops=loops)),
+        Result("config.load.cold", measure(lambda _: config_manager.load_config(), repeat * 20, setup=touched)),
+        Result("config.save.debounced", measure(lambda: save_changed(False), repeat, loops=loops)),
+        Result("config.save.immediate", measure(lambda: save_changed(True), repeat, loops=50)),
+    ]
+    config_manager.flush_config()
+    return results
+
+
+def bench_translator(repeat: int) -> List[Result]:
+    init_translator("en_US")
+    loops = 10_000
+    return [
+        Result("translator.t", measure(lambda: t('ui.main_window.backup_button'), repeat, loops=loops)),
+        Result("translator.t.format",
+               measure(lambda: t('ui.dialogs.backup_success', timestamp="2025-11-06_18-30-47"), repeat, loops=loops)),
+        Result("translator.t.missing", measure(lambda: t('ui.no_such.key'), repeat, loops=loops)),
+    ]
+
+
+def run(scale_name: str, change_ratio: float) -> dict:
+    scale = SCALES[scale_name]
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory(prefix="gfsm_bench_") as tmp:
+        base = Path(tmp)
+        steps = [
+            ("backup/restore", lambda: bench_backup_restore(base, scale, change_ratio)),
+            *[(f"history n={n}", lambda n=n: bench_history(base, n, scale["repeat"])) for n in scale["histories"]],
+            ("config", lambda: bench_config(base, scale["repeat"])),
+            ("translator", lambda: bench_translator(scale["repeat"])),
+        ]
+        for label, step in steps:
+            print(f"Running {label}...", file=sys.stderr)
+            results.extend(step())
+        config_manager.flush_config()
+    return {
+        "meta": {
+            "app_version": get_app_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale_name,
+            "change_ratio": change_ratio,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {r.name: r.to_dict() for r in results},
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Prints current medians against the baseline. Returns the names that got slower than allowed."""
+    regressions = []
+    print(f"{'benchmark':40s} {'baseline':>12s} {'current':>12s} {'ratio':>7s}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"{name:40s} {'-':>12s} {result['median'] * 1000:10.3f}ms {'new':>7s}")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        flag = " !" if ratio > 1 + tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:40s} {base['median'] * 1000:10.3f}ms {result['median'] * 1000:10.3f}ms {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def print_results(results: dict):
+    for name, result in results["results"].items():
+        print(f"{name:40s} median {result['median'] * 1000:10.3f}ms  min {result['min'] * 1000:10.3f}ms")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--change-ratio", type=float, default=0.05, help="share of files changed between backups")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a stored results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", type=Path, help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.change_ratio)
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline["meta"].get("scale") != args.scale:
+            print(f"Warning: baseline was recorded at scale {baseline['meta'].get('scale')}", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Slower than baseline: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    else:
+        print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Generators for synthetic game saves and backup roots."""
+
+import json
+import os
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from godforsaken_save_manager.common import helpers
+from godforsaken_save_manager.common.constants import CONFIG_FILE_NAME, PROFILE_BRIEF_FILE_NAME
+from godforsaken_save_manager.core import config_manager
+from godforsaken_save_manager.core.manifest import Manifest
+
+BASE_PROFILE_MTIME = 1_700_000_000
+
+
+def point_config_at(backup_root: Path, game_save: Path, **overrides):
+    """Makes config_manager use a private backup root, so benchmarks never touch the real config."""
+    backup_root.mkdir(parents=True, exist_ok=True)
+    config_manager.DEFAULT_BACKUP_ROOT_PATH = backup_root
+    config = dict(config_manager.DEFAULTS, notes={})
+    config.update(game_save_path=str(game_save), backup_root_path=str(backup_root), language="en_US")
+    config.update(overrides)
+    (backup_root / CONFIG_FILE_NAME).write_text(json.dumps(config), encoding="utf-8")
+
+
+def make_save_tree(root: Path, file_count: int, total_bytes: int, seed: int = 0) -> List[Path]:
+    """
+    Writes a save tree of file_count files, spread over a few sub directories,
+    whose sizes follow a long tail like real saves (a few big world files, many small ones).
+    """
+    rng = random.Random(seed)
+    weights = [rng.paretovariate(1.2) for _ in range(file_count)]
+    scale = total_bytes / sum(weights)
+    files = []
+    for i, weight in enumerate(weights):
+        path = root / f"slot_{i % 8}" / f"data_{i:05d}.sav"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(rng.randbytes(max(1, int(weight * scale))))
+        files.append(path)
+    set_profile_mtime(root, BASE_PROFILE_MTIME)
+    return files
+
+
+def set_profile_mtime(root: Path, mtime: float):
+    profile = root / PROFILE_BRIEF_FILE_NAME
+    if not profile.exists():
+        profile.write_bytes(b"profile")
+    os.utime(profile, (mtime, mtime))
+
+
+def mutate_save_tree(root: Path, files: List[Path], change_ratio: float, generation: int, seed: int = 0):
+    """Rewrites a few KB inside change_ratio of the files, like the game saving progress."""
+    rng = random.Random(seed + generation)
+    for path in rng.sample(files, max(1, int(len(files) * change_ratio))):
+        data = bytearray(path.read_bytes())
+        offset = rng.randrange(len(data))
+        patch = rng.randbytes(min(4096, len(data) - offset))
+        data[offset:offset + len(patch)] = patch
+        path.write_bytes(data)
+    set_profile_mtime(root, BASE_PROFILE_MTIME + generation * 60)
+
+
+def populate_snapshots(backup_root: Path, manifest: Manifest, count: int, auto_ratio: float = 0.5):
+    """
+    Writes `count` snapshot directories that all point at the objects of one real snapshot.
+    Listing and pruning only look at manifests, so this models a long history cheaply.
+    """
+    config_manager.flush_config()
+    config_file = backup_root / CONFIG_FILE_NAME
+    config = json.loads(config_file.read_text(encoding="utf-8"))
+    for i in range(count):
+        profile_mtime = BASE_PROFILE_MTIME - (i + 1) * 60
+        timestamp = helpers.format_timestamp(datetime.fromtimestamp(profile_mtime))
+        # Interleave the kinds so that both lists grow with the history
+        kind = "auto" if int((i + 1) * auto_ratio) > int(i * auto_ratio) else "manual"
+        Manifest(profile_mtime, manifest.files, manifest.storage).save(backup_root / kind / timestamp)
+        config["notes"][timestamp] = f"synthetic snapshot {i}"
+    config_file.write_text(json.dumps(config), encoding="utf-8")
+
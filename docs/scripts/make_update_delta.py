@@ -0,0 +1,54 @@
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+# Run from the project root; the delta format lives in the application package
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+from godforsaken_save_manager.core import delta  # noqa: E402
+
+
+def sha256_of(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def main():
+    """
+    Writes the delta from the previous release's executable to the new one and
+    prints the matching entry for the "deltas" list of version.json.
+    The entry is only printed if the delta is smaller than the full download.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old_exe", type=Path)
+    parser.add_argument("new_exe", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--from-version", required=True)
+    parser.add_argument("--url", required=True, help="download URL of the delta file")
+    args = parser.parse_args()
+
+    with open(args.old_exe, "rb") as base, open(args.new_exe, "rb") as target, open(args.output, "wb") as out:
+        size = delta.encode(base, target, out)
+    full_size = args.new_exe.stat().st_size
+    print(f"Delta {args.from_version} -> new: {size} bytes ({size / full_size:.1%} of {full_size})", file=sys.stderr)
+    if size >= full_size:
+        args.output.unlink()
+        print("[]")
+        return
+
+    entry = {
+        "from": args.from_version,
+        "url": args.url,
+        "sha256": sha256_of(args.output),
+        "size": size,
+        "base_size": args.old_exe.stat().st_size,
+    }
+    print(json.dumps([entry]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Headless command line interface (gfsm) for scripted backups.
+
+Only the core package is imported here, never Qt, so the CLI starts quickly
+and runs fine from a scheduler or a batch pipeline.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+from godforsaken_save_manager.core import config_manager
+from godforsaken_save_manager.core.backup_entry import BackupEntry
+from godforsaken_save_manager.core.backup_manager import BackupManager
+from godforsaken_save_manager.core.integrity import CorruptSnapshotError
+
+
+class CliError(Exception):
+    """An error reported to the user without a traceback."""
+
+
+def _entry_to_dict(entry: BackupEntry) -> dict:
+    return {
+        "timestamp": entry.timestamp,
+        "auto": entry.auto,
+        "note": entry.note,
+        "profile_mtime": entry.profile_mtime.isoformat(),
+        "size": entry.size,
+        "path": str(entry.path),
+    }
+
+
+def _find_backup(manager: BackupManager, target: str) -> BackupEntry:
+    """Resolves a timestamp (manual backups first) or a snapshot path."""
+    backups = manager.list_backups()
+    candidates = [b for b in backups if b.timestamp == target]
+    candidates.sort(key=lambda b: b.auto)
+    if candidates:
+        return candidates[0]
+    target_path = Path(target)
+    for backup in backups:
+        if backup.path == target_path:
+            return backup
+    raise CliError(f"Backup not found: {target}")
+
+
+def _is_game_running() -> bool:
+    try:
+        from godforsaken_save_manager.core import process_checker
+    except ImportError:
+        # The mutex check needs pywin32, which only exists on Windows
+        return False
+    return process_checker.is_game_running()
+
+
+def cmd_backup(manager: BackupManager, args) -> dict:
+    incremental = False if args.full else None
+    timestamp = manager.backup(note=args.note, auto=args.auto, incremental=incremental)
+    return {"created": timestamp is not None, "timestamp": timestamp}
+
+
+def cmd_restore(manager: BackupManager, args) -> dict:
+    entry = _find_backup(manager, args.target)
+    if not args.force and _is_game_running():
+        raise CliError("The game is running. Close it first or pass --force.")
+    manager.restore(entry.path)
+    return {"restored": entry.timestamp, "path": str(entry.path)}
+
+
+def cmd_list(manager: BackupManager, args) -> List[dict]:
+    backups = manager.list_backups()
+    if args.auto_only:
+        backups = [b for b in backups if b.auto]
+    elif args.manual_only:
+        backups = [b for b in backups if not b.auto]
+    return [_entry_to_dict(b) for b in backups]
+
+
+def cmd_prune(manager: BackupManager, args) -> dict:
+    max_history = args.max_history if args.max_history is not None else manager.config.get("max_history", 30)
+    deleted = manager.prune(max_history)
+    return {"max_history": max_history, "deleted": [_entry_to_dict(b) for b in deleted]}
+
+
+def _backup_name(path: Path) -> str:
+    return f"auto/{path.name}" if path.parent.name == "auto" else path.name
+
+
+def cmd_verify(manager: BackupManager, args) -> dict:
+    if not args.targets and not args.quick:
+        # Full scrub: objects shared between snapshots are only hashed once
+        results = {_backup_name(path): problems for path, problems in manager.scrub().items()}
+    else:
+        targets = [_find_backup(manager, t) for t in args.targets] if args.targets else manager.list_backups()
+        results = {_backup_name(b.path): manager.verify(b.path, quick=args.quick) for b in targets}
+    return {"ok": not any(results.values()), "problems": {k: v for k, v in results.items() if v}}
+
+
+def cmd_diff(manager: BackupManager, args) -> dict:
+    old = _find_backup(manager, args.a)
+    new = _find_backup(manager, args.b) if args.b else None
+    diff = manager.diff(old.path, new.path if new else None)
+    return {
+        "from": _backup_name(old.path),
+        "to": _backup_name(new.path) if new else "live",
+        "identical": diff.identical,
+        "size_delta": diff.size_delta,
+        "unchanged": diff.unchanged_count,
+        "changes": [
+            {"path": c.path, "status": c.status, "old_size": c.old_size, "new_size": c.new_size,
+             "size_delta": c.size_delta}
+            for c in diff.changes
+        ],
+    }
+
+
+def cmd_stats(manager: BackupManager, args) -> dict:
+    return manager.get_stats()
+
+
+def _print_text(command: str, result):
+    if command == "list":
+        for item in result:
+            kind = "auto  " if item["auto"] else "manual"
+            print(f"{item['timestamp']}  {kind}  {item['size']:>12,d} B  {item['note']}")
+    elif command == "verify":
+        for name, problems in result["problems"].items():
+            for problem in problems:
+                print(f"{name}: {problem}")
+        print("All snapshots intact." if result["ok"] else "Corrupt snapshots found.")
+    elif command == "diff":
+        marks = {"added": "+", "removed": "-", "changed": "~"}
+        for change in result["changes"]:
+            print(f"{marks[change['status']]} {change['path']}  {change['size_delta']:+,d} B")
+        print(f"{result['from']} -> {result['to']}: {len(result['changes'])} files differ, "
+              f"{result['unchanged']} unchanged, {result['size_delta']:+,d} B")
+    else:
+        for key, value in result.items():
+            print(f"{key}: {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="gfsm", description="GodForsaken save backup manager (headless).")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backup", help="back up the current save")
+    p.add_argument("--note", default="", help="note stored with the backup")
+    p.add_argument("--auto", action="store_true", help="store as an auto backup")
+    p.add_argument("--full", action="store_true", help="re-hash every file instead of an incremental backup")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("restore", help="restore a backup")
+    p.add_argument("target", help="backup timestamp or snapshot path")
+    p.add_argument("--force", action="store_true", help="skip the game running check")
+    p.set_defaults(func=cmd_restore)
+
+    p = sub.add_parser("list", help="list backups, newest first")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument("--auto-only", action="store_true")
+    group.add_argument("--manual-only", action="store_true")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("prune", help="delete the oldest backups beyond the history limit")
+    p.add_argument("--max-history", type=int, help="defaults to the configured max_history")
+    p.set_defaults(func=cmd_prune)
+
+    p = sub.add_parser("verify", help="check snapshots for missing or damaged data")
+    p.add_argument("targets", nargs="*", help="backup timestamps or paths (default: all)")
+    p.add_argument("--quick", action="store_true", help="only check file presence, sizes and mtimes instead of re-hashing")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("diff", help="list the files that differ between two backups, or a backup and the save")
+    p.add_argument("a", help="backup timestamp or snapshot path")
+    p.add_argument("b", nargs="?", help="second backup (default: the current save)")
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser("stats", help="show backup counts and disk usage")
+    p.set_defaults(func=cmd_stats)
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        # Core code logs progress with print(); keep stdout clean for the command's output
+        with contextlib.redirect_stdout(sys.stderr):
+            manager = BackupManager()
+            result = args.func(manager, args)
+            config_manager.flush_config()
+    except (CliError, CorruptSnapshotError, OSError) as e:
+        if args.json:
+            print(json.dumps({"error": str(e)}, ensure_ascii=False))
+        else:
+            print(f"gfsm: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        _print_text(args.command, result)
+    if args.command == "verify" and not result["ok"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
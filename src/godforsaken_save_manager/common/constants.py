@@ -1,27 +1,37 @@
-def _get_version() -> str:
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=None)
+def get_app_version() -> str:
     """
-    Gets the version number, prioritizing the development environment.
-    It first tries to read pyproject.toml (for development).
+    Gets the version number once per process, prioritizing the development environment.
+    It reads pyproject.toml when present (development mode).
     As a fallback, it imports from the build-time generated _version.py (for packaged apps).
     """
-    try:
-        # Prioritize reading from pyproject.toml for development mode
-        import tomllib
-        from pathlib import Path
-        pyproject_path = Path(__file__).parent.parent.parent.parent / "pyproject.toml"
-        with open(pyproject_path, "rb") as f:
-            data = tomllib.load(f)
-        return data["tool"]["poetry"]["version"]
-    except (ImportError, FileNotFoundError, KeyError):
-        # Fallback for packaged apps
+    pyproject_path = Path(__file__).parent.parent.parent.parent / "pyproject.toml"
+    if pyproject_path.is_file():
         try:
-            from .._version import __version__
-            return __version__
-        except ImportError:
-            # Final fallback if everything fails
-            return "0.0.0-unknown"
+            import tomllib
+            with open(pyproject_path, "rb") as f:
+                data = tomllib.load(f)
+            return data["tool"]["poetry"]["version"]
+        except (ImportError, OSError, KeyError, ValueError):
+            pass
+    # Fallback for packaged apps, where pyproject.toml does not exist
+    try:
+        from .._version import __version__
+        return __version__
+    except ImportError:
+        # Final fallback if everything fails
+        return "0.0.0-unknown"
+
 
-APP_VERSION = _get_version()
+def __getattr__(name: str):
+    # APP_VERSION is resolved on first access, so importing constants stays cheap
+    if name == "APP_VERSION":
+        return get_app_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 CONFIG_FILE_NAME = "backup_manager_config.json"
@@ -29,3 +39,8 @@ PROFILE_BRIEF_FILE_NAME = "ProfileBrief.ssp"
 GAME_MUTEX_NAME = "n-GOD-FORSAKEN-GodForsaken-exe-SingleInstanceMutex-Default"
 DATETIME_FORMAT = "%Y-%m-%d_%H-%M-%S"
 GITHUB_REPO = "abevol/godforsaken-save-manager"
+MANIFEST_FILE_NAME = ".gfsm_manifest.json"
+OBJECTS_DIR_NAME = "objects"
+INDEX_FILE_NAME = "backup_index.json"
+ARCHIVE_FILE_NAME = "snapshot.zip"
+UPDATE_CACHE_FILE_NAME = "update_cache.json"
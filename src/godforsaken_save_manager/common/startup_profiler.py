@@ -0,0 +1,52 @@
+"""
+Startup profiler, enabled with the environment variable GFSM_PROFILE_STARTUP=1.
+
+Wrap startup steps in `phase(...)` and call `report()` once the window is
+shown. When disabled, `phase` does nothing beyond a flag check.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+ENABLED = os.environ.get("GFSM_PROFILE_STARTUP") == "1"
+REPORT_FILE_NAME = "gfsm_startup_profile.txt"
+
+_process_start = time.perf_counter()
+_phases: List[Tuple[str, float, int]] = []
+
+
+@contextmanager
+def phase(name: str):
+    """Times a startup phase and counts the modules it imported."""
+    if not ENABLED:
+        yield
+        return
+    modules_before = len(sys.modules)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - started, len(sys.modules) - modules_before))
+
+
+def report():
+    """Writes the collected phases to stderr and to a file in the temp directory."""
+    if not ENABLED:
+        return
+    total = time.perf_counter() - _process_start
+    lines = [f"{'phase':<32} {'ms':>9} {'modules':>8}"]
+    for name, seconds, modules in _phases:
+        lines.append(f"{name:<32} {seconds * 1000:>9.1f} {modules:>8}")
+    lines.append(f"{'total since profiler import':<32} {total * 1000:>9.1f} {len(sys.modules):>8}")
+    text = "\n".join(lines)
+
+    # The packaged app has no console, so always keep a copy on disk
+    report_file = os.path.join(tempfile.gettempdir(), REPORT_FILE_NAME)
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    if sys.stderr:
+        print(text, file=sys.stderr)
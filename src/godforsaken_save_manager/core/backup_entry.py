@@ -10,3 +10,4 @@ class BackupEntry:
     note: str
     profile_mtime: datetime
     auto: bool
+    size: int = 0  # bytes of save data referenced by the snapshot
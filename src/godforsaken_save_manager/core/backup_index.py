@@ -0,0 +1,137 @@
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from godforsaken_save_manager.common.constants import INDEX_FILE_NAME
+from . import tracing
+
+INDEX_VERSION = 2
+SNAPSHOT_KINDS = ("manual", "auto")
+
+
+@dataclass
+class IndexEntry:
+    timestamp: str
+    profile_mtime: float
+    size: int
+    auto: bool
+
+
+class BackupIndex:
+    """
+    Persistent cache of the snapshots under a backup root.
+
+    Each snapshot kind (manual/auto) is cached together with the mtime of its
+    directory. As long as the directory mtime is unchanged the cached entries
+    are trusted, so listing costs one stat per kind instead of one per snapshot.
+    """
+
+    def __init__(self, backup_root: Path, scan_entry: Callable[[Path, bool], Optional[IndexEntry]]):
+        self.backup_root = backup_root
+        self.index_file = backup_root / INDEX_FILE_NAME
+        self._scan_entry = scan_entry
+        self._dir_mtimes: Dict[str, int] = {}
+        self._entries: Dict[str, Dict[str, IndexEntry]] = {kind: {} for kind in SNAPSHOT_KINDS}
+        self._loaded = False
+        self._dirty = False
+
+    def _load(self):
+        self._loaded = True
+        if not self.index_file.is_file():
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return
+            self._dir_mtimes = {kind: int(mtime) for kind, mtime in data["dir_mtimes"].items()}
+            for kind in SNAPSHOT_KINDS:
+                self._entries[kind] = {
+                    timestamp: IndexEntry(timestamp, profile_mtime, size, kind == "auto")
+                    for timestamp, (profile_mtime, size) in data["entries"].get(kind, {}).items()
+                }
+        except (OSError, ValueError, KeyError, TypeError):
+            self._dir_mtimes = {}
+            self._entries = {kind: {} for kind in SNAPSHOT_KINDS}
+
+    def _dir_mtime(self, kind: str) -> int:
+        try:
+            return (self.backup_root / kind).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    @tracing.traced()
+    def _revalidate(self, kind: str):
+        """Rescans a snapshot directory whose mtime no longer matches the cache."""
+        mtime = self._dir_mtime(kind)
+        if self._dir_mtimes.get(kind) == mtime:
+            return
+        kind_path = self.backup_root / kind
+        cached = self._entries[kind]
+        fresh: Dict[str, IndexEntry] = {}
+        if kind_path.exists():
+            for entry in kind_path.iterdir():
+                if entry.name in cached:
+                    fresh[entry.name] = cached[entry.name]
+                    continue
+                scanned = self._scan_entry(entry, kind == "auto")
+                tracing.count("snapshots_scanned")
+                if scanned:
+                    fresh[entry.name] = scanned
+        self._entries[kind] = fresh
+        self._dir_mtimes[kind] = mtime
+        self._dirty = True
+
+    def entries(self) -> List[IndexEntry]:
+        """Returns all cached entries, rescanning only directories that changed."""
+        if not self._loaded:
+            self._load()
+        for kind in SNAPSHOT_KINDS:
+            self._revalidate(kind)
+        if self._dirty:
+            self.save()
+        return [entry for kind in SNAPSHOT_KINDS for entry in self._entries[kind].values()]
+
+    @contextmanager
+    def update(self) -> Iterator[Dict[str, Dict[str, IndexEntry]]]:
+        """
+        Wraps a filesystem change made by this process.
+
+        The cache is revalidated before the change, the caller edits the
+        yielded per-kind entry dicts, and the new directory mtimes are
+        recorded and written only if the block completes.
+        """
+        if not self._loaded:
+            self._load()
+        for kind in SNAPSHOT_KINDS:
+            self._revalidate(kind)
+        yield self._entries
+        for kind in SNAPSHOT_KINDS:
+            self._dir_mtimes[kind] = self._dir_mtime(kind)
+        self.save()
+
+    @staticmethod
+    def kind(auto: bool) -> str:
+        return "auto" if auto else "manual"
+
+    def save(self):
+        """Atomically writes the index next to the snapshots."""
+        data = {
+            "version": INDEX_VERSION,
+            "dir_mtimes": self._dir_mtimes,
+            "entries": {
+                kind: {e.timestamp: [e.profile_mtime, e.size] for e in entries.values()}
+                for kind, entries in self._entries.items()
+            },
+        }
+        self.backup_root.mkdir(parents=True, exist_ok=True)
+        # Unique per writer, so that managers in other threads never share a temporary file
+        tmp_file = self.index_file.with_name(f"{self.index_file.stem}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+        self._dirty = False
@@ -1,18 +1,47 @@
+import functools
 import os
 import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
-from . import config_manager, file_operations, process_checker
+from . import config_manager, file_operations, integrity, tracing
 from .backup_entry import BackupEntry
+from .backup_index import BackupIndex, IndexEntry
+from .file_operations import CancelCheck, ProgressCallback
+from .manifest import STORAGE_ARCHIVE, STORAGE_LINK, STORAGE_STORE, Manifest, has_manifest
+from .object_store import ObjectStore
+from .snapshot_diff import DiffSide, SnapshotDiff, diff_sides
+from . import link_snapshot, snapshot_archive
 from ..common import constants, helpers
 from ..i18n.translator import t, init_translator
 
+PRUNE_WORKERS = 4
+# Manifests kept in memory for diffs and garbage collection; snapshots never change once written
+MANIFEST_CACHE_SIZE = 256
+
+# One lock per backup root, shared by every BackupManager of the process
+_root_locks: Dict[str, threading.RLock] = {}
+_root_locks_guard = threading.Lock()
+
+
+def _exclusive(method):
+    """Runs a method that changes the backup root while holding its operation lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.operation_lock():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class BackupManager:
     def __init__(self):
         self.config = config_manager.load_config()
+        self._index: BackupIndex | None = None
+        self._manifests: Dict[Path, Tuple[Tuple[int, int], Manifest]] = {}
         # 初始化翻译器
         language = self.config.get("language")
         init_translator(language)
@@ -23,52 +52,153 @@ class BackupManager:
     def _save_config(self):
         config_manager.save_config(self.config)
 
+    def _copy_workers(self) -> int:
+        return max(1, int(self.config.get("copy_workers", 1)))
+
+    def operation_lock(self) -> threading.RLock:
+        """
+        Returns the lock that serialises backups, restores and deletions of the
+        configured backup root across threads. It is reentrant, so operations may
+        nest (a restore takes an auto backup first).
+        """
+        key = os.path.normcase(os.path.abspath(self.config["backup_root_path"]))
+        with _root_locks_guard:
+            return _root_locks.setdefault(key, threading.RLock())
+
+    def _object_store(self) -> ObjectStore:
+        chain_length = self.config.get("delta_chain_length", 10) if self.config.get("delta_compression") else 0
+        return ObjectStore(Path(self.config["backup_root_path"]), chain_length)
+
+    def _get_snapshot_timestamp(self, snapshot_path: Path) -> datetime | None:
+        """Gets the profile mtime of a snapshot, either from its manifest or from a full copy."""
+        manifest = self._cached_manifest(snapshot_path)
+        if manifest:
+            return datetime.fromtimestamp(manifest.profile_mtime)
+        return file_operations.get_profile_timestamp(snapshot_path)
+
+    def _iter_snapshot_dirs(self):
+        backup_root = Path(self.config["backup_root_path"])
+        for sub_dir in ("manual", "auto"):
+            bak_path = backup_root / sub_dir
+            if bak_path.exists():
+                for entry in bak_path.iterdir():
+                    if entry.is_dir():
+                        yield entry
+
+    @tracing.traced()
+    def _collect_garbage(self, candidates: Optional[Set[str]] = None):
+        """
+        Removes store objects that are no longer referenced by any snapshot.
+        With candidates (the hashes of deleted snapshots), only those are checked, and
+        reading the remaining manifests stops once all of them are still referenced.
+        """
+        live = set()
+        unreferenced = set(candidates) if candidates is not None else None
+        for entry in self._iter_snapshot_dirs():
+            manifest = self._cached_manifest(entry)
+            if manifest and manifest.storage == STORAGE_STORE:
+                hashes = {record.hash for record in manifest.files.values()}
+                live.update(hashes)
+                if unreferenced is not None:
+                    unreferenced -= hashes
+                    if not unreferenced:
+                        return
+        removed = self._object_store().collect_garbage(live, unreferenced)
+        if removed:
+            print(f"Removed {removed} unreferenced backup objects.")
+
+    def _backup_index(self) -> BackupIndex:
+        """Returns the snapshot index of the configured backup root."""
+        backup_root = Path(self.config["backup_root_path"])
+        if self._index is None or self._index.backup_root != backup_root:
+            self._index = BackupIndex(backup_root, self._scan_snapshot)
+        return self._index
+
+    @staticmethod
+    def _archive_manifest(entry: Path) -> Optional[Manifest]:
+        """Reads the manifest stored inside an archive snapshot, without inflating save data."""
+        archive = entry / constants.ARCHIVE_FILE_NAME
+        if not archive.is_file():
+            return None
+        try:
+            return snapshot_archive.read_manifest(archive)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None  # Damaged archive; fall back to the manifest next to it
+
+    def _scan_snapshot(self, entry: Path, auto: bool) -> IndexEntry | None:
+        """Reads the index data of a single snapshot directory from disk."""
+        if not entry.is_dir() or file_operations.is_sibling_path(entry, "pending"):
+            return None
+        manifest = None
+        if has_manifest(entry):
+            # The manifest next to the data is written last, once the snapshot is complete.
+            # Archive snapshots are listed from the copy stored inside the archive.
+            manifest = self._archive_manifest(entry) or self._cached_manifest(entry)
+        if manifest:
+            profile_mtime, size = manifest.profile_mtime, manifest.total_size
+        else:
+            profile_timestamp = file_operations.get_profile_timestamp(entry)
+            if not profile_timestamp:
+                return None
+            profile_mtime = profile_timestamp.timestamp()
+            size = sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+        return IndexEntry(
+            timestamp=entry.name,
+            profile_mtime=profile_mtime,
+            size=size,
+            auto=auto
+        )
+
+    def _to_backup_entry(self, entry: IndexEntry) -> BackupEntry:
+        return BackupEntry(
+            path=Path(self.config["backup_root_path"]) / BackupIndex.kind(entry.auto) / entry.timestamp,
+            timestamp=entry.timestamp,
+            note=self.config["notes"].get(entry.timestamp, ""),
+            profile_mtime=datetime.fromtimestamp(entry.profile_mtime),
+            auto=entry.auto,
+            size=entry.size
+        )
+
+    @tracing.traced()
     def list_backups(self) -> List[BackupEntry]:
         """Lists all manual and auto backups."""
-        self._reload_config()
-        backups = []
-        backup_root = Path(self.config["backup_root_path"])
-
-        manual_bak_path = backup_root / "manual"
-        auto_bak_path = backup_root / "auto"
-
-        # Process manual backups
-        if manual_bak_path.exists():
-            for entry in manual_bak_path.iterdir():
-                if entry.is_dir():
-                    profile_mtime = file_operations.get_profile_timestamp(entry)
-                    if profile_mtime:
-                        note = self.config["notes"].get(entry.name, "")
-                        backups.append(BackupEntry(
-                            path=entry,
-                            timestamp=entry.name,
-                            note=note,
-                            profile_mtime=profile_mtime,
-                            auto=False
-                        ))
-
-        # Process auto backups
-        if auto_bak_path.exists():
-            for entry in auto_bak_path.iterdir():
-                if entry.is_dir():
-                    profile_mtime = file_operations.get_profile_timestamp(entry)
-                    if profile_mtime:
-                        note = self.config["notes"].get(entry.name, "")
-                        backups.append(BackupEntry(
-                            path=entry,
-                            timestamp=entry.name,
-                            note=note,
-                            profile_mtime=profile_mtime,
-                            auto=True
-                        ))
+        backups = [self._to_backup_entry(entry) for entry in self._backup_index().entries()]
 
         # Sort by profile modification time, descending
         backups.sort(key=lambda x: x.profile_mtime, reverse=True)
         return backups
 
-    def backup(self, note: str = "", auto: bool = False) -> str | None:
-        """Creates a new backup."""
+    def get_backup(self, timestamp: str, auto: bool) -> BackupEntry | None:
+        """Looks up a single backup without building the whole list."""
+        for entry in self._backup_index().entries():
+            if entry.timestamp == timestamp and entry.auto == auto:
+                return self._to_backup_entry(entry)
+        return None
+
+    def _latest_snapshot(self, storage: str) -> Tuple[Path, Manifest] | None:
+        """Returns the most recent snapshot kept in the given storage, with its manifest."""
+        for entry in self.list_backups():
+            if has_manifest(entry.path):
+                manifest = Manifest.load(entry.path)
+                if manifest.storage == storage:
+                    return entry.path, manifest
+        return None
+
+    @tracing.traced()
+    @_exclusive
+    def backup(self, note: str = "", auto: bool = False, incremental: bool | None = None,
+               progress_callback: ProgressCallback | None = None,
+               cancel_check: CancelCheck | None = None) -> str | None:
+        """
+        Creates a new backup.
+        In incremental mode files unchanged since the latest snapshot (same size and mtime)
+        are referenced from its manifest (or hard-linked, in link format) instead of being
+        read and hashed again.
+        Cancelling is possible until the snapshot manifest is written.
+        """
         self._reload_config()
+        if incremental is None:
+            incremental = self.config.get("incremental_backup", True)
         game_save_path = Path(self.config["game_save_path"])
 
         if not game_save_path.exists():
@@ -84,7 +214,7 @@ class BackupManager:
 
         if auto:
             target_backup_path = backup_root / "auto" / timestamp_str
-            final_note = t('backup.auto_backup_note')
+            final_note = note or t('backup.auto_backup_note')
         else:
             target_backup_path = backup_root / "manual" / timestamp_str
             final_note = note
@@ -95,8 +225,48 @@ class BackupManager:
             print(f"Backup for timestamp {timestamp_str} already exists. Skipping.")
             return None
 
-        # Perform the copy
-        file_operations.copy_directory(game_save_path, target_backup_path)
+        snapshot_format = self.config.get("snapshot_format", STORAGE_STORE)
+        # Write into a pending directory that only becomes the snapshot once complete
+        pending_path = file_operations.make_sibling_path(target_backup_path, "pending")
+        pending_path.mkdir(parents=True)
+        try:
+            if snapshot_format == STORAGE_ARCHIVE:
+                manifest, stats = snapshot_archive.pack_tree(
+                    game_save_path, pending_path / constants.ARCHIVE_FILE_NAME,
+                    self.config.get("archive_compression_level", 6), progress_callback, cancel_check
+                )
+            elif snapshot_format == STORAGE_LINK:
+                # Hard-link files unchanged since the previous link snapshot, copy the rest
+                previous = self._latest_snapshot(STORAGE_LINK) if incremental else None
+                manifest, stats = link_snapshot.link_tree(
+                    game_save_path, pending_path, previous, progress_callback, cancel_check,
+                    self._copy_workers()
+                )
+            else:
+                # Store changed content once and record the snapshot as a manifest
+                latest = self._latest_snapshot(STORAGE_STORE) if incremental else None
+                manifest, stats = self._object_store().store_tree(
+                    game_save_path, latest[1] if latest else None, progress_callback, cancel_check,
+                    self._copy_workers()
+                )
+            manifest.save(pending_path)
+        except BaseException:
+            file_operations.remove_directory(pending_path)
+            if snapshot_format == STORAGE_STORE:
+                # Objects already stored for the unfinished snapshot are not referenced by any manifest
+                self._collect_garbage()
+            raise
+
+        with self._backup_index().update() as entries:
+            os.rename(pending_path, target_backup_path)
+            entries[BackupIndex.kind(auto)][timestamp_str] = IndexEntry(
+                timestamp=timestamp_str,
+                profile_mtime=manifest.profile_mtime,
+                size=manifest.total_size,
+                auto=auto
+            )
+
+        print(f"Backup {timestamp_str} stored: {stats}")
 
         # Update config
         if final_note:
@@ -108,26 +278,70 @@ class BackupManager:
         self._enforce_max_history()
         return timestamp_str
 
-    def restore(self, target_path: Path):
-        """Restores a backup."""
+    @tracing.traced()
+    @_exclusive
+    def restore(self, target_path: Path, progress_callback: ProgressCallback | None = None,
+                cancel_check: CancelCheck | None = None):
+        """
+        Restores a backup.
+        The live save is only replaced once the restored copy is complete,
+        so cancelling is honoured at any point before that swap.
+        """
         self._reload_config()
         game_save_path = Path(self.config["game_save_path"])
 
         if not target_path.exists():
             raise FileNotFoundError(f"Backup path not found: {target_path}")
 
+        # Never replace the live save with a snapshot that is known to be incomplete
+        problems = self.verify(target_path, quick=True)
+        if problems:
+            raise integrity.CorruptSnapshotError(target_path, problems)
+
         # Auto-backup before restoring
         current_profile_mtime = file_operations.get_profile_timestamp(game_save_path)
         if current_profile_mtime:
             timestamp_str = helpers.format_timestamp(current_profile_mtime)
             all_backups = self.list_backups()
             if not any(b.timestamp == timestamp_str for b in all_backups):
-                self.backup(auto=True)
-
-        # Perform the restore (remove and copy)
-        if game_save_path.exists():
-            file_operations.remove_directory(game_save_path)
-        file_operations.copy_directory(target_path, game_save_path)
+                self.backup(auto=True, progress_callback=progress_callback, cancel_check=cancel_check)
+        file_operations.check_cancelled(cancel_check)
+
+        # Build the restored save in a staging directory next to the live one, then swap it in
+        file_operations.remove_stale_siblings(game_save_path, "staging")
+        file_operations.remove_stale_siblings(game_save_path, "old")
+        staging_path = file_operations.make_sibling_path(game_save_path, "staging")
+        try:
+            if has_manifest(target_path):
+                manifest = Manifest.load(target_path)
+                staging_path.mkdir(parents=True)
+                if manifest.storage == STORAGE_ARCHIVE:
+                    stats = snapshot_archive.unpack_tree(
+                        target_path / constants.ARCHIVE_FILE_NAME, manifest, staging_path,
+                        progress_callback, cancel_check
+                    )
+                elif manifest.storage == STORAGE_LINK:
+                    stats = link_snapshot.restore_tree(
+                        target_path, manifest, staging_path, progress_callback, self._copy_workers(),
+                        cancel_check
+                    )
+                else:
+                    stats = self._object_store().restore_tree(
+                        manifest, staging_path, progress_callback, self._copy_workers(), cancel_check
+                    )
+            else:
+                stats = file_operations.copy_directory(
+                    target_path, staging_path, progress_callback, cancel_check, self._copy_workers()
+                )
+            file_operations.fsync_tree(staging_path)
+            file_operations.check_cancelled(cancel_check)
+            old_save_path = file_operations.swap_directory(staging_path, game_save_path)
+        except BaseException:
+            file_operations.remove_directory(staging_path)
+            raise
+        if old_save_path:
+            file_operations.remove_directory_async(old_save_path)
+        print(f"Restored {target_path.name}: {stats}")
 
         # Update config
         self.config["last_backup"] = str(target_path)
@@ -137,48 +351,226 @@ class BackupManager:
         """Deletes a backup."""
         if not target_path.exists() or not target_path.is_dir():
             raise FileNotFoundError(f"Backup path not found: {target_path}")
-
-        timestamp_str = target_path.name
-        file_operations.remove_directory(target_path)
+        self.delete_many([target_path])
+
+    @tracing.traced()
+    @_exclusive
+    def delete_many(self, target_paths: List[Path]):
+        """
+        Deletes several backups at once.
+        Directories are removed in parallel; the index, the config and the object
+        store are each updated a single time for the whole batch.
+        """
+        if not target_paths:
+            return
+
+        # Only objects of the deleted snapshots can become unreferenced
+        candidates = set()
+        for target_path in target_paths:
+            manifest = self._cached_manifest(target_path)
+            if manifest and manifest.storage == STORAGE_STORE:
+                candidates.update(record.hash for record in manifest.files.values())
+            self._manifests.pop(target_path, None)
+
+        with self._backup_index().update() as entries:
+            parent_span = tracing.current()
+
+            def remove(path: Path):
+                with tracing.attached(parent_span):
+                    file_operations.remove_directory(path)
+
+            with ThreadPoolExecutor(max_workers=min(PRUNE_WORKERS, len(target_paths))) as executor:
+                list(executor.map(remove, target_paths))
+            for target_path in target_paths:
+                entries[BackupIndex.kind(target_path.parent.name == "auto")].pop(target_path.name, None)
 
         # Update config
         self._reload_config()
-        if timestamp_str in self.config["notes"]:
-            del self.config["notes"][timestamp_str]
-        if self.config["last_backup"] == str(target_path):
+        deleted = {str(p) for p in target_paths}
+        for target_path in target_paths:
+            self.config["notes"].pop(target_path.name, None)
+        if self.config["last_backup"] in deleted:
             self.config["last_backup"] = ""
         self._save_config()
+        if candidates:
+            self._collect_garbage(candidates)
+
+    @tracing.traced()
+    @_exclusive
+    def prune(self, max_history: int) -> List[BackupEntry]:
+        """Deletes the oldest backups of each type beyond max_history in one batch. Returns the deleted entries."""
+        all_backups = self.list_backups()
+        victims = []
+        for auto in (False, True):
+            same_type = [b for b in all_backups if b.auto == auto]
+            victims.extend(same_type[max_history:])
+
+        for backup in victims:
+            print(f"Purging old {'auto' if backup.auto else 'manual'} backup: {backup.path}")
+        self.delete_many([b.path for b in victims])
+        return victims
+
+    @_exclusive
+    def backup_if_changed(self) -> str | None:
+        """
+        Takes an incremental auto snapshot unless a backup of the current save already exists.
+        Used by the save folder watcher.
+        """
+        self._reload_config()
+        current_profile_mtime = file_operations.get_profile_timestamp(Path(self.config["game_save_path"]))
+        if not current_profile_mtime:
+            return None
+        timestamp_str = helpers.format_timestamp(current_profile_mtime)
+        if any(b.timestamp == timestamp_str for b in self.list_backups()):
+            return None
+        return self.backup(note=t('backup.watcher_backup_note'), auto=True, incremental=True)
+
+    @tracing.traced()
+    def verify(self, target_path: Path, quick: bool = False,
+               progress_callback: ProgressCallback | None = None,
+               cancel_check: CancelCheck | None = None) -> List[str]:
+        """
+        Checks a snapshot against its manifest.
+        The quick check only compares file presence, sizes and, except for store snapshots,
+        mtimes; the full check re-hashes
+        every file in parallel. Returns a list of problems; empty means the snapshot is intact.
+        Legacy full-copy snapshots have no manifest, so only their profile file is checked.
+        """
+        if not has_manifest(target_path):
+            if not file_operations.get_profile_timestamp(target_path):
+                return [f"{constants.PROFILE_BRIEF_FILE_NAME} missing"]
+            return []
+
+        manifest = Manifest.load(target_path)
+        if quick:
+            return integrity.quick_check(target_path, manifest, self._object_store())
+        if manifest.storage == STORAGE_ARCHIVE:
+            return integrity.check_archive(
+                target_path / constants.ARCHIVE_FILE_NAME, manifest, progress_callback, cancel_check
+            )
+        if manifest.storage == STORAGE_LINK:
+            return integrity.check_files(
+                target_path, manifest, self._copy_workers(), progress_callback, cancel_check
+            )
+        sizes = {record.hash: record.size for record in manifest.files.values()}
+        damaged = integrity.check_objects(
+            self._object_store(), sizes, self._copy_workers(), progress_callback, cancel_check
+        )
+        return integrity.object_problems(manifest, damaged)
+
+    @tracing.traced()
+    @_exclusive
+    def scrub(self, progress_callback: ProgressCallback | None = None,
+              cancel_check: CancelCheck | None = None) -> Dict[Path, List[str]]:
+        """
+        Fully verifies every snapshot. Store objects shared between snapshots are hashed once.
+        Returns the problems of each damaged snapshot.
+        """
+        self._reload_config()
+        results: Dict[Path, List[str]] = {}
+        manifests: Dict[Path, Manifest] = {}
+        for entry in self.list_backups():
+            manifest = Manifest.load(entry.path) if has_manifest(entry.path) else None
+            if manifest and manifest.storage == STORAGE_STORE:
+                manifests[entry.path] = manifest
+            else:
+                results[entry.path] = self.verify(entry.path, cancel_check=cancel_check)
+
+        sizes = {
+            record.hash: record.size
+            for manifest in manifests.values() for record in manifest.files.values()
+        }
+        damaged = integrity.check_objects(
+            self._object_store(), sizes, self._copy_workers(), progress_callback, cancel_check
+        )
+        for path, manifest in manifests.items():
+            results[path] = integrity.object_problems(manifest, damaged)
+        return {path: problems for path, problems in results.items() if problems}
+
+    @tracing.traced()
+    def get_stats(self) -> dict:
+        """Summarizes snapshot counts, the save data they reference and the space actually used."""
+        backups = self.list_backups()
+        object_count, object_bytes = self._object_store().disk_usage()
+        archive_bytes = sum(
+            (b.path / constants.ARCHIVE_FILE_NAME).stat().st_size
+            for b in backups if (b.path / constants.ARCHIVE_FILE_NAME).is_file()
+        )
+        # Plain snapshot files (link snapshots and legacy copies); hard links are counted once
+        file_bytes = link_snapshot.disk_usage(b.path for b in backups)
+        logical_bytes = sum(b.size for b in backups)
+        stored_bytes = object_bytes + archive_bytes + file_bytes
+        return {
+            "backup_root": self.config["backup_root_path"],
+            "manual_count": sum(1 for b in backups if not b.auto),
+            "auto_count": sum(1 for b in backups if b.auto),
+            "logical_bytes": logical_bytes,
+            "object_count": object_count,
+            "stored_bytes": stored_bytes,
+            "space_saving_ratio": logical_bytes / stored_bytes if stored_bytes else 0.0,
+        }
 
     def get_time_diff(self, target_path: Path) -> float:
         """Returns the time difference in minutes between a backup and the current save."""
         game_save_path = Path(self.config["game_save_path"])
         current_mtime = file_operations.get_profile_timestamp(game_save_path)
-        backup_mtime = file_operations.get_profile_timestamp(target_path)
+        backup_mtime = self._get_snapshot_timestamp(target_path)
 
         if not current_mtime or not backup_mtime:
             return 0.0
 
         return abs((current_mtime - backup_mtime).total_seconds() / 60.0)
 
+    def _cached_manifest(self, snapshot_path: Path) -> Optional[Manifest]:
+        """Loads a snapshot's manifest, reusing the parsed copy while the file is unchanged."""
+        try:
+            stat = (snapshot_path / constants.MANIFEST_FILE_NAME).stat()
+        except FileNotFoundError:
+            self._manifests.pop(snapshot_path, None)
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._manifests.get(snapshot_path)
+        if cached and cached[0] == key:
+            return cached[1]
+        manifest = Manifest.load(snapshot_path)
+        if len(self._manifests) >= MANIFEST_CACHE_SIZE:
+            self._manifests.pop(next(iter(self._manifests)))
+        self._manifests[snapshot_path] = (key, manifest)
+        return manifest
+
+    def _diff_side(self, snapshot_path: Path) -> DiffSide:
+        if not snapshot_path.is_dir():
+            raise FileNotFoundError(f"Backup path not found: {snapshot_path}")
+        manifest = self._cached_manifest(snapshot_path)
+        # Legacy full copies have no manifest; their files are compared directly
+        return DiffSide.from_manifest(manifest) if manifest else DiffSide.scan(snapshot_path)
+
+    @tracing.traced()
+    def diff(self, a: Path, b: Path | None = None,
+             progress_callback: ProgressCallback | None = None,
+             cancel_check: CancelCheck | None = None) -> SnapshotDiff:
+        """
+        Compares snapshot a with snapshot b, or with the live save when b is None.
+        Added files exist only in b (or the live save), removed files only in a.
+
+        Snapshots are compared through their manifests without reading any data.
+        Live files whose size and mtime match the latest snapshot reuse its hashes,
+        so usually only files the game rewrote since then are hashed.
+        """
+        self._reload_config()
+        old = self._diff_side(a)
+        if b is not None:
+            new = self._diff_side(b)
+        else:
+            latest = None
+            for entry in self.list_backups():
+                latest = self._cached_manifest(entry.path)
+                if latest:
+                    break
+            new = DiffSide.scan(Path(self.config["game_save_path"]), known=latest)
+        return diff_sides(old, new, self._copy_workers(), progress_callback, cancel_check)
+
     def _enforce_max_history(self):
         """Deletes the oldest backups for each type if they exceed the configured limit."""
         self._reload_config()
-        max_history = self.config.get("max_history", 30)
-        all_backups = self.list_backups()
-
-        manual_backups = [b for b in all_backups if not b.auto]
-        auto_backups = [b for b in all_backups if b.auto]
-
-        # Enforce for manual backups
-        if len(manual_backups) > max_history:
-            backups_to_delete = manual_backups[max_history:]
-            for backup in backups_to_delete:
-                print(f"Purging old manual backup: {backup.path}")
-                self.delete(backup.path)
-
-        # Enforce for auto backups
-        if len(auto_backups) > max_history:
-            backups_to_delete = auto_backups[max_history:]
-            for backup in backups_to_delete:
-                print(f"Purging old auto backup: {backup.path}")
-                self.delete(backup.path)
\ No newline at end of file
+        self.prune(self.config.get("max_history", 30))
@@ -1,9 +1,12 @@
+import atexit
 import json
 import os
+import threading
 from pathlib import Path
 
 from godforsaken_save_manager.common.constants import CONFIG_FILE_NAME
 from godforsaken_save_manager.i18n.translator import Language
+from . import tracing
 
 GAME_PROFILE_DIR = Path(os.path.expandvars("%USERPROFILE%")) / "AppData" / "LocalLow" / "InsightStudio" / "GodForsakenRelease"
 DEFAULT_BACKUP_ROOT_PATH = GAME_PROFILE_DIR / "game_save_my_bak"
@@ -21,38 +24,150 @@ DEFAULTS = {
     "max_history": 30,
     "restore_confirm_threshold_minutes": 20,
     "auto_launch_game": True,
+    "incremental_backup": True,
+    "copy_workers": 4,  # 并行复制文件的线程数，1 表示顺序复制
+    "snapshot_format": "store",  # "store": 去重对象库；"archive": 每个快照一个压缩包；"link": 普通文件，未变化的文件硬链接到上一个快照
+    "delta_compression": False,  # 对象库中变化的文件只保存与上一版本的差异
+    "delta_chain_length": 10,  # 每隔多少个版本保存一次完整副本
+    "archive_compression_level": 6,
+    "watch_save_folder": False,  # 存档变化后自动创建快照
+    "watch_settle_seconds": 3,
+    "update_check_interval_minutes": 360,  # 两次检查更新之间的最短间隔，期间使用缓存的版本信息
+    "update_download_workers": 4,  # 下载更新时并行分段请求的数量，1 表示单个连接顺序下载
     "language": None,  # None表示自动检测系统语言
     "notes": {}
 }
 
+DEBOUNCE_SECONDS = 0.5
+
+
+class ConfigStore:
+    """
+    In-memory view of backup_manager_config.json.
+
+    Reads are served from memory and only re-parse the file when its mtime
+    changed. Saves are skipped when nothing changed, coalesced, and written
+    after a short debounce via a temp file and rename; pending changes are
+    flushed before the file is re-read and at interpreter exit.
+    """
+
+    def __init__(self, debounce_seconds: float = DEBOUNCE_SECONDS):
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.RLock()
+        self._path: Path | None = None
+        self._config: dict | None = None
+        self._mtime_ns: int | None = None
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+
+    @staticmethod
+    def _copy(config: dict) -> dict:
+        # Callers edit the notes dict in place, so it must not be shared with the cache
+        copied = dict(config)
+        copied["notes"] = dict(config["notes"])
+        return copied
+
+    @staticmethod
+    def _file_mtime(path: Path) -> int | None:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> dict:
+        config_file = get_config_file_path()
+        with self._lock:
+            if self._path == config_file and self._config is not None and (
+                    self._dirty or self._file_mtime(config_file) == self._mtime_ns):
+                return self._copy(self._config)
+
+            self.flush()
+            config = {}
+            if config_file.is_file():
+                with tracing.span("config.read") as span, open(config_file, 'r', encoding='utf-8') as f:
+                    try:
+                        config = json.load(f)
+                    except json.JSONDecodeError:
+                        config = {}
+                    span.add("bytes", f.tell())
+            self._path = config_file
+            self._config = ensure_defaults(config)
+            self._mtime_ns = self._file_mtime(config_file)
+            return self._copy(self._config)
+
+    def save(self, config: dict, immediate: bool = False):
+        full_config = ensure_defaults(config)
+        config_file = Path(full_config["backup_root_path"]) / CONFIG_FILE_NAME
+        with self._lock:
+            if config_file != self._path:
+                self.flush()
+                self._path = config_file
+                self._mtime_ns = None
+            elif full_config == self._config and self._mtime_ns is not None:
+                if immediate:
+                    self.flush()
+                return
+            self._config = self._copy(full_config)
+            self._dirty = True
+            if immediate:
+                self.flush()
+            else:
+                self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._timer:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce_seconds, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Writes pending changes to disk atomically."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._path.with_suffix(".tmp")
+            with tracing.span("config.write") as span:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._config, f, indent=4, ensure_ascii=False)
+                    span.add("bytes", f.tell())
+                os.replace(tmp_file, self._path)
+            self._mtime_ns = self._file_mtime(self._path)
+            self._dirty = False
+
+
+_store = ConfigStore()
+atexit.register(_store.flush)
+
+
+def get_config_store() -> ConfigStore:
+    return _store
+
+
 def ensure_config_file_exists():
     """Ensures the config file exists with default values if not present."""
     config_file = get_config_file_path()
     if not config_file.is_file():
-        save_config({})
+        save_config({}, immediate=True)
 
 def load_config() -> dict:
     """Loads the configuration from backup_manager_config.json, returning defaults if it doesn't exist."""
-    config_file = get_config_file_path()
-    if not config_file.is_file():
-        return ensure_defaults({})
-
-    with open(config_file, 'r', encoding='utf-8') as f:
-        try:
-            config = json.load(f)
-        except json.JSONDecodeError:
-            config = {}
-    return ensure_defaults(config)
+    return _store.load()
 
-def save_config(config: dict):
-    """Saves the configuration to backup_manager_config.json, creating the directory if needed."""
-    full_config = ensure_defaults(config)
-    backup_root_path = Path(full_config["backup_root_path"])
-    backup_root_path.mkdir(parents=True, exist_ok=True)
+def save_config(config: dict, immediate: bool = False):
+    """
+    Saves the configuration to backup_manager_config.json, creating the directory if needed.
+    The write is debounced unless immediate is set; use flush_config() to force it.
+    """
+    _store.save(config, immediate)
 
-    config_file = backup_root_path / CONFIG_FILE_NAME
-    with open(config_file, 'w', encoding='utf-8') as f:
-        json.dump(full_config, f, indent=4, ensure_ascii=False)
+def flush_config():
+    """Writes any pending configuration change to disk."""
+    _store.flush()
 
 def ensure_defaults(config: dict) -> dict:
     """Ensures the given config has all default values."""
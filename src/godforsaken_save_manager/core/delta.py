@@ -0,0 +1,266 @@
+"""
+Binary delta encoding between two versions of a file.
+
+The base is indexed by an rsync style weak checksum and a strong hash of each
+aligned block. The encoder rolls the weak checksum over the target one byte at
+a time, so blocks are found at any offset, and extends every confirmed match
+by comparing directly with the base. Matches become copy instructions,
+everything else is stored as zlib-compressed literals. Inserting or removing
+bytes therefore only costs the changed bytes and about one block around them.
+
+Stream layout (little endian):
+    header   MAGIC, version u8, block_size u32, base_size u64, target_size u64
+    ops      OP_COPY offset u64, length u32
+             OP_LITERAL raw_length u32, compressed_length u32, zlib data
+             OP_END
+"""
+
+import hashlib
+import itertools
+import struct
+import zlib
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+MAGIC = b"GFSD"
+VERSION = 1
+DEFAULT_BLOCK_SIZE = 4096
+LITERAL_FLUSH_SIZE = 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+MAX_COPY_LENGTH = 0xFFFFFFFF
+
+OP_END = 0
+OP_COPY = 1
+OP_LITERAL = 2
+
+_HEADER = struct.Struct("<4sBIQQ")
+_COPY = struct.Struct("<QI")
+_LITERAL = struct.Struct("<II")
+
+
+class DeltaError(ValueError):
+    """Raised when a delta stream is malformed or does not fit its base."""
+
+
+def _block_digest(block: bytes) -> bytes:
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def _weak_checksum(block: bytes) -> Tuple[int, int]:
+    """The two 16 bit halves of the rsync checksum of a block."""
+    return sum(block) & 0xFFFF, sum(itertools.accumulate(block)) & 0xFFFF
+
+
+def block_signature(base: BinaryIO, block_size: int = DEFAULT_BLOCK_SIZE) -> Dict[int, Dict[bytes, int]]:
+    """
+    Indexes every full aligned base block: maps its weak checksum to the strong
+    digests of the blocks sharing it, each with its first offset.
+    """
+    signature: Dict[int, Dict[bytes, int]] = {}
+    offset = 0
+    while block := base.read(block_size):
+        if len(block) == block_size:
+            a, b = _weak_checksum(block)
+            signature.setdefault(a | b << 16, {}).setdefault(_block_digest(block), offset)
+        offset += len(block)
+    return signature
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """Length of the common prefix of two byte strings."""
+    length = min(len(a), len(b))
+    step = 4096
+    start = 0
+    while start < length and a[start:start + step] == b[start:start + step]:
+        start += step
+    end = min(start + step, length)
+    while start < end and a[start] == b[start]:
+        start += 1
+    return min(start, length)
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    stream.seek(0, 2)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def encode(base: BinaryIO, target: BinaryIO, out: BinaryIO,
+           block_size: int = DEFAULT_BLOCK_SIZE, compression_level: int = 6,
+           max_size: Optional[int] = None) -> int:
+    """
+    Writes the delta that turns base into target. Both inputs must be seekable;
+    only the block signature of the base and a window of the target are kept in
+    memory. Returns the bytes written.
+    With max_size, encoding stops as soon as the delta grows beyond it; the output
+    is then incomplete and the returned size is larger than max_size.
+    """
+    base_size = _stream_size(base)
+    target_size = _stream_size(target)
+    signature = block_signature(base, block_size)
+
+    written = out.write(_HEADER.pack(MAGIC, VERSION, block_size, base_size, target_size))
+    copy_offset = copy_length = 0
+    literal = bytearray()
+
+    def add_copy(offset: int, length: int) -> int:
+        nonlocal copy_offset, copy_length
+        if copy_length and copy_offset + copy_length == offset and copy_length + length <= MAX_COPY_LENGTH:
+            copy_length += length
+            return 0
+        count = flush_copy()
+        while length > MAX_COPY_LENGTH:
+            count += out.write(bytes([OP_COPY]) + _COPY.pack(offset, MAX_COPY_LENGTH))
+            offset += MAX_COPY_LENGTH
+            length -= MAX_COPY_LENGTH
+        copy_offset, copy_length = offset, length
+        return count
+
+    def flush_copy() -> int:
+        nonlocal copy_length
+        if not copy_length:
+            return 0
+        count = out.write(bytes([OP_COPY]) + _COPY.pack(copy_offset, copy_length))
+        copy_length = 0
+        return count
+
+    def flush_literal() -> int:
+        if not literal:
+            return 0
+        data = zlib.compress(literal, compression_level)
+        count = out.write(bytes([OP_LITERAL]) + _LITERAL.pack(len(literal), len(data)))
+        count += out.write(data)
+        literal.clear()
+        return count
+
+    # The unconsumed part of the target starts at buffer[pos]
+    buffer = bytearray()
+    pos = 0
+
+    def fill(need: int) -> int:
+        """Makes at least `need` bytes available from pos unless the target ends first."""
+        nonlocal buffer, pos
+        if len(buffer) - pos < need:
+            del buffer[:pos]
+            pos = 0
+            while len(buffer) < need and (chunk := target.read(max(READ_CHUNK_SIZE, need - len(buffer)))):
+                buffer += chunk
+        return len(buffer) - pos
+
+    a = b = -1  # Weak checksum of buffer[pos:pos + block_size], -1 when it must be recomputed
+    while fill(block_size) >= block_size:
+        if a < 0:
+            a, b = _weak_checksum(buffer[pos:pos + block_size])
+        candidates = signature.get(a | b << 16)
+        offset = candidates and candidates.get(_block_digest(buffer[pos:pos + block_size]))
+        if offset is not None:
+            # Extend the match as far as the base and the target agree, reading ever larger steps
+            pos += block_size
+            length = step = block_size
+            base.seek(offset + block_size)
+            while fill(1):
+                chunk = base.read(min(len(buffer) - pos, step))
+                same = _common_prefix(chunk, buffer[pos:pos + len(chunk)])
+                pos += same
+                length += same
+                if not chunk or same < len(chunk):
+                    break
+                step = min(step * 2, READ_CHUNK_SIZE)
+            written += flush_literal()
+            written += add_copy(offset, length)
+            a = -1
+            continue
+
+        # Roll byte by byte until the weak checksum of a base block shows up or the window runs out
+        written += flush_copy()
+        start = pos
+        last = len(buffer) - block_size
+        if max_size is not None:
+            # Stop rolling once the raw literal alone could exceed the budget
+            last = min(last, pos + max_size - written - len(literal))
+        while True:
+            out_byte = buffer[pos]
+            pos += 1
+            if pos > last:
+                a = -1
+                break
+            a = (a - out_byte + buffer[pos + block_size - 1]) & 0xFFFF
+            b = (b - block_size * out_byte + a) & 0xFFFF
+            if a | b << 16 in signature:
+                break
+        literal += buffer[start:pos]
+        if len(literal) >= LITERAL_FLUSH_SIZE or (max_size is not None and written + len(literal) > max_size):
+            written += flush_literal()
+            if max_size is not None and written > max_size:
+                return written
+
+    literal += buffer[pos:]
+    written += flush_copy()
+    written += flush_literal()
+    written += out.write(bytes([OP_END]))
+    return written
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise DeltaError("Truncated delta stream")
+    return data
+
+
+def read_header(delta: BinaryIO) -> Tuple[int, int, int]:
+    """Reads the stream header. Returns (block_size, base_size, target_size)."""
+    magic, version, block_size, base_size, target_size = _HEADER.unpack(_read_exact(delta, _HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise DeltaError("Not a delta stream")
+    return block_size, base_size, target_size
+
+
+def apply(base: BinaryIO, delta: BinaryIO, out: BinaryIO,
+          on_chunk: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Streams the target of a delta into out. The base must be seekable; the delta
+    and the output are only read and written sequentially. Returns the bytes written.
+    """
+    _, base_size, target_size = read_header(delta)
+    base.seek(0, 2)
+    if base.tell() != base_size:
+        raise DeltaError(f"Delta expects a base of {base_size} bytes, got {base.tell()}")
+
+    written = 0
+    while True:
+        op = _read_exact(delta, 1)[0]
+        if op == OP_END:
+            break
+        if op == OP_COPY:
+            offset, length = _COPY.unpack(_read_exact(delta, _COPY.size))
+            if offset + length > base_size:
+                raise DeltaError("Copy instruction outside the base")
+            base.seek(offset)
+            while length:
+                chunk = base.read(min(length, READ_CHUNK_SIZE))
+                if not chunk:
+                    raise DeltaError("Base ended early")
+                out.write(chunk)
+                length -= len(chunk)
+                written += len(chunk)
+                if on_chunk:
+                    on_chunk(len(chunk))
+        elif op == OP_LITERAL:
+            raw_length, compressed_length = _LITERAL.unpack(_read_exact(delta, _LITERAL.size))
+            try:
+                data = zlib.decompress(_read_exact(delta, compressed_length))
+            except zlib.error as e:
+                raise DeltaError(f"Corrupt literal: {e}") from e
+            if len(data) != raw_length:
+                raise DeltaError("Literal length mismatch")
+            out.write(data)
+            written += raw_length
+            if on_chunk:
+                on_chunk(raw_length)
+        else:
+            raise DeltaError(f"Unknown delta instruction {op}")
+
+    if written != target_size:
+        raise DeltaError(f"Delta produced {written} bytes, expected {target_size}")
+    return written
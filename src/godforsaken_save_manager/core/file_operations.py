@@ -1,21 +1,320 @@
+import os
 import shutil
+import stat
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
 from godforsaken_save_manager.common.constants import PROFILE_BRIEF_FILE_NAME
+from . import tracing
 
 
-def copy_directory(src: Path, dst: Path):
+class OperationCancelled(Exception):
+    """Raised when a long-running operation is cancelled at a safe point."""
+
+
+@dataclass
+class CopyProgress:
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    current_file: str = ""
+    file_bytes_done: int = 0
+    file_size: int = 0
+
+
+@dataclass
+class CopyStats:
+    files: int
+    bytes: int
+    seconds: float
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.files} files, {self.bytes / (1024 * 1024):.1f} MB in {self.seconds:.2f}s "
+                f"({self.mb_per_second:.1f} MB/s, {self.files_per_second:.0f} files/s)")
+
+
+ProgressCallback = Callable[[CopyProgress], None]
+CancelCheck = Callable[[], bool]
+
+COPY_BUFFER_SIZE = 1024 * 1024
+SENDFILE_CHUNK_SIZE = 8 * 1024 * 1024
+_HAS_SENDFILE = hasattr(os, "sendfile")
+_buffers = threading.local()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class CopyMeter:
+    """
+    Tracks cumulative progress and throughput of one copy operation.
+    Safe to update from several copy threads; the per-file fields then
+    describe the file that reported last.
+    """
+
+    def __init__(self, files_total: int, bytes_total: int,
+                 progress_callback: Optional[ProgressCallback] = None):
+        self.progress = CopyProgress(0, files_total, 0, bytes_total)
+        self.progress_callback = progress_callback
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def start_file(self, rel: str, size: int):
+        with self._lock:
+            self.progress.current_file = rel
+            self.progress.file_size = size
+            self.progress.file_bytes_done = 0
+
+    def add_bytes(self, count: int):
+        with self._lock:
+            self.progress.bytes_done += count
+            self.progress.file_bytes_done += count
+            if self.progress_callback:
+                self.progress_callback(self.progress)
+
+    def finish_file(self, skipped_bytes: int = 0):
+        """Marks a file as done; skipped_bytes counts data that needed no copy."""
+        with self._lock:
+            self.progress.bytes_done += skipped_bytes
+            self.progress.files_done += 1
+            if self.progress_callback:
+                self.progress_callback(self.progress)
+
+    def stats(self) -> CopyStats:
+        return CopyStats(
+            files=self.progress.files_done,
+            bytes=self.progress.bytes_done,
+            seconds=time.perf_counter() - self.started
+        )
+
+
+def check_cancelled(cancel_check: Optional[CancelCheck]):
+    """Raises OperationCancelled if the caller asked to stop."""
+    if cancel_check and cancel_check():
+        raise OperationCancelled()
+
+
+def run_parallel(func: Callable[[T], R], items: Sequence[T], workers: int = 1,
+                 cancel_check: Optional[CancelCheck] = None) -> List[R]:
+    """
+    Applies func to every item, on a bounded thread pool when workers > 1.
+    Results keep the order of items. On the first error or cancellation,
+    pending items are dropped and the exception is re-raised.
+    """
+    def run(item: T) -> R:
+        check_cancelled(cancel_check)
+        return func(item)
+
+    if workers <= 1 or len(items) <= 1:
+        return [run(item) for item in items]
+
+    parent_span = tracing.current()
+
+    def run_in_worker(item: T) -> R:
+        with tracing.attached(parent_span):
+            return run(item)
+
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(items)))
+    try:
+        return list(executor.map(run_in_worker, items))
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+
+def iter_tree(root: Path, rel: str = "") -> Iterator[Tuple[str, os.DirEntry]]:
+    """Lazily walks a directory, yielding (POSIX relative path, entry) for directories and files."""
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    tracing.count("scandir")
+    for entry in entries:
+        entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+        yield entry_rel, entry
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_tree(Path(entry.path), entry_rel)
+
+
+def _get_buffer() -> bytearray:
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _buffers.buffer = bytearray(COPY_BUFFER_SIZE)
+    return buffer
+
+
+def copy_file(src: Path, dst: Path, on_chunk: Optional[Callable[[int], None]] = None):
+    """
+    Copies file content and metadata, reporting every copied chunk.
+    Uses os.sendfile where available and a reusable per-thread buffer otherwise.
+    """
+    with tracing.span("file_operations.copy_file") as span, \
+            open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        copied = calls = 0
+        if _HAS_SENDFILE:
+            try:
+                in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+                while sent := os.sendfile(out_fd, in_fd, copied, SENDFILE_CHUNK_SIZE):
+                    copied += sent
+                    calls += 1
+                    if on_chunk:
+                        on_chunk(sent)
+            except OSError:
+                if copied:
+                    raise
+                # sendfile is not supported for these files; fall back to buffered copy
+            span.add("sendfile_calls", calls)
+        if not copied:
+            buffer = _get_buffer()
+            view = memoryview(buffer)
+            calls = 0
+            while count := fsrc.readinto(buffer):
+                fdst.write(view[:count])
+                copied += count
+                calls += 1
+                if on_chunk:
+                    on_chunk(count)
+            span.add("read_write_calls", calls)
+        span.add("files")
+        span.add("bytes", copied)
+    shutil.copystat(src, dst)
+
+
+@tracing.traced()
+def copy_tree(src: Path, dst: Path, progress_callback: Optional[ProgressCallback] = None,
+              cancel_check: Optional[CancelCheck] = None, workers: int = 1) -> CopyStats:
+    """
+    Recursively copies a directory with byte-level progress. Returns the throughput stats.
+    With workers > 1 files are copied concurrently once the directory structure exists.
+    """
+    entries = list(iter_tree(src))
+    files = [(rel, entry) for rel, entry in entries if entry.is_file()]
+    meter = CopyMeter(len(files), sum(entry.stat().st_size for _, entry in files), progress_callback)
+
+    dst.mkdir(parents=True, exist_ok=True)
+    for rel, entry in entries:
+        if entry.is_dir():
+            (dst / rel).mkdir(exist_ok=True)
+
+    def copy_one(item: Tuple[str, os.DirEntry]):
+        rel, entry = item
+        meter.start_file(rel, entry.stat().st_size)
+        copy_file(Path(entry.path), dst / rel, meter.add_bytes)
+        meter.finish_file()
+
+    run_parallel(copy_one, files, workers, cancel_check)
+    return meter.stats()
+
+
+def copy_directory(src: Path, dst: Path, progress_callback: Optional[ProgressCallback] = None,
+                   cancel_check: Optional[CancelCheck] = None, workers: int = 1) -> CopyStats:
     """Recursively copies a directory."""
     if not dst.parent.exists():
         dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(src, dst)
+    if dst.exists():
+        raise FileExistsError(f"Destination already exists: {dst}")
+    return copy_tree(src, dst, progress_callback, cancel_check, workers)
 
+@tracing.traced()
 def remove_directory(path: Path):
     """Recursively removes a directory."""
     if path.exists() and path.is_dir():
         shutil.rmtree(path)
 
+def remove_directory_async(path: Path) -> threading.Thread:
+    """Removes a directory on a background thread so the caller does not wait for it."""
+    thread = threading.Thread(
+        target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True},
+        name=f"remove-{path.name}"
+    )
+    thread.start()
+    return thread
+
+@tracing.traced()
+def _fsync_file(path: str):
+    if os.name != "nt":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return
+    # Windows only flushes handles opened for writing, so read-only files are made writable meanwhile
+    mode = os.stat(path).st_mode
+    read_only = not mode & stat.S_IWRITE
+    if read_only:
+        os.chmod(path, mode | stat.S_IWRITE)
+    try:
+        with open(path, 'r+b') as f:
+            os.fsync(f.fileno())
+    finally:
+        if read_only:
+            os.chmod(path, mode)
+
+
+def fsync_tree(root: Path):
+    """Flushes every file below root (and, where supported, the directories) to disk."""
+    for _, entry in iter_tree(root):
+        if entry.is_file():
+            _fsync_file(entry.path)
+            tracing.count("fsync")
+    if os.name != "nt":
+        # Directory handles cannot be fsynced on Windows
+        for directory in [root] + [Path(e.path) for _, e in iter_tree(root) if e.is_dir()]:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+def make_sibling_path(path: Path, tag: str) -> Path:
+    """Returns a unique path next to `path`, on the same volume so it can be renamed into place."""
+    return path.with_name(f"{path.name}.{tag}-{uuid.uuid4().hex[:8]}")
+
+def is_sibling_path(path: Path, tag: str) -> bool:
+    """True for a path made by make_sibling_path with the given tag."""
+    return f".{tag}-" in path.name
+
+def remove_stale_siblings(path: Path, tag: str):
+    """Removes leftovers of interrupted swaps, e.g. game_save.staging-1a2b3c4d."""
+    if path.parent.is_dir():
+        for sibling in path.parent.glob(f"{path.name}.{tag}-*"):
+            # A removal started by remove_directory_async may still be running
+            shutil.rmtree(sibling, ignore_errors=True)
+
+@tracing.traced()
+def swap_directory(staging: Path, target: Path) -> Path | None:
+    """
+    Replaces target with staging using renames only.
+    The old target is moved aside and its new path returned, so the caller can
+    remove it later; the window without a target is a single rename.
+    """
+    old = make_sibling_path(target, "old") if target.exists() else None
+    if old:
+        os.rename(target, old)
+    try:
+        os.rename(staging, target)
+    except OSError:
+        if old:
+            os.rename(old, target)
+        raise
+    return old
+
 def get_profile_timestamp(path: Path) -> datetime | None:
     """Gets the modification time of the profile brief file."""
     profile_file = path / PROFILE_BRIEF_FILE_NAME
@@ -0,0 +1,198 @@
+import mmap
+import os
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from godforsaken_save_manager.common.constants import ARCHIVE_FILE_NAME
+from .file_operations import (
+    COPY_BUFFER_SIZE, CancelCheck, CopyMeter, ProgressCallback, check_cancelled, run_parallel
+)
+from .delta import DeltaError
+from .manifest import STORAGE_ARCHIVE, STORAGE_LINK, Manifest, new_hasher
+from .object_store import ObjectStore
+from .snapshot_archive import member_stats
+
+# Hashing window over a memory map; also the granularity of progress reports
+MAP_WINDOW_SIZE = 8 * 1024 * 1024
+
+
+class CorruptSnapshotError(Exception):
+    """Raised when a snapshot's data no longer matches its manifest."""
+
+    def __init__(self, snapshot_path: Path, problems: List[str]):
+        shown = "; ".join(problems[:3]) + (f" (+{len(problems) - 3} more)" if len(problems) > 3 else "")
+        super().__init__(f"Snapshot {snapshot_path.name} is damaged: {shown}")
+        self.snapshot_path = snapshot_path
+        self.problems = problems
+
+
+def hash_file_mapped(path: Path, on_chunk: Optional[Callable[[int], None]] = None) -> str:
+    """
+    Hashes a file through a read-only memory map.
+    The hasher reads the page cache directly and releases the GIL,
+    so several files can be hashed on threads at full speed.
+    """
+    hasher = new_hasher()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return hasher.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            for offset in range(0, size, MAP_WINDOW_SIZE):
+                with view[offset:offset + MAP_WINDOW_SIZE] as window:
+                    hasher.update(window)
+                    if on_chunk:
+                        on_chunk(len(window))
+    return hasher.hexdigest()
+
+
+def _hash_object(store: ObjectStore, digest: str, on_chunk: Optional[Callable[[int], None]] = None) -> str:
+    """Hashes a full object through a memory map, or a delta object by rebuilding its content."""
+    if not store.is_delta(digest):
+        return hash_file_mapped(store.object_path(digest), on_chunk)
+    hasher = new_hasher()
+    with store.open_object(digest) as stream:
+        while chunk := stream.read(COPY_BUFFER_SIZE):
+            hasher.update(chunk)
+            if on_chunk:
+                on_chunk(len(chunk))
+    return hasher.hexdigest()
+
+
+def quick_check(snapshot_path: Path, manifest: Manifest, store: ObjectStore) -> List[str]:
+    """
+    Checks that every file of a manifest is present with its recorded size and mtime.
+    Store snapshots are checked by size only: one object holds the content of every
+    file with the same hash, whatever their mtimes, which the manifest alone records.
+    Costs one stat per file (or one archive directory read) and reads no data.
+    """
+    problems = []
+    if manifest.storage == STORAGE_LINK:
+        for rel, record in manifest.files.items():
+            try:
+                stat = (snapshot_path / rel).stat()
+            except FileNotFoundError:
+                problems.append(f"{rel}: missing")
+                continue
+            if stat.st_size != record.size:
+                problems.append(f"{rel}: size {stat.st_size} != {record.size}")
+            elif stat.st_mtime != record.mtime:
+                problems.append(f"{rel}: modified after backup")
+    elif manifest.storage == STORAGE_ARCHIVE:
+        archive_path = snapshot_path / ARCHIVE_FILE_NAME
+        if not archive_path.is_file():
+            return [f"{ARCHIVE_FILE_NAME} missing"]
+        members = member_stats(archive_path)
+        for rel, record in manifest.files.items():
+            if rel not in members:
+                problems.append(f"{rel}: missing")
+                continue
+            size, mtime = members[rel]
+            if size != record.size:
+                problems.append(f"{rel}: size {size} != {record.size}")
+            elif mtime is not None and mtime != int(record.mtime):
+                problems.append(f"{rel}: modified after backup")
+    else:
+        for rel, record in manifest.files.items():
+            try:
+                size = store.object_size(record.hash)
+            except FileNotFoundError:
+                problems.append(f"{rel}: missing")
+                continue
+            if size != record.size:
+                problems.append(f"{rel}: size {size} != {record.size}")
+    return problems
+
+
+def check_objects(store: ObjectStore, sizes: Dict[str, int], workers: int = 1,
+                  progress_callback: Optional[ProgressCallback] = None,
+                  cancel_check: Optional[CancelCheck] = None) -> Dict[str, str]:
+    """
+    Re-hashes store objects in parallel. `sizes` maps each digest to its expected size,
+    so an object shared by many files and snapshots is only read once.
+    Returns a problem description for every damaged object.
+    """
+    meter = CopyMeter(len(sizes), sum(sizes.values()), progress_callback)
+
+    def check_one(digest: str) -> Optional[str]:
+        meter.start_file(digest, sizes[digest])
+        try:
+            size = store.object_size(digest)
+            if size != sizes[digest]:
+                return f"size {size} != {sizes[digest]}"
+            if _hash_object(store, digest, meter.add_bytes) != digest:
+                return "content hash mismatch"
+        except FileNotFoundError:
+            return "missing"
+        except DeltaError as e:
+            return f"corrupt delta: {e}"
+        finally:
+            meter.finish_file()
+        return None
+
+    digests = sorted(sizes)
+    results = run_parallel(check_one, digests, workers, cancel_check)
+    return {digest: problem for digest, problem in zip(digests, results) if problem}
+
+
+def check_files(snapshot_path: Path, manifest: Manifest, workers: int = 1,
+                progress_callback: Optional[ProgressCallback] = None,
+                cancel_check: Optional[CancelCheck] = None) -> List[str]:
+    """Re-hashes the plain files of a snapshot directory in parallel."""
+    meter = CopyMeter(len(manifest.files), manifest.total_size, progress_callback)
+
+    def check_one(item) -> Optional[str]:
+        rel, record = item
+        meter.start_file(rel, record.size)
+        try:
+            if hash_file_mapped(snapshot_path / rel, meter.add_bytes) != record.hash:
+                return f"{rel}: content hash mismatch"
+        except FileNotFoundError:
+            return f"{rel}: missing"
+        finally:
+            meter.finish_file()
+        return None
+
+    results = run_parallel(check_one, list(manifest.files.items()), workers, cancel_check)
+    return [problem for problem in results if problem]
+
+
+def check_archive(archive_path: Path, manifest: Manifest,
+                  progress_callback: Optional[ProgressCallback] = None,
+                  cancel_check: Optional[CancelCheck] = None) -> List[str]:
+    """Inflates every member of a snapshot archive and compares it with the manifest hashes."""
+    if not archive_path.is_file():
+        return [f"{archive_path.name} missing"]
+    meter = CopyMeter(len(manifest.files), manifest.total_size, progress_callback)
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    problems = []
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        names = set(zf.namelist())
+        for rel, record in manifest.files.items():
+            check_cancelled(cancel_check)
+            if rel not in names:
+                problems.append(f"{rel}: missing")
+                continue
+            meter.start_file(rel, record.size)
+            hasher = new_hasher()
+            try:
+                with zf.open(rel, 'r') as fsrc:
+                    while count := fsrc.readinto(buffer):
+                        hasher.update(view[:count])
+                        meter.add_bytes(count)
+            except (zipfile.BadZipFile, OSError) as e:
+                problems.append(f"{rel}: {e}")
+                continue
+            finally:
+                meter.finish_file()
+            if hasher.hexdigest() != record.hash:
+                problems.append(f"{rel}: content hash mismatch")
+    return problems
+
+
+def object_problems(manifest: Manifest, damaged: Dict[str, str]) -> List[str]:
+    """Maps damaged store objects back to the files of a snapshot."""
+    return [f"{rel}: {damaged[record.hash]}" for rel, record in manifest.files.items()
+            if record.hash in damaged]
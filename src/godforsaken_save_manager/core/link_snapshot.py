@@ -0,0 +1,113 @@
+import errno
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from godforsaken_save_manager.common.constants import ARCHIVE_FILE_NAME, MANIFEST_FILE_NAME, PROFILE_BRIEF_FILE_NAME
+from .file_operations import (
+    CancelCheck, CopyMeter, CopyStats, ProgressCallback, copy_file, iter_tree, run_parallel
+)
+from .manifest import STORAGE_LINK, FileRecord, Manifest, hash_file
+
+# Errors meaning the volume cannot hard-link at all, as opposed to a single file failing
+# (e.g. NTFS refuses more than 1023 links to one file)
+_LINKS_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS}
+
+
+def same_volume(a: Path, b: Path) -> bool:
+    try:
+        return os.stat(a).st_dev == os.stat(b).st_dev
+    except OSError:
+        return False
+
+
+def link_tree(src_root: Path, snapshot_dir: Path, previous: Optional[Tuple[Path, Manifest]] = None,
+              progress_callback: Optional[ProgressCallback] = None,
+              cancel_check: Optional[CancelCheck] = None,
+              workers: int = 1) -> Tuple[Manifest, CopyStats]:
+    """
+    Writes every file below src_root into snapshot_dir as a plain file.
+
+    Files whose size and mtime match the previous snapshot are hard-linked to its
+    copy instead of being copied, which takes no data I/O and no extra space.
+    Links only ever join two snapshots, never a snapshot and the live save: if the
+    game rewrites a save file in place, the snapshots sharing the old inode are untouched.
+    When the previous snapshot is on another volume, or the file system has no hard
+    links, files are copied.
+    """
+    items = [
+        (rel, Path(entry.path), entry.stat())
+        for rel, entry in iter_tree(src_root) if entry.is_file()
+    ]
+    meter = CopyMeter(len(items), sum(st.st_size for _, _, st in items), progress_callback)
+    previous_dir, previous_manifest = previous if previous else (None, None)
+    links_enabled = previous_dir is not None and same_volume(previous_dir, snapshot_dir)
+
+    for rel, entry in iter_tree(src_root):
+        if entry.is_dir():
+            (snapshot_dir / rel).mkdir(parents=True, exist_ok=True)
+
+    def link_one(item: Tuple[str, Path, os.stat_result]) -> FileRecord:
+        nonlocal links_enabled
+        rel, path, stat = item
+        target = snapshot_dir / rel
+        meter.start_file(rel, stat.st_size)
+        known = previous_manifest.files.get(rel) if previous_manifest else None
+        if links_enabled and known and known.size == stat.st_size and known.mtime == stat.st_mtime:
+            try:
+                os.link(previous_dir / rel, target)
+                meter.finish_file(skipped_bytes=stat.st_size)
+                return known
+            except FileNotFoundError:
+                pass  # The previous copy is gone; copy the file instead
+            except OSError as e:
+                if e.errno in _LINKS_UNSUPPORTED:
+                    links_enabled = False
+        copy_file(path, target, meter.add_bytes)
+        meter.finish_file()
+        # Hash the copy, which is what restore will read back
+        return FileRecord(size=stat.st_size, mtime=stat.st_mtime, hash=hash_file(target))
+
+    records = run_parallel(link_one, items, workers, cancel_check)
+    files = {rel: record for (rel, _, _), record in zip(items, records)}
+    profile = files.get(PROFILE_BRIEF_FILE_NAME)
+    if profile is None:
+        raise FileNotFoundError(f"{PROFILE_BRIEF_FILE_NAME} not found in {src_root}")
+    return Manifest(profile_mtime=profile.mtime, files=files, storage=STORAGE_LINK), meter.stats()
+
+
+def restore_tree(snapshot_dir: Path, manifest: Manifest, dst_root: Path,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 workers: int = 1, cancel_check: Optional[CancelCheck] = None) -> CopyStats:
+    """
+    Copies the files of a link snapshot below dst_root.
+    Restored files are always real copies, so the game writing to them cannot reach the snapshots.
+    """
+    meter = CopyMeter(len(manifest.files), manifest.total_size, progress_callback)
+
+    def restore_one(item: Tuple[str, FileRecord]):
+        rel, record = item
+        target = dst_root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        meter.start_file(rel, record.size)
+        copy_file(snapshot_dir / rel, target, meter.add_bytes)
+        os.utime(target, (record.mtime, record.mtime))
+        meter.finish_file()
+
+    run_parallel(restore_one, list(manifest.files.items()), workers, cancel_check)
+    return meter.stats()
+
+
+def disk_usage(snapshot_dirs: Iterable[Path]) -> int:
+    """Returns the bytes used by plain files in snapshot directories, counting each hard-linked inode once."""
+    seen = set()
+    total = 0
+    for snapshot_dir in snapshot_dirs:
+        for rel, entry in iter_tree(snapshot_dir):
+            if not entry.is_file() or rel in (MANIFEST_FILE_NAME, ARCHIVE_FILE_NAME):
+                continue
+            stat = os.stat(entry.path)  # DirEntry.stat() has no inode numbers on Windows
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+    return total
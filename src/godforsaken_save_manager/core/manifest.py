@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+from godforsaken_save_manager.common.constants import MANIFEST_FILE_NAME, PROFILE_BRIEF_FILE_NAME
+
+HASH_CHUNK_SIZE = 1024 * 1024
+MANIFEST_VERSION = 1
+
+# Where the content of a snapshot lives
+STORAGE_STORE = "store"      # objects in the shared content-addressed store
+STORAGE_ARCHIVE = "archive"  # a compressed archive inside the snapshot directory
+STORAGE_LINK = "link"        # plain files in the snapshot directory, hard-linked when unchanged
+
+
+def new_hasher():
+    """Returns the hash object used for content addressing."""
+    return hashlib.blake2b(digest_size=32)
+
+
+def hash_file(path: Path) -> str:
+    """Hashes a file's content."""
+    hasher = new_hasher()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+@dataclass
+class FileRecord:
+    size: int
+    mtime: float
+    hash: str
+
+
+@dataclass
+class Manifest:
+    """Describes the files of one snapshot. Keys of `files` are POSIX relative paths."""
+    profile_mtime: float
+    files: Dict[str, FileRecord] = field(default_factory=dict)
+    storage: str = STORAGE_STORE
+
+    @property
+    def total_size(self) -> int:
+        return sum(record.size for record in self.files.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MANIFEST_VERSION,
+            "profile_mtime": self.profile_mtime,
+            "storage": self.storage,
+            "files": {
+                rel: [record.size, record.mtime, record.hash]
+                for rel, record in self.files.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Manifest":
+        files = {
+            rel: FileRecord(size=size, mtime=mtime, hash=digest)
+            for rel, (size, mtime, digest) in data.get("files", {}).items()
+        }
+        return cls(
+            profile_mtime=data["profile_mtime"],
+            files=files,
+            storage=data.get("storage", STORAGE_STORE)
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+    def save(self, snapshot_dir: Path):
+        """Writes the manifest into a snapshot directory."""
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        manifest_file = snapshot_dir / MANIFEST_FILE_NAME
+        tmp_file = manifest_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+        os.replace(tmp_file, manifest_file)
+
+    @classmethod
+    def load(cls, snapshot_dir: Path) -> "Manifest":
+        with open(snapshot_dir / MANIFEST_FILE_NAME, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def has_manifest(snapshot_dir: Path) -> bool:
+    return (snapshot_dir / MANIFEST_FILE_NAME).is_file()
+
+
+def profile_record(manifest: Manifest) -> FileRecord | None:
+    return manifest.files.get(PROFILE_BRIEF_FILE_NAME)
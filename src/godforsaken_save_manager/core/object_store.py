@@ -0,0 +1,285 @@
+import os
+import shutil
+import struct
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Set, Tuple
+
+from godforsaken_save_manager.common.constants import OBJECTS_DIR_NAME, PROFILE_BRIEF_FILE_NAME
+from . import delta, tracing
+from .file_operations import (
+    CancelCheck, CopyMeter, CopyStats, ProgressCallback, copy_file, iter_tree, run_parallel
+)
+from .manifest import FileRecord, Manifest, hash_file
+
+DELTA_SUFFIX = ".delta"
+# A delta is only kept if it is at most this fraction of the full content
+DELTA_MAX_RATIO = 0.5
+
+# Delta objects start with the chain depth and the raw digest of their base
+_DELTA_OBJECT_HEADER = struct.Struct("<4sH32s")
+_DELTA_OBJECT_MAGIC = b"GFSO"
+
+
+class ObjectStore:
+    """
+    Content-addressed file store shared by all snapshots under a backup root.
+
+    Every distinct file content is stored once at objects/<hh>/<hash>;
+    snapshots only keep a manifest that points at these objects.
+
+    With delta_chain_length > 1, a new version of a file may instead be stored
+    as objects/<hh>/<hash>.delta, a binary delta against the previous version.
+    At most delta_chain_length - 1 deltas are chained before a full copy is stored again.
+    """
+
+    def __init__(self, backup_root: Path, delta_chain_length: int = 0):
+        self.root = backup_root / OBJECTS_DIR_NAME
+        self.delta_chain_length = delta_chain_length
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def delta_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / (digest + DELTA_SUFFIX)
+
+    def has(self, digest: str) -> bool:
+        return self.object_path(digest).is_file() or self.delta_path(digest).is_file()
+
+    def is_delta(self, digest: str) -> bool:
+        """True if the content is only available by applying a delta."""
+        return not self.object_path(digest).is_file() and self.delta_path(digest).is_file()
+
+    def _read_delta_header(self, stream: BinaryIO) -> Tuple[int, str]:
+        magic, depth, base = _DELTA_OBJECT_HEADER.unpack(stream.read(_DELTA_OBJECT_HEADER.size))
+        if magic != _DELTA_OBJECT_MAGIC:
+            raise delta.DeltaError("Not a delta object")
+        return depth, base.hex()
+
+    def delta_base(self, digest: str) -> Tuple[int, str]:
+        """Returns the chain depth and the base digest of a delta object."""
+        with open(self.delta_path(digest), 'rb') as f:
+            return self._read_delta_header(f)
+
+    def chain_depth(self, digest: str) -> int:
+        return self.delta_base(digest)[0] if self.is_delta(digest) else 0
+
+    def object_size(self, digest: str) -> int:
+        """
+        Returns the content size of an object without reading its data.
+        For a delta, also checks that every base of its chain is present.
+        """
+        if self.object_path(digest).is_file():
+            return self.object_path(digest).stat().st_size
+        with open(self.delta_path(digest), 'rb') as f:
+            _, base = self._read_delta_header(f)
+            _, _, target_size = delta.read_header(f)
+        self.object_size(base)
+        return target_size
+
+    @contextmanager
+    def open_object(self, digest: str) -> Iterator[BinaryIO]:
+        """
+        Opens the content of an object for reading.
+        A delta chain is rebuilt one link at a time into temporary files,
+        each step streaming from the previous one.
+        """
+        if self.object_path(digest).is_file():
+            with open(self.object_path(digest), 'rb') as f:
+                yield f
+            return
+        with tempfile.TemporaryFile(dir=self.root) as rebuilt:
+            self._apply_delta(digest, rebuilt)
+            rebuilt.seek(0)
+            yield rebuilt
+
+    def _apply_delta(self, digest: str, out: BinaryIO, on_chunk: Optional[Callable[[int], None]] = None):
+        with open(self.delta_path(digest), 'rb') as f:
+            _, base = self._read_delta_header(f)
+            with self.open_object(base) as base_stream:
+                delta.apply(base_stream, f, out, on_chunk)
+
+    def write_object(self, digest: str, dst: Path, on_chunk: Optional[Callable[[int], None]] = None):
+        """Writes the content of an object to dst; the last delta of a chain streams straight into it."""
+        if self.object_path(digest).is_file():
+            copy_file(self.object_path(digest), dst, on_chunk)
+            return
+        with open(dst, 'wb') as out:
+            self._apply_delta(digest, out, on_chunk)
+
+    def put_file(self, src: Path, digest: str, on_chunk: Optional[Callable[[int], None]] = None,
+                 base: Optional[str] = None) -> bool:
+        """
+        Copies a file into the store unless an object with the same hash exists.
+        If the previous version `base` is given, the file may be stored as a delta against it.
+        Returns True if the content was written.
+        """
+        if self.has(digest):
+            return False
+        self.object_path(digest).parent.mkdir(parents=True, exist_ok=True)
+        if base and self.delta_chain_length > 1 and self.has(base):
+            depth = self.chain_depth(base) + 1
+            if depth < self.delta_chain_length and self._put_delta(src, digest, base, depth):
+                if on_chunk:
+                    on_chunk(src.stat().st_size)
+                return True
+
+        object_path = self.object_path(digest)
+        tmp_path = object_path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        try:
+            copy_file(src, tmp_path, on_chunk)
+            os.replace(tmp_path, object_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return True
+
+    def _put_delta(self, src: Path, digest: str, base: str, depth: int) -> bool:
+        """Stores src as a delta against base. Returns False if the delta would not save enough space."""
+        budget = int(DELTA_MAX_RATIO * src.stat().st_size)
+        # A file that grew or shrank by more than the budget was rewritten; encoding would not pay off
+        if abs(src.stat().st_size - self.object_size(base)) > budget:
+            return False
+        delta_path = self.delta_path(digest)
+        tmp_path = delta_path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        try:
+            with self.open_object(base) as base_stream, open(src, 'rb') as target, open(tmp_path, 'wb') as out:
+                out.write(_DELTA_OBJECT_HEADER.pack(_DELTA_OBJECT_MAGIC, depth, bytes.fromhex(base)))
+                size = delta.encode(base_stream, target, out, max_size=budget)
+            if size > budget:
+                return False
+            shutil.copystat(src, tmp_path)
+            os.replace(tmp_path, delta_path)
+            return True
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @tracing.traced()
+    def store_tree(self, src_root: Path, previous: Optional[Manifest] = None,
+                   progress_callback: Optional[ProgressCallback] = None,
+                   cancel_check: Optional[CancelCheck] = None,
+                   workers: int = 1) -> Tuple[Manifest, CopyStats]:
+        """
+        Stores every file below src_root and returns the snapshot manifest with copy stats.
+
+        When a previous manifest is given, files whose size and mtime match it
+        are referenced by their known hash without being read again.
+        With workers > 1 files are hashed and stored concurrently.
+        """
+        items = [
+            (rel, Path(entry.path), entry.stat())
+            for rel, entry in iter_tree(src_root) if entry.is_file()
+        ]
+        meter = CopyMeter(len(items), sum(st.st_size for _, _, st in items), progress_callback)
+
+        def store_one(item: Tuple[str, Path, os.stat_result]) -> FileRecord:
+            rel, path, stat = item
+            meter.start_file(rel, stat.st_size)
+            known = previous.files.get(rel) if previous else None
+            if (known and known.size == stat.st_size and known.mtime == stat.st_mtime
+                    and self.has(known.hash)):
+                meter.finish_file(skipped_bytes=stat.st_size)
+                return known
+            digest = hash_file(path)
+            written = self.put_file(path, digest, meter.add_bytes, base=known.hash if known else None)
+            meter.finish_file(skipped_bytes=0 if written else stat.st_size)
+            return FileRecord(size=stat.st_size, mtime=stat.st_mtime, hash=digest)
+
+        records = run_parallel(store_one, items, workers, cancel_check)
+        files = {rel: record for (rel, _, _), record in zip(items, records)}
+        profile = files.get(PROFILE_BRIEF_FILE_NAME)
+        if profile is None:
+            raise FileNotFoundError(f"{PROFILE_BRIEF_FILE_NAME} not found in {src_root}")
+        return Manifest(profile_mtime=profile.mtime, files=files), meter.stats()
+
+    @tracing.traced()
+    def restore_tree(self, manifest: Manifest, dst_root: Path,
+                     progress_callback: Optional[ProgressCallback] = None,
+                     workers: int = 1, cancel_check: Optional[CancelCheck] = None) -> CopyStats:
+        """Recreates the files of a manifest below dst_root, including their mtimes."""
+        meter = CopyMeter(len(manifest.files), manifest.total_size, progress_callback)
+        for rel, record in manifest.files.items():
+            if not self.has(record.hash):
+                raise FileNotFoundError(f"Backup object missing for {rel}: {self.object_path(record.hash)}")
+            (dst_root / rel).parent.mkdir(parents=True, exist_ok=True)
+
+        def restore_one(item: Tuple[str, FileRecord]):
+            rel, record = item
+            target = dst_root / rel
+            meter.start_file(rel, record.size)
+            self.write_object(record.hash, target, meter.add_bytes)
+            os.utime(target, (record.mtime, record.mtime))
+            meter.finish_file()
+
+        run_parallel(restore_one, list(manifest.files.items()), workers, cancel_check)
+        return meter.stats()
+
+    def disk_usage(self) -> Tuple[int, int]:
+        """Returns the number of stored objects and their total size in bytes."""
+        count = size = 0
+        if self.root.is_dir():
+            for _, entry in iter_tree(self.root):
+                if entry.is_file():
+                    count += 1
+                    size += entry.stat().st_size
+        return count, size
+
+    def _reachable(self, live: Iterable[str]) -> Set[str]:
+        """The live hashes together with every delta base their chains depend on."""
+        reachable: Set[str] = set()
+        pending = list(live)
+        while pending:
+            digest = pending.pop()
+            if digest in reachable:
+                continue
+            reachable.add(digest)
+            if self.delta_path(digest).is_file():
+                pending.append(self.delta_base(digest)[1])
+        return reachable
+
+    @tracing.traced()
+    def collect_garbage(self, live: Iterable[str], candidates: Optional[Iterable[str]] = None) -> int:
+        """
+        Removes objects not referenced by any live hash, keeping the bases of live deltas.
+        With candidates, only those objects (and the delta bases they alone kept) are
+        considered instead of sweeping the whole store. Returns the number removed.
+        """
+        if not self.root.is_dir():
+            return 0
+        live = set(live)
+        if candidates is not None:
+            pending = [digest for digest in candidates if digest not in live]
+            if not pending:
+                return 0
+            reachable = self._reachable(live)
+            removed = 0
+            seen: Set[str] = set()
+            while pending:
+                digest = pending.pop()
+                if digest in seen or digest in reachable:
+                    continue
+                seen.add(digest)
+                if self.delta_path(digest).is_file():
+                    pending.append(self.delta_base(digest)[1])
+                for object_path in (self.object_path(digest), self.delta_path(digest)):
+                    if object_path.is_file():
+                        object_path.unlink()
+                        removed += 1
+            return removed
+
+        reachable = self._reachable(live)
+        removed = 0
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for object_path in bucket.iterdir():
+                # Temporary files belong to a write in progress
+                if object_path.suffix == ".tmp":
+                    continue
+                if object_path.name.removesuffix(DELTA_SUFFIX) not in reachable:
+                    object_path.unlink()
+                    removed += 1
+        return removed
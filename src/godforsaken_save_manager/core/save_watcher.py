@@ -0,0 +1,188 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from godforsaken_save_manager.common.constants import PROFILE_BRIEF_FILE_NAME
+from .file_operations import iter_tree
+
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def tree_signature(path: Path) -> Signature | None:
+    """Returns (path, size, mtime) of every file, or None if the save is incomplete."""
+    if not (path / PROFILE_BRIEF_FILE_NAME).is_file():
+        return None
+    try:
+        signature = []
+        for rel, entry in iter_tree(path):
+            if entry.is_file():
+                stat = entry.stat()
+                signature.append((rel, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+    except OSError:
+        # Files were replaced while scanning; treat the save as still changing
+        return None
+
+
+class _PollingBackend:
+    """Wakes up every poll interval; used when native change notifications are unavailable."""
+
+    def __init__(self, path: Path, poll_interval: float):
+        self.poll_interval = poll_interval
+
+    def wait(self, stop_event: threading.Event) -> bool:
+        return not stop_event.wait(self.poll_interval)
+
+    def close(self):
+        pass
+
+
+def _concerns_save(name: str, save_name: str) -> bool:
+    """True if a change reported relative to the save's parent folder lies inside the save folder."""
+    return name.replace("\\", "/").split("/", 1)[0].casefold() == save_name.casefold()
+
+
+class _Win32Backend:
+    """
+    Blocks on Windows directory change notifications instead of polling.
+
+    The parent folder is watched so that the save folder itself can still be
+    renamed by a restore. The parent usually also holds the backup root, so
+    changes outside the save folder are ignored.
+    """
+    FILE_LIST_DIRECTORY = 0x0001
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, path: Path, poll_interval: float):
+        import pywintypes
+        import win32con
+        import win32event
+        import win32file
+        self._win32event = win32event
+        self._win32file = win32file
+        self.poll_interval = poll_interval
+        self._save_name = path.name
+        self._handle = win32file.CreateFile(
+            str(path.parent), self.FILE_LIST_DIRECTORY,
+            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+            None, win32con.OPEN_EXISTING,
+            win32con.FILE_FLAG_BACKUP_SEMANTICS | win32con.FILE_FLAG_OVERLAPPED, None
+        )
+        self._filter = (
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME | win32con.FILE_NOTIFY_CHANGE_DIR_NAME
+            | win32con.FILE_NOTIFY_CHANGE_SIZE | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        self._buffer = win32file.AllocateReadBuffer(self.BUFFER_SIZE)
+        self._overlapped = pywintypes.OVERLAPPED()
+        self._overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        self._request()
+
+    def _request(self):
+        self._win32event.ResetEvent(self._overlapped.hEvent)
+        self._win32file.ReadDirectoryChangesW(self._handle, self._buffer, True, self._filter, self._overlapped)
+
+    def wait(self, stop_event: threading.Event) -> bool:
+        # Wake up regularly to notice stop requests; an idle wait costs no CPU
+        timeout_ms = int(self.poll_interval * 1000)
+        while not stop_event.is_set():
+            result = self._win32event.WaitForSingleObject(self._overlapped.hEvent, timeout_ms)
+            if result != self._win32event.WAIT_OBJECT_0:
+                continue
+            size = self._win32file.GetOverlappedResult(self._handle, self._overlapped, True)
+            changes = self._win32file.FILE_NOTIFY_INFORMATION(self._buffer, size) if size else None
+            self._request()
+            # An overflowing burst is reported without names; treat it as a change of the save
+            if changes is None or any(_concerns_save(name, self._save_name) for _, name in changes):
+                return True
+        return False
+
+    def close(self):
+        self._win32file.CancelIo(self._handle)
+        self._handle.Close()
+        self._overlapped.hEvent.Close()
+
+
+class SaveWatcher:
+    """
+    Watches the game save folder on a background thread.
+
+    When the files change, the watcher waits until they stay unchanged for
+    settle_seconds, so the game's multi-file writes are reported once, then
+    calls on_settled. If on_settled returns False the change is reported
+    again after retry_seconds, even if nothing else changes meanwhile.
+    """
+
+    def __init__(self, path: Path, on_settled: Callable[[], bool],
+                 settle_seconds: float = 3.0, poll_interval: float = 2.0, retry_seconds: float = 5.0):
+        self.path = path
+        self.on_settled = on_settled
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.retry_seconds = retry_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _create_backend(self):
+        try:
+            return _Win32Backend(self.path, self.poll_interval)
+        except Exception as e:
+            # pywin32 missing or the folder cannot be watched
+            logger.info(f"Native change notifications unavailable ({e}), polling {self.path}.")
+            return _PollingBackend(self.path, self.poll_interval)
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="save-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _wait_until_settled(self, signature: Signature | None) -> Signature | None:
+        """Waits until the tree signature stops changing. Returns None if stopped."""
+        while not self._stop_event.wait(self.settle_seconds):
+            current = tree_signature(self.path)
+            if current is not None and current == signature:
+                return current
+            signature = current
+        return None
+
+    def _run(self):
+        backend = self._create_backend()
+        reported = tree_signature(self.path)
+        retry = False
+        try:
+            while True:
+                if retry:
+                    # The last report was declined; try again without waiting for another change
+                    if self._stop_event.wait(self.retry_seconds):
+                        break
+                    retry = False
+                elif not backend.wait(self._stop_event):
+                    break
+                current = tree_signature(self.path)
+                if current == reported:
+                    continue
+                settled = self._wait_until_settled(current)
+                if settled is None or settled == reported:
+                    continue
+                try:
+                    if self.on_settled() is False:
+                        retry = True
+                    else:
+                        reported = settled
+                except Exception as e:
+                    logger.error(f"Save watcher callback failed: {e}")
+        finally:
+            backend.close()
@@ -0,0 +1,123 @@
+import json
+import os
+import struct
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from godforsaken_save_manager.common.constants import MANIFEST_FILE_NAME, PROFILE_BRIEF_FILE_NAME
+from .file_operations import (
+    COPY_BUFFER_SIZE, CancelCheck, CopyMeter, CopyStats, ProgressCallback, check_cancelled, iter_tree
+)
+from .manifest import STORAGE_ARCHIVE, FileRecord, Manifest, new_hasher
+
+# The manifest is stored uncompressed next to the save files. Zip keeps its
+# directory at the end of the file, so the manifest can be read without
+# inflating any save data.
+ARCHIVE_COMPRESSION = zipfile.ZIP_DEFLATED
+
+# Zip's own timestamp is local time with two-second resolution, so each member also
+# carries its exact mtime in the "extended timestamp" extra field (UTC seconds)
+_EXTENDED_TIMESTAMP_ID = 0x5455
+_EXTRA_HEADER = struct.Struct("<HH")
+_EXTENDED_TIMESTAMP = struct.Struct("<Bl")
+
+
+def _member_info(rel: str, stat: os.stat_result, compression_level: int) -> zipfile.ZipInfo:
+    # Zip dates start in 1980
+    info = zipfile.ZipInfo(rel, date_time=max(time.localtime(stat.st_mtime)[:6], (1980, 1, 1, 0, 0, 0)))
+    info.compress_type = ARCHIVE_COMPRESSION
+    info._compresslevel = compression_level  # What ZipFile.open sets for members opened by name
+    mtime = int(stat.st_mtime)
+    if -2 ** 31 <= mtime < 2 ** 31:
+        info.extra = _EXTRA_HEADER.pack(_EXTENDED_TIMESTAMP_ID, _EXTENDED_TIMESTAMP.size) + \
+            _EXTENDED_TIMESTAMP.pack(1, mtime)
+    return info
+
+
+def _member_mtime(info: zipfile.ZipInfo) -> Optional[int]:
+    """Reads the mtime in whole seconds from the extended timestamp field, if present."""
+    extra = info.extra
+    while len(extra) >= _EXTRA_HEADER.size:
+        field_id, size = _EXTRA_HEADER.unpack_from(extra)
+        data = extra[_EXTRA_HEADER.size:_EXTRA_HEADER.size + size]
+        if field_id == _EXTENDED_TIMESTAMP_ID and len(data) >= _EXTENDED_TIMESTAMP.size and data[0] & 1:
+            return _EXTENDED_TIMESTAMP.unpack_from(data)[1]
+        extra = extra[_EXTRA_HEADER.size + size:]
+    return None
+
+
+def pack_tree(src_root: Path, archive_path: Path, compression_level: int = 6,
+              progress_callback: Optional[ProgressCallback] = None,
+              cancel_check: Optional[CancelCheck] = None) -> Tuple[Manifest, CopyStats]:
+    """
+    Streams every file below src_root into a compressed zip archive.
+    Files are read once: hashing and compression happen on the same chunks.
+    """
+    items = [(rel, entry.stat()) for rel, entry in iter_tree(src_root) if entry.is_file()]
+    if not any(rel == PROFILE_BRIEF_FILE_NAME for rel, _ in items):
+        raise FileNotFoundError(f"{PROFILE_BRIEF_FILE_NAME} not found in {src_root}")
+    meter = CopyMeter(len(items), sum(st.st_size for _, st in items), progress_callback)
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    files = {}
+
+    with zipfile.ZipFile(archive_path, 'w', compression=ARCHIVE_COMPRESSION,
+                         compresslevel=compression_level) as zf:
+        for rel, stat in items:
+            check_cancelled(cancel_check)
+            meter.start_file(rel, stat.st_size)
+            hasher = new_hasher()
+            info = _member_info(rel, stat, compression_level)
+            with open(src_root / rel, 'rb') as fsrc, zf.open(info, 'w', force_zip64=True) as fdst:
+                while count := fsrc.readinto(buffer):
+                    hasher.update(view[:count])
+                    fdst.write(view[:count])
+                    meter.add_bytes(count)
+            files[rel] = FileRecord(size=stat.st_size, mtime=stat.st_mtime, hash=hasher.hexdigest())
+            meter.finish_file()
+
+        manifest = Manifest(
+            profile_mtime=files[PROFILE_BRIEF_FILE_NAME].mtime, files=files, storage=STORAGE_ARCHIVE
+        )
+        zf.writestr(MANIFEST_FILE_NAME, manifest.to_json(), compress_type=zipfile.ZIP_STORED)
+    return manifest, meter.stats()
+
+
+def read_manifest(archive_path: Path) -> Manifest:
+    """Reads the snapshot manifest from the archive header without inflating save data."""
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        return Manifest.from_dict(json.loads(zf.read(MANIFEST_FILE_NAME)))
+
+
+def member_stats(archive_path: Path) -> Dict[str, Tuple[int, Optional[int]]]:
+    """
+    Returns the uncompressed size and the mtime in whole seconds of every save file
+    in the archive. The mtime is None for archives written without it.
+    """
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        return {info.filename: (info.file_size, _member_mtime(info)) for info in zf.infolist()
+                if info.filename != MANIFEST_FILE_NAME}
+
+
+def unpack_tree(archive_path: Path, manifest: Manifest, dst_root: Path,
+                progress_callback: Optional[ProgressCallback] = None,
+                cancel_check: Optional[CancelCheck] = None) -> CopyStats:
+    """Streams the files of an archive into dst_root and restores their mtimes."""
+    meter = CopyMeter(len(manifest.files), manifest.total_size, progress_callback)
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        for rel, record in manifest.files.items():
+            check_cancelled(cancel_check)
+            target = dst_root / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            meter.start_file(rel, record.size)
+            with zf.open(rel, 'r') as fsrc, open(target, 'wb') as fdst:
+                while count := fsrc.readinto(buffer):
+                    fdst.write(view[:count])
+                    meter.add_bytes(count)
+            os.utime(target, (record.mtime, record.mtime))
+            meter.finish_file()
+    return meter.stats()
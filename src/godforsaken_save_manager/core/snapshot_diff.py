@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from godforsaken_save_manager.common.constants import ARCHIVE_FILE_NAME, MANIFEST_FILE_NAME
+from .file_operations import CancelCheck, CopyMeter, ProgressCallback, iter_tree, run_parallel
+from .manifest import FileRecord, Manifest, hash_file
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+@dataclass
+class FileChange:
+    path: str  # POSIX relative path
+    status: str  # ADDED, REMOVED or CHANGED
+    old_size: int = 0
+    new_size: int = 0
+
+    @property
+    def size_delta(self) -> int:
+        return self.new_size - self.old_size
+
+
+@dataclass
+class SnapshotDiff:
+    """The files that differ between an old and a new side, sorted by path."""
+    changes: List[FileChange] = field(default_factory=list)
+    unchanged_count: int = 0
+
+    def _with_status(self, status: str) -> List[FileChange]:
+        return [change for change in self.changes if change.status == status]
+
+    @property
+    def added(self) -> List[FileChange]:
+        return self._with_status(ADDED)
+
+    @property
+    def removed(self) -> List[FileChange]:
+        return self._with_status(REMOVED)
+
+    @property
+    def changed(self) -> List[FileChange]:
+        return self._with_status(CHANGED)
+
+    @property
+    def size_delta(self) -> int:
+        return sum(change.size_delta for change in self.changes)
+
+    @property
+    def identical(self) -> bool:
+        return not self.changes
+
+
+@dataclass
+class DiffSide:
+    """
+    The files of one side of a diff.
+    Records from a manifest carry their hash; records scanned from a directory
+    have an empty hash, which is computed from root only when needed.
+    """
+    files: Dict[str, FileRecord]
+    root: Optional[Path] = None
+
+    @classmethod
+    def from_manifest(cls, manifest: Manifest) -> "DiffSide":
+        return cls(manifest.files)
+
+    @classmethod
+    def scan(cls, root: Path, known: Optional[Manifest] = None) -> "DiffSide":
+        """
+        Lists the files below root. A file whose size and mtime match its record in
+        `known` (usually the latest snapshot) takes the hash from there, as
+        incremental backups do.
+        """
+        files = {}
+        for rel, entry in iter_tree(root):
+            if not entry.is_file() or rel in (MANIFEST_FILE_NAME, ARCHIVE_FILE_NAME):
+                continue
+            stat = entry.stat()
+            record = known.files.get(rel) if known else None
+            digest = record.hash if record and record.size == stat.st_size and record.mtime == stat.st_mtime else ""
+            files[rel] = FileRecord(size=stat.st_size, mtime=stat.st_mtime, hash=digest)
+        return cls(files, root)
+
+
+def diff_sides(old: DiffSide, new: DiffSide, workers: int = 1,
+               progress_callback: Optional[ProgressCallback] = None,
+               cancel_check: Optional[CancelCheck] = None) -> SnapshotDiff:
+    """
+    Compares two sides file by file.
+    Different sizes mean changed and equal hashes mean unchanged. When a hash is
+    missing, equal size and mtime count as unchanged; only the remaining files
+    are hashed, in parallel.
+    """
+    result = SnapshotDiff()
+    to_hash: List[Tuple[str, FileRecord, FileRecord]] = []
+    for rel in sorted(old.files.keys() | new.files.keys()):
+        old_record, new_record = old.files.get(rel), new.files.get(rel)
+        if new_record is None:
+            result.changes.append(FileChange(rel, REMOVED, old_size=old_record.size))
+        elif old_record is None:
+            result.changes.append(FileChange(rel, ADDED, new_size=new_record.size))
+        elif old_record.size != new_record.size:
+            result.changes.append(FileChange(rel, CHANGED, old_record.size, new_record.size))
+        elif old_record.hash and new_record.hash:
+            if old_record.hash == new_record.hash:
+                result.unchanged_count += 1
+            else:
+                result.changes.append(FileChange(rel, CHANGED, old_record.size, new_record.size))
+        elif old_record.mtime == new_record.mtime:
+            result.unchanged_count += 1
+        else:
+            to_hash.append((rel, old_record, new_record))
+
+    meter = CopyMeter(len(to_hash), sum(record.size for _, record, _ in to_hash), progress_callback)
+
+    def content_hash(side: DiffSide, rel: str, record: FileRecord) -> str:
+        return record.hash or hash_file(side.root / rel)
+
+    def differs(item: Tuple[str, FileRecord, FileRecord]) -> bool:
+        rel, old_record, new_record = item
+        meter.start_file(rel, new_record.size)
+        changed = content_hash(old, rel, old_record) != content_hash(new, rel, new_record)
+        meter.finish_file(skipped_bytes=new_record.size)
+        return changed
+
+    for (rel, old_record, new_record), changed in zip(to_hash, run_parallel(differs, to_hash, workers, cancel_check)):
+        if changed:
+            result.changes.append(FileChange(rel, CHANGED, old_record.size, new_record.size))
+        else:
+            result.unchanged_count += 1
+    result.changes.sort(key=lambda change: change.path)
+    return result
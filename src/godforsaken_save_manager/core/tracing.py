@@ -0,0 +1,228 @@
+"""
+Operation tracing for the core, enabled with the environment variable GFSM_TRACE.
+
+    GFSM_TRACE=log      finished spans go to a rotating log (gfsm_trace.log in the temp directory)
+    GFSM_TRACE=chrome   spans are written as a Chrome trace (gfsm_trace.json), viewable in
+                        chrome://tracing or https://ui.perfetto.dev
+    GFSM_TRACE_FILE     overrides the output path
+
+A span records its wall time plus counters such as bytes, files and I/O calls;
+when it ends, its counters are added to the enclosing span. Worker threads join
+the span that started them through `current()` and `attached()`.
+
+When tracing is disabled, `traced` returns the function unchanged and `span`
+returns a shared no-op object, so instrumented code pays nothing but the call.
+"""
+
+import atexit
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+MODE = os.environ.get("GFSM_TRACE", "").strip().lower()
+ENABLED = MODE in ("log", "chrome")
+LOG_FILE_NAME = "gfsm_trace.log"
+CHROME_FILE_NAME = "gfsm_trace.json"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# Keeps a long session from growing the Chrome trace without bound
+MAX_CHROME_EVENTS = 200_000
+
+F = TypeVar("F", bound=Callable)
+
+_local = threading.local()
+_lock = threading.Lock()
+_totals: Counter = Counter()
+_events: List[dict] = []
+_dropped_events = 0
+_logger: Optional[logging.Logger] = None
+
+
+def _output_path(default_name: str) -> str:
+    return os.environ.get("GFSM_TRACE_FILE") or os.path.join(tempfile.gettempdir(), default_name)
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class Span:
+    """A timed region with counters. Use via `span()` or `traced()`."""
+    __slots__ = ("name", "args", "counters", "_start")
+
+    def __init__(self, name: str, args: Dict[str, object]):
+        self.name = name
+        self.args = args
+        self.counters: Counter = Counter()
+        self._start = 0
+
+    def add(self, counter: str, amount: int = 1):
+        self.counters[counter] += amount
+
+    def __enter__(self) -> "Span":
+        _stack().append(self)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter_ns() - self._start
+        stack = _stack()
+        stack.pop()
+        if stack and self.counters:
+            with _lock:
+                stack[-1].counters.update(self.counters)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record(self, duration)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def add(self, counter: str, amount: int = 1):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args) -> Span | _NullSpan:
+    """Returns a span to use as a context manager."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, args)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorates a function to run inside a span named after it."""
+    def decorator(func: F) -> F:
+        if not ENABLED:
+            return func
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def count(counter: str, amount: int = 1):
+    """Adds to a counter of the innermost span of this thread."""
+    if not ENABLED:
+        return
+    stack = _stack()
+    with _lock:
+        if stack:
+            stack[-1].counters[counter] += amount
+        else:
+            _totals[counter] += amount
+
+
+def current() -> Optional[Span]:
+    """Returns the innermost span of this thread, to hand to worker threads."""
+    if not ENABLED:
+        return None
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def attached(parent: Optional[Span]) -> Iterator[None]:
+    """Makes spans and counters of this thread count towards a span of another thread."""
+    if parent is None:
+        yield
+        return
+    stack = _stack()
+    stack.append(parent)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _record(finished: Span, duration_ns: int):
+    global _dropped_events
+    is_root = len(_stack()) == 0
+    with _lock:
+        if is_root:
+            _totals.update(finished.counters)
+        if MODE == "chrome":
+            if len(_events) >= MAX_CHROME_EVENTS:
+                _dropped_events += 1
+                return
+            _events.append({
+                "name": finished.name,
+                "ph": "X",
+                "ts": finished._start / 1000,
+                "dur": duration_ns / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {**finished.args, **finished.counters},
+            })
+            return
+    if _logger:
+        fields = " ".join(f"{k}={v}" for k, v in {**finished.args, **finished.counters}.items())
+        _logger.info(f"{finished.name} {duration_ns / 1e6:.3f}ms {fields}".rstrip())
+
+
+def totals() -> Dict[str, int]:
+    """Returns the counters accumulated by all finished top-level spans."""
+    with _lock:
+        return dict(_totals)
+
+
+def flush():
+    """Writes the Chrome trace, or the counter totals to the log."""
+    if not ENABLED:
+        return
+    with _lock:
+        if MODE == "chrome":
+            trace = {"traceEvents": list(_events), "otherData": {"totals": dict(_totals),
+                                                                 "dropped_events": _dropped_events}}
+            path = _output_path(CHROME_FILE_NAME)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+            os.replace(tmp_path, path)
+            return
+        summary = " ".join(f"{k}={v}" for k, v in sorted(_totals.items()))
+    if _logger:
+        _logger.info(f"totals {summary}")
+
+
+def _setup():
+    global _logger
+    if MODE == "log":
+        handler = RotatingFileHandler(
+            _output_path(LOG_FILE_NAME), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(threadName)s] %(message)s"))
+        _logger = logging.getLogger("gfsm.trace")
+        _logger.setLevel(logging.INFO)
+        _logger.addHandler(handler)
+        _logger.propagate = False
+    atexit.register(flush)
+
+
+if ENABLED:
+    _setup()
@@ -1,26 +1,128 @@
 import requests
 import tempfile
 import os
+import re
 import sys
 import subprocess
 import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional, Dict, Any
 
-from ..common.constants import GITHUB_REPO, APP_VERSION
+from requests.adapters import HTTPAdapter
+
+from . import delta
+from ..common.constants import GITHUB_REPO, APP_VERSION, UPDATE_CACHE_FILE_NAME
 from ..i18n.translator import get_current_language
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 10
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+# Size of each ranged request when downloading in parallel
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+DOWNLOAD_RETRIES = 3
+MAX_DOWNLOAD_WORKERS = 8
+NEW_EXE_NAME = "GodForsakenSaveManager_new.exe"
+DELTA_FILE_NAME = "GodForsakenSaveManager_update.delta"
+DEFAULT_CHECK_INTERVAL = 6 * 3600
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+# Errors after which the download can resume from the bytes already received
+_RESUMABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Returns the connection-pooled session shared by the API and download requests."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=MAX_DOWNLOAD_WORKERS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class _PartialDownload:
+    """
+    A download written to a .part file and hashed as it grows.
+    Bytes kept from an earlier attempt are hashed once when the file is opened.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file: BinaryIO = open(path, "a+b")
+        self.hasher = hashlib.sha256()
+        self.offset = 0
+        self.file.seek(0)
+        while chunk := self.file.read(DOWNLOAD_BUFFER_SIZE):
+            self.hasher.update(chunk)
+            self.offset += len(chunk)
+
+    def write(self, data: bytes):
+        self.file.write(data)
+        self.hasher.update(data)
+        self.offset += len(data)
+
+    def restart(self):
+        """Drops everything received so far, for servers that ignore the Range header."""
+        self.file.seek(0)
+        self.file.truncate()
+        self.hasher = hashlib.sha256()
+        self.offset = 0
+
+    def close(self):
+        self.file.close()
+
+
+class _HashingWriter:
+    """Passes writes through to a file while hashing them."""
+
+    def __init__(self, file: BinaryIO, hasher):
+        self.file = file
+        self.hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        return self.file.write(data)
+
 
 class Updater:
     """
     Handles application updates by checking for new releases on GitHub.
     """
-    def __init__(self):
+    def __init__(self, download_workers: int = 1, session: Optional[requests.Session] = None,
+                 download_dir: Optional[str] = None, check_interval: float = DEFAULT_CHECK_INTERVAL,
+                 cache_path: Optional[str] = None):
+        """
+        download_workers > 1 downloads large files as parallel ranged requests
+        when the server supports them. Within check_interval seconds of the last
+        check, the cached release metadata is used without any request.
+        """
         self.api_url = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
         self.latest_version_info: Optional[Dict[str, Any]] = None
         self.current_version = APP_VERSION
+        self.download_workers = max(1, min(download_workers, MAX_DOWNLOAD_WORKERS))
+        self.session = session or get_session()
+        self.download_dir = Path(download_dir or tempfile.gettempdir())
+        # Delta updates patch this file
+        self.base_executable = sys.executable
+        self.check_interval = check_interval
+        self.cache_path = Path(cache_path or os.path.join(tempfile.gettempdir(), UPDATE_CACHE_FILE_NAME))
 
     def get_update_notes(self) -> str:
         """
@@ -38,23 +140,26 @@ class Updater:
         
         return notes.get(lang_short, notes.get("en", "No release notes available."))
 
-    def check_for_update(self) -> Optional[Dict[str, Any]]:
+    def check_for_update(self, force: bool = False) -> Optional[Dict[str, Any]]:
         """
         Checks for the latest release and returns version info if it's newer.
+
+        Responses are cached on disk and revalidated with ETag/Last-Modified, so an
+        unchanged release costs a 304 (which GitHub does not count against the rate
+        limit). Within check_interval of the last check no request is made at all,
+        unless force is set.
         """
+        cache = self._load_cache()
+        offline = not force and time.time() - cache.get("checked_at", 0) < self.check_interval
         try:
-            response = requests.get(self.api_url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(self.api_url, cache, offline)
             latest_version = data["tag_name"].lstrip("v")
 
             if self._is_newer(latest_version, self.current_version):
                 logger.info(f"New version found: {latest_version}")
                 asset = next((a for a in data["assets"] if a["name"] == "version.json"), None)
                 if asset:
-                    version_info_resp = requests.get(asset["browser_download_url"], timeout=10)
-                    version_info_resp.raise_for_status()
-                    self.latest_version_info = version_info_resp.json()
+                    self.latest_version_info = self._get_json(asset["browser_download_url"], cache, offline)
                     return self.latest_version_info
                 else:
                     logger.warning("Release found, but version.json is missing.")
@@ -65,9 +170,67 @@ class Updater:
             logger.error(f"Failed to check for updates: {e}")
         except (KeyError, StopIteration, ValueError):
             logger.error("Failed to parse release API response.")
-        
+        finally:
+            self._save_cache(cache)
+
         return None
 
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if isinstance(cache, dict) and isinstance(cache.get("responses"), dict):
+                cache["dirty"] = False
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {"checked_at": 0, "responses": {}, "dirty": False}
+
+    def _save_cache(self, cache: Dict[str, Any]):
+        if not cache.pop("dirty", False):
+            return
+        try:
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write update cache: {e}")
+
+    def _get_json(self, url: str, cache: Dict[str, Any], offline: bool = False) -> Any:
+        """
+        Fetches a JSON document through the cache. Offline, a cached copy is returned
+        without a request; otherwise the cached copy is revalidated conditionally.
+        """
+        cached = cache["responses"].get(url)
+        if offline and cached:
+            logger.info(f"Using cached response for {url}")
+            return cached["body"]
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached:
+            body = cached["body"]
+        else:
+            response.raise_for_status()
+            body = response.json()
+            if url == self.api_url:
+                # A new release makes the other cached documents obsolete
+                cache["responses"].clear()
+            cache["responses"][url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body": body,
+            }
+        if url == self.api_url:
+            cache["checked_at"] = time.time()
+        cache["dirty"] = True
+        return body
+
     def _is_newer(self, new_version: str, current_version: str) -> bool:
         """
         Compares two version strings (e.g., "1.2.0" vs "1.1.0").
@@ -80,55 +243,40 @@ class Updater:
             logger.warning(f"Could not compare versions '{new_version}' and '{current_version}'")
             return False
 
-    def download_and_verify(self, progress_callback=None) -> Optional[str]:
+    def download_and_verify(self, progress_callback=None,
+                            cancel_check: Optional[Callable[[], bool]] = None) -> Optional[str]:
         """
         Downloads the new executable, verifies its integrity, and returns the path.
+
+        When version.json lists a delta from the running version, only the delta is
+        downloaded and patched onto the current executable; any problem with it falls
+        back to the full download. The SHA-256 is computed while downloading.
+        Received bytes are kept in a .part file named after the expected hash, so an
+        interrupted or cancelled download resumes with a Range request.
         """
         if not self.latest_version_info:
             logger.error("No update information available to download.")
             return None
 
         exe_url = self.latest_version_info["url"]
-        expected_sha256 = self.latest_version_info["sha256"]
-        file_name = os.path.basename(exe_url)
-        # Use a more specific name for the new executable
-        target_path = os.path.join(tempfile.gettempdir(), f"GodForsakenSaveManager_new.exe")
+        expected_sha256 = self.latest_version_info["sha256"].lower().strip()
+        target_path = self.download_dir / NEW_EXE_NAME
 
         try:
-            logger.info(f"Downloading update from {exe_url} to {target_path}...")
-            with requests.get(exe_url, stream=True, timeout=60) as r:
-                r.raise_for_status()
-                total_size = int(r.headers.get('content-length', 0))
-                downloaded_size = 0
-                with open(target_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0 and progress_callback:
-                            progress = int((downloaded_size / total_size) * 100)
-                            progress_callback(progress)
-            
-            logger.info("Download complete. Verifying file integrity...")
-            if progress_callback:
-                progress_callback(100) # Ensure it finishes at 100
-
-            hasher = hashlib.sha256()
-            with open(target_path, "rb") as f:
-                buf = f.read(65536)
-                while len(buf) > 0:
-                    hasher.update(buf)
-                    buf = f.read(65536)
-            
-            actual_sha256 = hasher.hexdigest()
+            patch = self._find_delta()
+            if patch:
+                if self._update_with_delta(patch, expected_sha256, target_path, progress_callback, cancel_check):
+                    return str(target_path)
+                logger.info("Delta update unavailable, falling back to the full download.")
 
-            if actual_sha256.lower() != expected_sha256.lower().strip():
-                logger.error(f"Checksum mismatch! Expected {expected_sha256}, got {actual_sha256}")
-                os.remove(target_path)
+            logger.info(f"Downloading update from {exe_url} to {target_path}...")
+            if not self._fetch_verified(exe_url, expected_sha256, target_path, progress_callback, cancel_check):
                 return None
-
             logger.info("Verification successful.")
-            return target_path
+            return str(target_path)
 
+        except DownloadCancelled:
+            logger.info("Download cancelled; the partial file is kept for resuming.")
         except requests.RequestException as e:
             logger.error(f"Failed to download update: {e}")
         except IOError as e:
@@ -136,6 +284,202 @@ class Updater:
 
         return None
 
+    def _fetch_verified(self, url: str, expected_sha256: str, target_path: Path,
+                        progress_callback, cancel_check) -> bool:
+        """Downloads url to target_path. Returns False, discarding the file, if the hash does not match."""
+        expected_sha256 = expected_sha256.lower().strip()
+        part_path = target_path.with_name(f"{target_path.name}.{expected_sha256[:16]}.part")
+        self._remove_stale_parts(target_path, part_path)
+
+        download = _PartialDownload(part_path)
+        try:
+            if download.offset:
+                logger.info(f"Resuming download at {download.offset} bytes.")
+            self._download(url, download, progress_callback, cancel_check)
+            actual_sha256 = download.hasher.hexdigest()
+        finally:
+            download.close()
+
+        logger.info("Download complete. Verifying file integrity...")
+        if progress_callback:
+            progress_callback(100) # Ensure it finishes at 100
+
+        if actual_sha256 != expected_sha256:
+            logger.error(f"Checksum mismatch! Expected {expected_sha256}, got {actual_sha256}")
+            os.remove(part_path)
+            return False
+        os.replace(part_path, target_path)
+        return True
+
+    @staticmethod
+    def _remove_stale_parts(target_path: Path, keep: Path):
+        """Removes partial downloads of other versions."""
+        for part in target_path.parent.glob(f"{target_path.name}.*.part"):
+            if part != keep:
+                try:
+                    part.unlink()
+                except OSError:
+                    pass
+
+    def _find_delta(self) -> Optional[Dict[str, Any]]:
+        """Returns the delta entry of version.json that patches the running version, if any."""
+        for patch in self.latest_version_info.get("deltas") or []:
+            if patch.get("from") == self.current_version and patch.get("url") and patch.get("sha256"):
+                return patch
+        return None
+
+    def _update_with_delta(self, patch: Dict[str, Any], expected_sha256: str, target_path: Path,
+                           progress_callback, cancel_check) -> bool:
+        """Downloads a delta and patches the running executable with it. Returns False if that failed."""
+        base_path = Path(self.base_executable)
+        delta_path = self.download_dir / DELTA_FILE_NAME
+        try:
+            if patch.get("base_size") is not None and base_path.stat().st_size != patch["base_size"]:
+                logger.info("The running executable does not match the delta base.")
+                return False
+            logger.info(f"Downloading delta update from {patch['url']}...")
+            # The download takes most of the time; patching reports the last 10%
+            download_progress = (lambda p: progress_callback(p * 9 // 10)) if progress_callback else None
+            if not self._fetch_verified(patch["url"], patch["sha256"], delta_path, download_progress, cancel_check):
+                return False
+            try:
+                return self._apply_delta(base_path, delta_path, target_path, expected_sha256, progress_callback)
+            finally:
+                delta_path.unlink(missing_ok=True)
+        except DownloadCancelled:
+            raise
+        except (requests.RequestException, OSError, delta.DeltaError) as e:
+            logger.warning(f"Delta update failed: {e}")
+            return False
+
+    @staticmethod
+    def _apply_delta(base_path: Path, delta_path: Path, target_path: Path, expected_sha256: str,
+                     progress_callback) -> bool:
+        """Streams the patched executable to target_path, hashing it on the way."""
+        logger.info("Applying delta update...")
+        part_path = target_path.with_name(f"{target_path.name}.patching")
+        hasher = hashlib.sha256()
+        written = 0
+        with open(base_path, "rb") as base, open(delta_path, "rb") as patch, open(part_path, "wb") as out:
+            target_size = delta.read_header(patch)[2]
+            patch.seek(0)
+
+            def on_chunk(size: int):
+                nonlocal written
+                written += size
+                if progress_callback and target_size:
+                    progress_callback(90 + written * 10 // target_size)
+
+            delta.apply(base, patch, _HashingWriter(out, hasher), on_chunk)
+
+        actual_sha256 = hasher.hexdigest()
+        if actual_sha256 != expected_sha256:
+            logger.error(f"Patched executable does not match! Expected {expected_sha256}, got {actual_sha256}")
+            os.remove(part_path)
+            return False
+        os.replace(part_path, target_path)
+        logger.info("Delta update applied and verified.")
+        return True
+
+    def _download(self, url: str, download: _PartialDownload, progress_callback, cancel_check):
+        """Fetches the rest of url into download, resuming after dropped connections."""
+        total = self._probe_size(url) if self.download_workers > 1 else None
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                if total and total - download.offset >= 2 * DOWNLOAD_CHUNK_SIZE:
+                    self._download_chunks(url, download, total, progress_callback, cancel_check)
+                else:
+                    self._download_stream(url, download, progress_callback, cancel_check)
+                return
+            except _RESUMABLE_ERRORS as e:
+                if attempt == DOWNLOAD_RETRIES:
+                    raise
+                logger.warning(f"Download interrupted at {download.offset} bytes, resuming: {e}")
+
+    def _probe_size(self, url: str) -> Optional[int]:
+        """Returns the size of url if the server answers ranged requests, None otherwise."""
+        try:
+            with self.session.get(url, headers={"Range": "bytes=0-0", "Accept-Encoding": "identity"},
+                                  stream=True, timeout=REQUEST_TIMEOUT) as r:
+                match = _CONTENT_RANGE.match(r.headers.get("Content-Range", ""))
+                if r.status_code == 206 and match and match.group(3) != "*":
+                    return int(match.group(3))
+        except requests.RequestException as e:
+            logger.warning(f"Could not probe download size: {e}")
+        return None
+
+    @staticmethod
+    def _report(progress_callback, done: int, total: int):
+        if total > 0 and progress_callback:
+            progress_callback(int((done / total) * 100))
+
+    def _download_stream(self, url: str, download: _PartialDownload, progress_callback, cancel_check):
+        # Ranges count raw bytes, so ask for the file without content encoding
+        headers = {"Accept-Encoding": "identity"}
+        if download.offset:
+            headers["Range"] = f"bytes={download.offset}-"
+        with self.session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
+            if r.status_code == 416:
+                # The partial file is not a prefix of what the server has now
+                download.restart()
+                raise requests.ConnectionError("Requested range not satisfiable")
+            r.raise_for_status()
+            if download.offset:
+                match = _CONTENT_RANGE.match(r.headers.get("Content-Range", ""))
+                if r.status_code != 206 or not match or int(match.group(1)) != download.offset:
+                    logger.info("Server ignored the Range header; downloading from the start.")
+                    download.restart()
+            length = int(r.headers.get('content-length', 0))
+            total = download.offset + length if length else 0
+            # Keep the bytes of a cut-off response; the length check below makes it resume
+            r.raw.enforce_content_length = False
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+                download.write(chunk)
+                self._report(progress_callback, download.offset, total)
+                if cancel_check and cancel_check():
+                    raise DownloadCancelled()
+            if total > download.offset:
+                raise requests.exceptions.ChunkedEncodingError("Connection closed before the download completed")
+
+    def _fetch_range(self, url: str, start: int, end: int) -> bytes:
+        headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                with self.session.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT) as r:
+                    r.raise_for_status()
+                    if r.status_code != 206 or len(r.content) != end - start + 1:
+                        raise requests.ConnectionError(f"Bad ranged response for bytes {start}-{end}")
+                    return r.content
+            except _RESUMABLE_ERRORS:
+                if attempt == DOWNLOAD_RETRIES:
+                    raise
+        raise AssertionError("unreachable")
+
+    def _download_chunks(self, url: str, download: _PartialDownload, total: int,
+                         progress_callback, cancel_check):
+        """
+        Fetches the rest of the file as parallel ranged requests.
+        Chunks are written and hashed in order as they arrive; at most two chunks
+        per worker are held in memory.
+        """
+        ranges = deque(
+            (start, min(start + DOWNLOAD_CHUNK_SIZE, total) - 1)
+            for start in range(download.offset, total, DOWNLOAD_CHUNK_SIZE)
+        )
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            try:
+                while ranges or pending:
+                    while ranges and len(pending) < self.download_workers * 2:
+                        pending.append(executor.submit(self._fetch_range, url, *ranges.popleft()))
+                    download.write(pending.popleft().result())
+                    self._report(progress_callback, download.offset, total)
+                    if cancel_check and cancel_check():
+                        raise DownloadCancelled()
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def apply_update(self, new_exe_path: str):
         """
         Launches the new executable to perform the update and exits.
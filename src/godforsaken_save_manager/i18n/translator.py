@@ -3,14 +3,77 @@
 提供多语言支持功能，包括语言自动检测、翻译加载和文本获取
 """
 
+import atexit
+import hashlib
 import json
+import marshal
 import os
 import locale
+import sys
+import tempfile
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Optional
+from string import Formatter
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
 
 from ..common.paths import get_base_path
 
+# 翻译表缓存格式版本，修改 _compile 的输出时需要递增
+CACHE_VERSION = 1
+CACHE_DIR = Path(tempfile.gettempdir()) / "gfsm_i18n_cache"
+# 设置 GFSM_I18N_REPORT=1 后，退出时输出所有找不到翻译的键
+REPORT_MISSES = os.environ.get("GFSM_I18N_REPORT") == "1"
+MISSES_FILE_NAME = "gfsm_i18n_misses.txt"
+
+# 带参数的文本：预先绑定的 str.format 与其需要的参数名
+Template = Tuple[Callable[..., str], FrozenSet[str]]
+
+
+def _flatten(tree: dict, prefix: str = "") -> Dict[str, str]:
+    """把嵌套的翻译字典展开为 'a.b.c' -> 文本 的单层字典"""
+    flat = {}
+    for name, value in tree.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{key}."))
+        else:
+            flat[key] = value
+    return flat
+
+
+def _template_fields(text: str) -> Optional[FrozenSet[str]]:
+    """
+    解析文本中的格式化字段，返回需要的参数名。
+    没有字段返回空集合；含位置参数或格式错误的文本无法用关键字参数格式化，返回 None
+    """
+    fields = set()
+    try:
+        for _, field_name, _, _ in Formatter().parse(text):
+            if field_name is None:
+                continue
+            name = field_name.split('.', 1)[0].split('[', 1)[0]
+            if not name or name.isdigit():
+                return None
+            fields.add(name)
+    except ValueError:
+        return None
+    return frozenset(fields)
+
+
+def _compile(tree: dict) -> Tuple[Dict[str, str], Dict[str, Tuple[str, ...]]]:
+    """返回展开后的翻译表，以及带参数文本的参数名（可以被 marshal 缓存）"""
+    table = _flatten(tree)
+    fields = {}
+    for key, text in table.items():
+        if not isinstance(text, str):
+            continue
+        # 只有含花括号的文本需要格式化（包括只有 {{ }} 转义的文本）
+        if '{' in text or '}' in text:
+            text_fields = _template_fields(text)
+            if text_fields is not None:
+                fields[key] = tuple(sorted(text_fields))
+    return table, fields
+
 
 class Language:
     """支持的语言枚举"""
@@ -38,9 +101,18 @@ class Language:
 class Translator:
     """翻译器类，负责加载和管理多语言文本"""
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        :param cache_dir: 翻译表缓存目录，为 None 时每次都解析 JSON
+        """
         self._current_language: Optional[str] = None
         self._translations: Dict[str, Dict[str, str]] = {}
+        self._templates: Dict[str, Dict[str, Template]] = {}
+        # 当前语言的翻译表，t() 只需一次字典查找
+        self._table: Dict[str, str] = {}
+        self._current_templates: Dict[str, Template] = {}
+        self._misses: Counter = Counter()
+        self._cache_dir = cache_dir
         self._base_path = get_base_path()
 
     def get_available_languages(self) -> Dict[str, str]:
@@ -79,9 +151,12 @@ class Translator:
             return False
 
         try:
-            with open(translation_file, 'r', encoding='utf-8') as f:
-                self._translations[language_code] = json.load(f)
-            self._current_language = language_code
+            table, fields = self._load_compiled(translation_file)
+            self._translations[language_code] = table
+            self._templates[language_code] = {
+                key: (table[key].format, frozenset(names)) for key, names in fields.items()
+            }
+            self._activate(language_code)
             return True
         except Exception as e:
             print(f"加载翻译文件失败: {e}")
@@ -90,9 +165,49 @@ class Translator:
                 return self.load_translations(Language.ENGLISH)
             return False
 
+    def _cache_file(self, translation_file: Path) -> Path:
+        # 每种语言一个缓存文件；单文件打包每次启动解压到新目录，因此不能按路径区分
+        return self._cache_dir / f"{translation_file.stem}.marshal"
+
+    def _load_compiled(self, translation_file: Path) -> Tuple[Dict[str, str], Dict[str, Tuple[str, ...]]]:
+        """读取编译好的翻译表；缓存与 JSON 的大小和内容哈希一致时跳过 JSON 解析"""
+        data = translation_file.read_bytes()
+        if self._cache_dir is None:
+            return _compile(json.loads(data.decode('utf-8')))
+
+        stamp = (CACHE_VERSION, len(data), hashlib.blake2b(data, digest_size=16).digest())
+        cache_file = self._cache_file(translation_file)
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_stamp, table, fields = marshal.load(f)
+            if cached_stamp == stamp:
+                return table, fields
+        except (OSError, EOFError, ValueError, TypeError):
+            pass  # 缓存不存在或已损坏，重新解析
+
+        table, fields = _compile(json.loads(data.decode('utf-8')))
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                marshal.dump((stamp, table, fields), f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # 缓存只是加速，写入失败不影响使用
+        return table, fields
+
+    def _activate(self, language_code: str):
+        self._current_language = language_code
+        self._table = self._translations[language_code]
+        self._current_templates = self._templates[language_code]
+
     def set_language(self, language_code: str) -> bool:
         """设置当前语言"""
         if language_code in self.get_available_languages():
+            # 已加载过的语言直接切换，不再读取文件
+            if language_code in self._translations:
+                self._activate(language_code)
+                return True
             return self.load_translations(language_code)
         return False
 
@@ -107,32 +222,34 @@ class Translator:
         :param kwargs: 格式化参数，用于字符串格式化
         :return: 翻译后的文本，如果找不到则返回键名
         """
-        if not self._current_language or self._current_language not in self._translations:
+        text = self._table.get(key)
+        if text is None:
+            # 如果找不到翻译，返回键名
+            if self._current_language:
+                self._misses[key] += 1
             return key
 
-        # 解析层级键
-        keys = key.split('.')
-        current_dict = self._translations[self._current_language]
-
-        try:
-            for k in keys:
-                current_dict = current_dict[k]
-
-            text = current_dict
-
-            # 如果提供了格式化参数，则进行格式化
-            if kwargs:
+        # 如果提供了格式化参数，则进行格式化
+        if kwargs:
+            template = self._current_templates.get(key)
+            # 缺少参数时返回原始文本
+            if template is not None and template[1] <= kwargs.keys():
                 try:
-                    text = text.format(**kwargs)
-                except (KeyError, ValueError):
+                    return template[0](**kwargs)
+                except (KeyError, ValueError, AttributeError, IndexError):
                     # 格式化失败时返回原始文本
                     pass
+        return text
 
-            return text
+    def get_misses(self) -> Dict[str, int]:
+        """获取找不到翻译的键及其查找次数"""
+        return dict(self._misses)
 
-        except (KeyError, TypeError):
-            # 如果找不到翻译，返回键名
-            return key
+    def misses_report(self) -> str:
+        """生成找不到翻译的键的报告，按查找次数降序排列"""
+        lines = [f"Missing translations ({self._current_language}): {len(self._misses)} keys"]
+        lines.extend(f"{count:>8}  {key}" for key, count in self._misses.most_common())
+        return "\n".join(lines)
 
     def get_language_name(self, language_code: str) -> str:
         """获取语言的本地化名称"""
@@ -144,7 +261,23 @@ class Translator:
 
 
 # 全局翻译器实例
-_translator = Translator()
+_translator = Translator(cache_dir=CACHE_DIR)
+
+
+def _report_misses():
+    """把找不到翻译的键输出到 stderr 和临时目录下的文件"""
+    if not _translator.get_misses():
+        return
+    text = _translator.misses_report()
+    # 打包后的程序没有控制台，始终在磁盘上保留一份
+    with open(os.path.join(tempfile.gettempdir(), MISSES_FILE_NAME), "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    if sys.stderr:
+        print(text, file=sys.stderr)
+
+
+if REPORT_MISSES:
+    atexit.register(_report_misses)
 
 
 def init_translator(language_code: Optional[str] = None) -> bool:
@@ -2,21 +2,9 @@
 import sys
 import ctypes
 import os
-import time
-import shutil
-import subprocess
-import tempfile # Added this import
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QPalette
-
-from godforsaken_save_manager.ui.main_window import MainWindow
-from godforsaken_save_manager.core import config_manager
-from godforsaken_save_manager.common.paths import get_base_path
-from godforsaken_save_manager.common.constants import APP_VERSION
-
-import psutil
-import logging
-import traceback
+
+from godforsaken_save_manager.common import startup_profiler
+from godforsaken_save_manager.common.startup_profiler import phase
 
 def handle_update():
     """
@@ -25,6 +13,15 @@ def handle_update():
     It waits for the parent process to exit, then replaces the old executable.
     """
     if os.environ.get("GFSM_DO_UPDATE") == "1":
+        # Only the update path needs these, keep them off the normal startup path
+        import time
+        import shutil
+        import subprocess
+        import tempfile
+        import logging
+        import traceback
+        import psutil
+
         # --- Updater Logging Setup ---
         # Switch back to file-based logging, as console may not be visible.
         log_file = os.path.join(tempfile.gettempdir(), "updater_log.txt")
@@ -118,15 +115,27 @@ def main():
     # First thing: handle the update process if applicable
     handle_update()
 
+    with phase("import core"):
+        from godforsaken_save_manager.core import config_manager
+        from godforsaken_save_manager.common.paths import get_base_path
+        from godforsaken_save_manager.common.constants import APP_VERSION
+
     # Set AppUserModelID to ensure the taskbar icon is correct, especially in dev.
     # This should be a unique string for the application.
     my_app_id = f'dev.jason.godforsaken-save-manager.{APP_VERSION}'
     ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(my_app_id)
 
-    # Ensure config file is created on first run
-    config_manager.ensure_config_file_exists()
+    with phase("config"):
+        # Ensure config file is created on first run
+        config_manager.ensure_config_file_exists()
 
-    app = QApplication(sys.argv)
+    with phase("import Qt"):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtGui import QPalette
+        from PySide6.QtWidgets import QApplication
+
+    with phase("QApplication"):
+        app = QApplication(sys.argv)
 
     def load_stylesheet():
         """Loads the appropriate stylesheet based on the system theme."""
@@ -142,12 +151,20 @@ def main():
                 stylesheet = f.read()
             app.setStyleSheet(stylesheet)
 
-    # Load initial stylesheet and connect to theme changes
-    load_stylesheet()
-    app.paletteChanged.connect(load_stylesheet)
+    with phase("stylesheet"):
+        # Load initial stylesheet and connect to theme changes
+        load_stylesheet()
+        app.paletteChanged.connect(load_stylesheet)
+
+    with phase("import main window"):
+        from godforsaken_save_manager.ui.main_window import MainWindow
 
-    window = MainWindow()
-    window.show()
+    with phase("MainWindow()"):
+        window = MainWindow()
+    with phase("show"):
+        window.show()
+    # Report once the event loop has painted the first frame
+    QTimer.singleShot(0, startup_profiler.report)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
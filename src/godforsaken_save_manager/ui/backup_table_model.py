@@ -0,0 +1,215 @@
+from typing import List
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, Signal
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QPushButton, QApplication
+
+from ..core.backup_entry import BackupEntry
+from ..i18n.translator import t
+
+
+class BackupTableModel(QAbstractTableModel):
+    """
+    Table model over a list of backups (newest first).
+    Rows are updated incrementally, so a refresh only touches the rows that changed.
+    """
+    COLUMN_TIME = 0
+    COLUMN_NOTE = 1
+    COLUMN_RESTORE = 2
+    COLUMN_DELETE = 3
+    COLUMN_COUNT = 4
+
+    note_edited = Signal(str, str)  # timestamp, new note
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._backups: List[BackupEntry] = []
+        self._merge_row = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._backups)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.COLUMN_COUNT
+
+    def backup_at(self, row: int) -> BackupEntry:
+        return self._backups[row]
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        backup = self._backups[index.row()]
+        column = index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == self.COLUMN_TIME:
+                return backup.timestamp
+            if column == self.COLUMN_NOTE:
+                return backup.note
+            if column == self.COLUMN_RESTORE:
+                return t('ui.main_window.table_headers.restore')
+            if column == self.COLUMN_DELETE:
+                return t('ui.main_window.table_headers.delete')
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return super().headerData(section, orientation, role)
+        return [
+            t('ui.main_window.table_headers.time'),
+            t('ui.main_window.table_headers.note'),
+            t('ui.main_window.table_headers.restore'),
+            t('ui.main_window.table_headers.delete')
+        ][section]
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.COLUMN_NOTE:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or index.column() != self.COLUMN_NOTE or role != Qt.ItemDataRole.EditRole:
+            return False
+        backup = self._backups[index.row()]
+        if backup.note == value:
+            return False
+        backup.note = value
+        self.dataChanged.emit(index, index, [role])
+        self.note_edited.emit(backup.timestamp, value)
+        return True
+
+    def set_backups(self, backups: List[BackupEntry]):
+        """
+        Replaces the rows with `backups` (newest first).
+        Emits row removals, insertions and data changes instead of a model reset.
+        """
+        self.begin_merge()
+        self.merge_batch(backups)
+        self.end_merge()
+
+    def begin_merge(self):
+        """Starts merging a fresh listing that arrives in batches, newest first."""
+        self._merge_row = 0
+
+    def merge_batch(self, backups: List[BackupEntry]):
+        """
+        Merges the next batch of a listing into the rows.
+        Rows newer than an incoming entry that the listing skipped are gone and get removed;
+        rows older than the merged part are left alone until their batch arrives.
+        """
+        for backup in backups:
+            row = self._merge_row
+            while (row < len(self._backups)
+                   and self._backups[row].timestamp != backup.timestamp
+                   and self._backups[row].profile_mtime >= backup.profile_mtime):
+                self.remove_row(row)
+            if row < len(self._backups) and self._backups[row].timestamp == backup.timestamp:
+                if self._backups[row] != backup:
+                    self._backups[row] = backup
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, self.COLUMN_COUNT - 1))
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._backups.insert(row, backup)
+                self.endInsertRows()
+            self._merge_row += 1
+
+    def end_merge(self):
+        """Finishes a merge; rows older than the last merged entry are no longer on disk."""
+        if self._merge_row < len(self._backups):
+            self.beginRemoveRows(QModelIndex(), self._merge_row, len(self._backups) - 1)
+            del self._backups[self._merge_row:]
+            self.endRemoveRows()
+
+    def add_backup(self, backup: BackupEntry):
+        """Inserts (or updates) a single backup at its sorted position."""
+        for row, existing in enumerate(self._backups):
+            if existing.timestamp == backup.timestamp:
+                self._backups[row] = backup
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.COLUMN_COUNT - 1))
+                return
+            if existing.profile_mtime < backup.profile_mtime:
+                break
+        else:
+            row = len(self._backups)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._backups.insert(row, backup)
+        self.endInsertRows()
+
+    def remove_backup(self, timestamp: str) -> bool:
+        """Removes the row of a backup. Returns False if it is not listed."""
+        for row, existing in enumerate(self._backups):
+            if existing.timestamp == timestamp:
+                self.remove_row(row)
+                return True
+        return False
+
+    def truncate(self, max_rows: int):
+        """Drops the rows beyond `max_rows`, like pruning the oldest backups does on disk."""
+        if len(self._backups) > max_rows:
+            self.beginRemoveRows(QModelIndex(), max_rows, len(self._backups) - 1)
+            del self._backups[max_rows:]
+            self.endRemoveRows()
+
+    def remove_row(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._backups[row]
+        self.endRemoveRows()
+
+    def retranslate(self):
+        """Refreshes the translated header and action texts."""
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.COLUMN_COUNT - 1)
+        if self._backups:
+            self.dataChanged.emit(
+                self.index(0, self.COLUMN_RESTORE),
+                self.index(len(self._backups) - 1, self.COLUMN_DELETE)
+            )
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a cell as a push button and reports clicks, instead of creating
+    a QPushButton widget per row.
+    """
+    clicked = Signal(QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Never shown: only used so style sheets for QPushButton#table_button apply when painting
+        self._template = QPushButton(parent)
+        self._template.setObjectName("table_button")
+        self._template.hide()
+        self._pressed_index = None
+
+    def _button_option(self, option, index: QModelIndex) -> QStyleOptionButton:
+        button_option = QStyleOptionButton()
+        button_option.initFrom(self._template)
+        button_option.rect = option.rect.adjusted(2, 2, -2, -2)
+        button_option.text = index.data()
+        button_option.state = QStyle.StateFlag.State_Raised
+        if option.state & QStyle.StateFlag.State_Enabled:
+            button_option.state |= QStyle.StateFlag.State_Enabled
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            button_option.state |= QStyle.StateFlag.State_MouseOver
+        if self._pressed_index == index:
+            button_option.state |= QStyle.StateFlag.State_Sunken
+        return button_option
+
+    def paint(self, painter, option, index: QModelIndex):
+        style = self._template.style() or QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, self._button_option(option, index),
+                          painter, self._template)
+
+    def sizeHint(self, option, index: QModelIndex):
+        self._template.setText(index.data() or "")
+        return self._template.sizeHint()
+
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            self._pressed_index = index
+            return True
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            was_pressed = self._pressed_index == index
+            self._pressed_index = None
+            if was_pressed and option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,178 @@
+import logging
+from pathlib import Path
+from typing import List
+
+from PySide6.QtCore import Qt, QThread, Signal, Slot
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+
+from ..core.backup_entry import BackupEntry
+from ..core.backup_manager import BackupManager
+from ..core.snapshot_diff import ADDED, REMOVED, SnapshotDiff
+from ..i18n.translator import t
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLORS = {ADDED: QColor("#4caf50"), REMOVED: QColor("#e57373")}
+
+
+def _format_size(size: int, signed: bool = False) -> str:
+    text = f"{abs(size) / 1024:,.1f} KB" if abs(size) >= 1024 else f"{abs(size)} B"
+    if signed and size:
+        return ("+" if size > 0 else "-") + text
+    return text
+
+
+class DiffWorker(QThread):
+    """
+    Worker thread to compare two backups, or a backup and the current save.
+    """
+    finished = Signal(object, str)  # Emits the SnapshotDiff and an error message (empty on success)
+
+    def __init__(self, backup_manager: BackupManager, a: Path, b: Path | None):
+        super().__init__()
+        self.backup_manager = backup_manager
+        self.a = a
+        self.b = b
+
+    def run(self):
+        try:
+            diff = self.backup_manager.diff(self.a, self.b, cancel_check=self.isInterruptionRequested)
+            self.finished.emit(diff, "")
+        except Exception as e:
+            logger.error(f"Diff failed in worker thread: {e}")
+            self.finished.emit(None, str(e) or type(e).__name__)
+
+
+class DiffWindow(QDialog):
+    """Lists the files that differ between two backups, or a backup and the current save."""
+    COLUMN_STATUS = 0
+    COLUMN_PATH = 1
+    COLUMN_OLD_SIZE = 2
+    COLUMN_NEW_SIZE = 3
+    COLUMN_DELTA = 4
+
+    def __init__(self, backups: List[BackupEntry], selected: BackupEntry | None = None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(t('ui.diff_window.title'))
+        self.setMinimumSize(760, 480)
+        # The worker thread gets its own manager instance, apart from the main window's operations
+        self.backup_manager = BackupManager()
+        self.backups = sorted(backups, key=lambda b: b.profile_mtime, reverse=True)
+        self.worker: DiffWorker | None = None
+
+        self.from_combo = QComboBox()
+        self.to_combo = QComboBox()
+        self.to_combo.addItem(t('ui.diff_window.live_save'), None)
+        for backup in self.backups:
+            label = f"{backup.timestamp}  {backup.note}".rstrip()
+            if backup.auto:
+                label = f"{t('ui.diff_window.auto_prefix')} {label}"
+            self.from_combo.addItem(label, backup.path)
+            self.to_combo.addItem(label, backup.path)
+        if selected is not None:
+            self.from_combo.setCurrentIndex(max(0, self.from_combo.findData(selected.path)))
+
+        self.compare_button = QPushButton(t('ui.diff_window.compare_button'))
+        self.compare_button.setDefault(True)
+        self.close_button = QPushButton(t('ui.diff_window.close_button'))
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels([
+            t('ui.diff_window.column_status'), t('ui.diff_window.column_path'),
+            t('ui.diff_window.column_old_size'), t('ui.diff_window.column_new_size'),
+            t('ui.diff_window.column_delta'),
+        ])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        for column in (self.COLUMN_STATUS, self.COLUMN_OLD_SIZE, self.COLUMN_NEW_SIZE, self.COLUMN_DELTA):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(self.COLUMN_PATH, QHeaderView.ResizeMode.Stretch)
+
+        selector_layout = QHBoxLayout()
+        selector_layout.addWidget(QLabel(t('ui.diff_window.from_label')))
+        selector_layout.addWidget(self.from_combo, 1)
+        selector_layout.addWidget(QLabel(t('ui.diff_window.to_label')))
+        selector_layout.addWidget(self.to_combo, 1)
+        selector_layout.addWidget(self.compare_button)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(selector_layout)
+        layout.addWidget(self.table)
+        layout.addWidget(self.summary_label)
+        layout.addLayout(button_layout)
+
+        self.compare_button.clicked.connect(self.compare)
+        self.close_button.clicked.connect(self.reject)
+
+        if self.backups:
+            self.compare()
+
+    @Slot()
+    def compare(self):
+        if self.worker is not None or self.from_combo.currentIndex() < 0:
+            return
+        self.compare_button.setEnabled(False)
+        self.summary_label.setText(t('ui.diff_window.comparing'))
+        self.worker = DiffWorker(self.backup_manager, self.from_combo.currentData(), self.to_combo.currentData())
+        self.worker.finished.connect(self._on_diff_finished)
+        self.worker.start()
+
+    @Slot(object, str)
+    def _on_diff_finished(self, diff: SnapshotDiff | None, error: str):
+        if self.worker is None:
+            return  # The dialog was closed while comparing
+        self.worker.wait()
+        self.worker = None
+        self.compare_button.setEnabled(True)
+        self.table.setRowCount(0)
+        if error:
+            self.summary_label.setText(t('ui.diff_window.failed', error=error))
+            return
+        self._show_diff(diff)
+
+    def _show_diff(self, diff: SnapshotDiff):
+        self.table.setRowCount(len(diff.changes))
+        for row, change in enumerate(diff.changes):
+            cells = [
+                t(f'ui.diff_window.status_{change.status}'),
+                change.path,
+                _format_size(change.old_size) if change.status != ADDED else "",
+                _format_size(change.new_size) if change.status != REMOVED else "",
+                _format_size(change.size_delta, signed=True),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column >= self.COLUMN_OLD_SIZE:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if change.status in STATUS_COLORS:
+                    item.setForeground(STATUS_COLORS[change.status])
+                self.table.setItem(row, column, item)
+
+        if diff.identical:
+            self.summary_label.setText(t('ui.diff_window.identical', unchanged=diff.unchanged_count))
+        else:
+            self.summary_label.setText(t(
+                'ui.diff_window.summary',
+                added=len(diff.added), removed=len(diff.removed), changed=len(diff.changed),
+                unchanged=diff.unchanged_count, delta=_format_size(diff.size_delta, signed=True)
+            ))
+
+    def done(self, result: int):
+        # Esc, the close button and the window frame all end the dialog here
+        if self.worker is not None:
+            self.worker.requestInterruption()
+            self.worker.wait()
+            self.worker = None
+        super().done(result)
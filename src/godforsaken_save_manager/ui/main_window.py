@@ -1,6 +1,9 @@
 
 import os
 import subprocess
+import threading
+from typing import TYPE_CHECKING
+from dataclasses import replace
 from pathlib import Path
 import logging
 
@@ -9,18 +12,23 @@ import ctypes
 from PySide6.QtCore import Qt, Slot, QTimer, QThread, Signal
 from PySide6.QtGui import QColor, QIcon
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-    QTableWidgetItem, QHeaderView, QMessageBox, QInputDialog, QLabel, QLineEdit,
-    QGroupBox, QTabWidget, QFrame, QApplication, QProgressDialog
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+    QHeaderView, QMessageBox, QInputDialog, QLabel, QLineEdit,
+    QGroupBox, QTabWidget, QFrame, QApplication, QProgressDialog, QProgressBar
 )
 
-from ..core import backup_manager, process_checker, config_manager
-from ..core.updater import Updater
-from .settings_window import SettingsWindow
+from ..core import backup_manager, config_manager
+from ..core.file_operations import CopyProgress, OperationCancelled
+from ..core.save_watcher import SaveWatcher
+from .backup_table_model import BackupTableModel, ActionButtonDelegate
 from ..common.paths import get_base_path
-from ..common.constants import APP_VERSION
+from ..common.constants import APP_VERSION, UPDATE_CACHE_FILE_NAME
+from ..common.startup_profiler import phase
 from ..i18n.translator import t, get_translator, init_translator
 
+if TYPE_CHECKING:
+    from ..core.updater import Updater
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +40,7 @@ class UpdateWorker(QThread):
     no_update = Signal()
     error = Signal(str)
 
-    def __init__(self, updater: Updater):
+    def __init__(self, updater: "Updater"):
         super().__init__()
         self.updater = updater
 
@@ -57,14 +65,15 @@ class DownloadWorker(QThread):
     progress = Signal(int)
     finished = Signal(str) # Emits path on success, empty string on failure
 
-    def __init__(self, updater: Updater):
+    def __init__(self, updater: "Updater"):
         super().__init__()
         self.updater = updater
 
     def run(self):
         try:
             new_exe_path = self.updater.download_and_verify(
-                progress_callback=self.progress.emit
+                progress_callback=self.progress.emit,
+                cancel_check=QThread.currentThread().isInterruptionRequested
             )
             self.finished.emit(new_exe_path or "")
         except Exception as e:
@@ -72,7 +81,74 @@ class DownloadWorker(QThread):
             self.finished.emit("")
 
 
+class OperationWorker(QThread):
+    """
+    Worker thread to run a BackupManager operation in the background.
+    """
+    progress = Signal(object)  # CopyProgress
+    finished = Signal(object, str)  # Emits the result and an error message (empty on success)
+    cancelled = Signal()
+
+    def __init__(self, operation, *args, **kwargs):
+        super().__init__()
+        self.operation = operation
+        self.args = args
+        self.kwargs = kwargs
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _emit_progress(self, progress: CopyProgress):
+        # The core reuses one progress object, so hand a copy to the GUI thread
+        self.progress.emit(replace(progress))
+
+    def run(self):
+        try:
+            result = self.operation(
+                *self.args,
+                progress_callback=self._emit_progress,
+                cancel_check=self._cancel_event.is_set,
+                **self.kwargs
+            )
+            self.finished.emit(result, "")
+        except OperationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Operation failed in worker thread: {e}")
+            self.finished.emit(None, str(e) or type(e).__name__)
+
+
+class BackupListWorker(QThread):
+    """
+    Worker thread to list the backups and hand them to the GUI in batches.
+    """
+    BATCH_SIZE = 200
+
+    batch = Signal(list)  # A slice of the listing, newest first
+    finished = Signal(str)  # Emits an error message (empty on success)
+
+    def __init__(self, manager: "backup_manager.BackupManager"):
+        super().__init__()
+        self.manager = manager
+
+    def run(self):
+        try:
+            self.manager._reload_config()
+            backups = self.manager.list_backups()
+            for start in range(0, len(backups), self.BATCH_SIZE):
+                if self.isInterruptionRequested():
+                    break
+                self.batch.emit(backups[start:start + self.BATCH_SIZE])
+            self.finished.emit("")
+        except Exception as e:
+            logger.error(f"Listing backups failed in worker thread: {e}")
+            self.finished.emit(str(e) or type(e).__name__)
+
+
 class MainWindow(QMainWindow):
+    watcher_backup_created = Signal(str)  # Emitted from the save watcher thread
+
     def __init__(self):
         super().__init__()
 
@@ -82,11 +158,18 @@ class MainWindow(QMainWindow):
         init_translator(language)
 
         self.translator = get_translator()
-        self.updater = Updater()
+        self.updater = None  # Created on first use; importing it pulls in requests
         self.update_thread = None
         self.download_thread = None
-        self._init_ui()
-        self.check_for_updates()
+        self.operation_worker = None
+        self.save_watcher = None
+        self.list_worker = None
+        self.list_backup_manager = None  # Used only by the list worker thread
+        self._refresh_pending = False
+        with phase("MainWindow._init_ui"):
+            self._init_ui()
+        # Check after the window is shown so the network stack never delays startup
+        QTimer.singleShot(0, self.check_for_updates)
 
     def _init_ui(self):
         self.setWindowTitle(t('ui.main_window.title', version=APP_VERSION))
@@ -100,6 +183,12 @@ class MainWindow(QMainWindow):
 
         self.backup_manager = backup_manager.BackupManager()
 
+        # Refresh requests made in the same event loop pass are served by a single listing
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(0)
+        self.refresh_timer.timeout.connect(self._start_refresh)
+
         # Main widget and layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -115,9 +204,13 @@ class MainWindow(QMainWindow):
         self.backup_button.setDefault(True)
         self.restore_last_button = QPushButton(t('ui.main_window.restore_last_button'))
         self.settings_button = QPushButton(t('ui.main_window.settings_button'))
+        self.verify_button = QPushButton(t('ui.main_window.verify_button'))
+        self.compare_button = QPushButton(t('ui.main_window.compare_button'))
         self.top_buttons_layout.addWidget(self.backup_button)
         self.top_buttons_layout.addWidget(self.restore_last_button)
         self.top_buttons_layout.addStretch()
+        self.top_buttons_layout.addWidget(self.compare_button)
+        self.top_buttons_layout.addWidget(self.verify_button)
         self.top_buttons_layout.addWidget(self.settings_button)
         self.top_layout.addLayout(self.top_buttons_layout)
         self.top_layout.addWidget(self.note_input)
@@ -150,6 +243,15 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel(t('ui.main_window.status_ready'))
         self.status_label.setObjectName("status_label")
         self.statusBar().addWidget(self.status_label)
+        self.operation_progress = QProgressBar()
+        self.operation_progress.setMaximumWidth(200)
+        self.operation_progress.setVisible(False)
+        self.statusBar().addPermanentWidget(self.operation_progress)
+        self.cancel_operation_button = QPushButton(t('ui.main_window.cancel_operation_button'))
+        self.cancel_operation_button.setObjectName("table_button")
+        self.cancel_operation_button.setVisible(False)
+        self.cancel_operation_button.clicked.connect(self._cancel_operation)
+        self.statusBar().addPermanentWidget(self.cancel_operation_button)
 
         # Assemble layout
         self.main_layout.addLayout(self.top_layout)
@@ -160,12 +262,61 @@ class MainWindow(QMainWindow):
         self.backup_button.clicked.connect(self.manual_backup)
         self.restore_last_button.clicked.connect(self.restore_last_backup)
         self.settings_button.clicked.connect(self.open_settings)
-        self.manual_history_table.itemChanged.connect(self.save_note_from_item)
-        self.auto_history_table.itemChanged.connect(self.save_note_from_item)
+        self.verify_button.clicked.connect(self.verify_backups)
+        self.compare_button.clicked.connect(self.open_diff)
+        self.watcher_backup_created.connect(self._on_watcher_backup_created)
 
         self.refresh_backup_list()
+        self._apply_watcher_settings()
+
+    def _apply_watcher_settings(self):
+        """Starts, restarts or stops the save folder watcher according to the config."""
+        self._stop_save_watcher()
+        config = config_manager.load_config()
+        if not config.get("watch_save_folder", False):
+            return
+        # The watcher snapshots from its own thread, so it gets its own manager instance
+        self.watcher_backup_manager = backup_manager.BackupManager()
+        self.save_watcher = SaveWatcher(
+            Path(config["game_save_path"]),
+            self._on_save_settled,
+            settle_seconds=config.get("watch_settle_seconds", 3)
+        )
+        self.save_watcher.start()
+
+    def _stop_save_watcher(self):
+        if self.save_watcher:
+            self.save_watcher.stop(timeout=5)
+            self.save_watcher = None
+
+    def _on_save_settled(self) -> bool:
+        """Runs on the watcher thread after the save folder stopped changing."""
+        lock = self.watcher_backup_manager.operation_lock()
+        if not lock.acquire(blocking=False):
+            # Another backup/restore/delete is using the backup root; let the watcher retry later
+            return False
+        try:
+            timestamp = self.watcher_backup_manager.backup_if_changed()
+        finally:
+            lock.release()
+        if timestamp:
+            self.watcher_backup_created.emit(timestamp)
+        return True
+
+    @Slot(str)
+    def _on_watcher_backup_created(self, timestamp: str):
+        self._add_backup_row(timestamp, auto=True)
+        self.status_label.setText(t('ui.main_window.status_watcher_backup', timestamp=timestamp))
 
     def check_for_updates(self):
+        if self.updater is None:
+            from ..core.updater import Updater
+            config = self.backup_manager.config
+            self.updater = Updater(
+                download_workers=config.get("update_download_workers", 4),
+                check_interval=config.get("update_check_interval_minutes", 360) * 60,
+                cache_path=str(Path(config["backup_root_path"]) / UPDATE_CACHE_FILE_NAME),
+            )
         self.status_label.setText(t('ui.main_window.status_checking_update'))
         self.update_thread = QThread()
         self.update_worker = UpdateWorker(self.updater)
@@ -278,85 +429,188 @@ class MainWindow(QMainWindow):
         # Hide the message after a few seconds
         QTimer.singleShot(5000, lambda: self.status_label.setText(t('ui.main_window.status_ready')))
 
-    def _create_history_table(self) -> QTableWidget:
-        table = QTableWidget()
+    def _create_history_table(self) -> QTableView:
+        table = QTableView()
         table.setFrameShape(QFrame.Shape.NoFrame)
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels([
-            t('ui.main_window.table_headers.time'),
-            t('ui.main_window.table_headers.note'),
-            t('ui.main_window.table_headers.restore'),
-            t('ui.main_window.table_headers.delete')
-        ])
+        model = BackupTableModel(table)
+        model.note_edited.connect(self.save_note)
+        table.setModel(model)
+
+        # One delegate paints the action buttons of every row
+        action_delegate = ActionButtonDelegate(table)
+        action_delegate.clicked.connect(lambda index: self._on_action_clicked(model, index))
+        table.setItemDelegateForColumn(BackupTableModel.COLUMN_RESTORE, action_delegate)
+        table.setItemDelegateForColumn(BackupTableModel.COLUMN_DELETE, action_delegate)
+
         table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        table.setMouseTracking(True)  # Hover highlight for the painted buttons
         return table
 
+    def _on_action_clicked(self, model: BackupTableModel, index):
+        backup_path = model.backup_at(index.row()).path
+        if index.column() == BackupTableModel.COLUMN_RESTORE:
+            self.restore_backup(backup_path)
+        elif index.column() == BackupTableModel.COLUMN_DELETE:
+            self.delete_backup(backup_path)
+
+    @Slot()
     def refresh_backup_list(self):
+        """Schedules an asynchronous reload of both history tables."""
+        self.refresh_timer.start()
+
+    def _start_refresh(self):
+        if self.list_worker is not None:
+            # Restart once the running listing stops; its remaining batches are stale
+            self._refresh_pending = True
+            self.list_worker.requestInterruption()
+            return
+        self._refresh_pending = False
+        if self.list_backup_manager is None:
+            self.list_backup_manager = backup_manager.BackupManager()
         self.status_label.setText(t('ui.main_window.status_refreshing'))
-        self.backup_manager._reload_config() # Ensure config is fresh
+        self.manual_history_table.model().begin_merge()
+        self.auto_history_table.model().begin_merge()
+        self.list_worker = BackupListWorker(self.list_backup_manager)
+        self.list_worker.batch.connect(self._on_backup_batch)
+        self.list_worker.finished.connect(self._on_refresh_finished)
+        self.list_worker.finished.connect(self._on_list_worker_done)
+        self.list_worker.start()
+
+    @Slot(list)
+    def _on_backup_batch(self, backups: list):
+        if self._refresh_pending:
+            return
+        self.manual_history_table.model().merge_batch([b for b in backups if not b.auto])
+        self.auto_history_table.model().merge_batch([b for b in backups if b.auto])
 
-        all_backups = self.backup_manager.list_backups()
+    @Slot(str)
+    def _on_refresh_finished(self, error: str):
+        if self._refresh_pending:
+            return  # Superseded by the next listing
+        if error:
+            self.status_label.setText(t('ui.dialogs.error') + f": {error}")
+            return
+        self.manual_history_table.model().end_merge()
+        self.auto_history_table.model().end_merge()
+        self.status_label.setText(t('ui.main_window.status_ready'))
 
-        # I am assuming backup_entry has an 'auto' attribute.
-        # This is a reasonable assumption given the `backup` method signature.
-        manual_backups = [b for b in all_backups if not b.auto]
-        auto_backups = [b for b in all_backups if b.auto]
+    def _on_list_worker_done(self):
+        self.list_worker.wait()
+        self.list_worker = None
+        if self._refresh_pending:
+            self._start_refresh()
 
-        self._populate_history_table(self.manual_history_table, manual_backups)
-        self._populate_history_table(self.auto_history_table, auto_backups)
+    def _is_refresh_running(self) -> bool:
+        return self.list_worker is not None or self.refresh_timer.isActive()
 
-        self.status_label.setText(t('ui.main_window.status_ready'))
+    def _add_backup_row(self, timestamp: str, auto: bool):
+        """Shows a backup created by this window without listing the whole backup root."""
+        if self._is_refresh_running():
+            self.refresh_backup_list()
+            return
+        self.backup_manager._reload_config()
+        backup = self.backup_manager.get_backup(timestamp, auto)
+        if backup is None:
+            self.refresh_backup_list()
+            return
+        model = (self.auto_history_table if auto else self.manual_history_table).model()
+        model.add_backup(backup)
+        # Creating a backup prunes the oldest ones of its type
+        model.truncate(self.backup_manager.config.get("max_history", 30))
+
+    def _remove_backup_row(self, backup_path: Path):
+        """Drops a backup deleted by this window from its table."""
+        if self._is_refresh_running():
+            self.refresh_backup_list()
+            return
+        model = (self.auto_history_table if backup_path.parent.name == "auto" else self.manual_history_table).model()
+        if not model.remove_backup(backup_path.name):
+            self.refresh_backup_list()
 
-    def _populate_history_table(self, table: QTableWidget, backups: list):
-        table.setRowCount(len(backups))
-        for row, backup_entry in enumerate(backups):
-            timestamp_item = QTableWidgetItem(backup_entry.timestamp)
-            timestamp_item.setFlags(timestamp_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            table.setItem(row, 0, timestamp_item)
+    def _run_operation(self, operation, on_finished, *args, cancellable: bool = False,
+                       on_cancelled=None, **kwargs):
+        """Runs a BackupManager operation on a worker thread while the controls are locked."""
+        self._set_operation_running(True, cancellable)
+        self.operation_worker = OperationWorker(operation, *args, **kwargs)
+        self.operation_worker.progress.connect(self._on_operation_progress)
+        self.operation_worker.finished.connect(on_finished)
+        self.operation_worker.finished.connect(self._on_operation_done)
+        self.operation_worker.cancelled.connect(self._on_operation_cancelled)
+        if on_cancelled is not None:
+            self.operation_worker.cancelled.connect(on_cancelled)
+        self.operation_worker.cancelled.connect(self._on_operation_done)
+        self.operation_worker.start()
+
+    def _set_operation_running(self, running: bool, cancellable: bool = False):
+        for widget in (self.backup_button, self.restore_last_button, self.settings_button, self.verify_button,
+                       self.compare_button, self.manual_history_table, self.auto_history_table):
+            widget.setEnabled(not running)
+        self.operation_progress.setVisible(running)
+        self.operation_progress.setRange(0, 0)  # Busy until the first progress report
+        self.cancel_operation_button.setVisible(running and cancellable)
+        self.cancel_operation_button.setEnabled(True)
+
+    def _is_operation_running(self) -> bool:
+        return self.operation_worker is not None and self.operation_worker.isRunning()
+
+    @Slot(object)
+    def _on_operation_progress(self, progress: CopyProgress):
+        if progress.bytes_total > 0:
+            # Scale to KiB so large saves stay inside the progress bar's int range
+            self.operation_progress.setRange(0, max(progress.bytes_total // 1024, 1))
+            self.operation_progress.setValue(progress.bytes_done // 1024)
+        self.status_label.setText(t(
+            'ui.main_window.status_progress',
+            files_done=progress.files_done, files_total=progress.files_total,
+            mb_done=progress.bytes_done / (1024 * 1024), mb_total=progress.bytes_total / (1024 * 1024)
+        ))
 
-            note_item = QTableWidgetItem(backup_entry.note)
-            table.setItem(row, 1, note_item)
+    @Slot()
+    def _cancel_operation(self):
+        if self._is_operation_running():
+            self.cancel_operation_button.setEnabled(False)
+            self.operation_worker.cancel()
 
-            # Restore button
-            restore_btn = QPushButton(t('ui.main_window.table_headers.restore'))
-            restore_btn.setObjectName("table_button")
-            restore_btn.clicked.connect(lambda _, p=backup_entry.path: self.restore_backup(p))
-            table.setCellWidget(row, 2, restore_btn)
+    @Slot()
+    def _on_operation_cancelled(self):
+        self.show_message_bubble(t('ui.dialogs.operation_cancelled'))
 
-            # Delete button
-            delete_btn = QPushButton(t('ui.main_window.table_headers.delete'))
-            delete_btn.setObjectName("table_button")
-            delete_btn.clicked.connect(lambda _, p=backup_entry.path: self.delete_backup(p))
-            table.setCellWidget(row, 3, delete_btn)
+    def _on_operation_done(self, *args):
+        # The worker's finished signal is emitted from run(); let the thread end before dropping it
+        self.operation_worker.wait()
+        self._set_operation_running(False)
+        self.operation_worker = None
 
     @Slot()
     def manual_backup(self):
-        if self._check_game_running():
+        if self._is_operation_running() or self._check_game_running():
             return
 
         note = self.note_input.text()
-        try:
-            self.status_label.setText(t('ui.main_window.status_backuping'))
-            # The `auto` parameter is explicitly set to False for manual backups.
-            timestamp = self.backup_manager.backup(note=note, auto=False)
-            if timestamp:
-                self.show_message_bubble(t('ui.dialogs.backup_success', timestamp=timestamp))
-                self.note_input.clear()
-                self._maybe_launch_game()
-            else:
-                QMessageBox.warning(self, t('ui.dialogs.warning'), t('ui.dialogs.backup_exists_message'))
-        except Exception as e:
-            QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.backup_failed', error=e))
-        finally:
-            self.refresh_backup_list()
+        self.status_label.setText(t('ui.main_window.status_backuping'))
+        # The `auto` parameter is explicitly set to False for manual backups.
+        self._run_operation(self.backup_manager.backup, self._on_backup_finished,
+                            note=note, auto=False, cancellable=True)
+
+    @Slot(object, str)
+    def _on_backup_finished(self, timestamp, error: str):
+        if error:
+            QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.backup_failed', error=error))
+        elif timestamp:
+            self.show_message_bubble(t('ui.dialogs.backup_success', timestamp=timestamp))
+            self._add_backup_row(timestamp, auto=False)
+            self.note_input.clear()
+            self._maybe_launch_game()
+        else:
+            QMessageBox.warning(self, t('ui.dialogs.warning'), t('ui.dialogs.backup_exists_message'))
 
     @Slot()
     def restore_last_backup(self):
-        if self._check_game_running():
+        if self._is_operation_running() or self._check_game_running():
             return
 
         last_backup_path_str = self.backup_manager.config.get("last_backup")
@@ -373,7 +627,7 @@ class MainWindow(QMainWindow):
 
     @Slot(Path)
     def restore_backup(self, backup_path: Path):
-        if self._check_game_running():
+        if self._is_operation_running() or self._check_game_running():
             return
 
         # Confirmation for old backups
@@ -388,51 +642,79 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.StandardButton.No:
                 return
 
-        try:
-            self.status_label.setText(t('ui.main_window.status_restoring', path=backup_path.name))
-            self.backup_manager.restore(backup_path)
+        self.status_label.setText(t('ui.main_window.status_restoring', path=backup_path.name))
+        self._run_operation(
+            self.backup_manager.restore,
+            lambda _, error: self._on_restore_finished(backup_path, error),
+            # A cancelled restore may already have auto-backed up the replaced save
+            backup_path, cancellable=True, on_cancelled=self.refresh_backup_list
+        )
+
+    def _on_restore_finished(self, backup_path: Path, error: str):
+        # Restoring may have auto-backed up the replaced save first
+        self.refresh_backup_list()
+        if error:
+            QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.restore_failed', error=error))
+        else:
             self.show_message_bubble(t('ui.dialogs.restore_success', backup_name=backup_path.name))
             self._maybe_launch_game()
-        except Exception as e:
-            QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.restore_failed', error=e))
-        finally:
-            self.refresh_backup_list()
 
     @Slot(Path)
     def delete_backup(self, backup_path: Path):
+        if self._is_operation_running():
+            return
         reply = QMessageBox.question(
             self, t('ui.dialogs.confirm_delete'),
             t('ui.dialogs.confirm_delete_message', backup_name=backup_path.name),
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                self.status_label.setText(t('ui.main_window.status_deleting', path=backup_path.name))
-                self.backup_manager.delete(backup_path)
-            except Exception as e:
-                QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.delete_failed', error=e))
-            finally:
-                self.refresh_backup_list()
-
-    @Slot(QTableWidgetItem)
-    def save_note_from_item(self, item):
-        if item.column() == 1: # Note column
-            table = item.tableWidget()
-            if not table:
-                return
-            row = item.row()
-            timestamp_item = table.item(row, 0)
-            if not timestamp_item:
-                return
+            self.status_label.setText(t('ui.main_window.status_deleting', path=backup_path.name))
+            self._run_operation(
+                self._delete_in_worker,
+                lambda _, error: self._on_delete_finished(backup_path, error),
+                backup_path
+            )
+
+    def _delete_in_worker(self, backup_path: Path, progress_callback=None, cancel_check=None):
+        # Removing a directory cannot be interrupted safely, so progress and cancel are ignored
+        self.backup_manager.delete(backup_path)
+
+    def _on_delete_finished(self, backup_path: Path, error: str):
+        if error:
+            self.refresh_backup_list()
+            QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.delete_failed', error=error))
+        else:
+            self._remove_backup_row(backup_path)
 
-            timestamp = timestamp_item.text()
-            new_note = item.text()
+    @Slot()
+    def verify_backups(self):
+        if self._is_operation_running():
+            return
+        self.status_label.setText(t('ui.main_window.status_verifying'))
+        self._run_operation(self.backup_manager.scrub, self._on_verify_finished, cancellable=True)
+
+    @Slot(object, str)
+    def _on_verify_finished(self, damaged, error: str):
+        if error:
+            QMessageBox.critical(self, t('ui.dialogs.error'), t('ui.dialogs.verify_failed', error=error))
+        elif damaged:
+            details = "\n".join(
+                f"{path.parent.name}/{path.name}: {problems[0]}" for path, problems in damaged.items()
+            )
+            QMessageBox.warning(self, t('ui.dialogs.verify_damaged_title'),
+                                t('ui.dialogs.verify_damaged_message', details=details))
+        else:
+            self.show_message_bubble(t('ui.dialogs.verify_ok'))
+        self.status_label.setText(t('ui.main_window.status_ready'))
 
-            config = config_manager.load_config()
-            if config["notes"].get(timestamp) != new_note:
-                config["notes"][timestamp] = new_note
-                config_manager.save_config(config)
-                self.status_label.setText(t('ui.dialogs.note_saved', timestamp=timestamp))
+    @Slot(str, str)
+    def save_note(self, timestamp: str, new_note: str):
+        config = config_manager.load_config()
+        if config["notes"].get(timestamp) != new_note:
+            config["notes"][timestamp] = new_note
+            config_manager.save_config(config)
+            self.status_label.setText(t('ui.dialogs.note_saved', timestamp=timestamp))
 
     def show_message_bubble(self, message: str, duration_ms: int = 5000):
         """Show a message bubble that auto-hides after duration_ms"""
@@ -446,10 +728,29 @@ class MainWindow(QMainWindow):
         self.message_bubble.setVisible(False)
         self.message_bubble_timer.stop()
 
+    @Slot()
+    def open_diff(self):
+        """Opens the diff dialog, starting from the backup selected in the current tab."""
+        if self._is_operation_running():
+            return
+        from .diff_window import DiffWindow
+        backups = []
+        for table in (self.manual_history_table, self.auto_history_table):
+            model = table.model()
+            backups.extend(model.backup_at(row) for row in range(model.rowCount()))
+        table = self.tab_widget.currentWidget()
+        rows = table.selectionModel().selectedRows()
+        selected = table.model().backup_at(rows[0].row()) if rows else None
+        dialog = DiffWindow(backups, selected, self)
+        dialog.exec()
+        dialog.deleteLater()
+
     @Slot()
     def open_settings(self):
+        from .settings_window import SettingsWindow
         settings_dialog = SettingsWindow(self)
         settings_dialog.settings_saved.connect(self.refresh_backup_list)
+        settings_dialog.settings_saved.connect(self._apply_watcher_settings)
         settings_dialog.language_changed.connect(self._on_language_changed)
         settings_dialog.exec()
 
@@ -466,16 +767,12 @@ class MainWindow(QMainWindow):
         self.backup_button.setText(t('ui.main_window.backup_button'))
         self.restore_last_button.setText(t('ui.main_window.restore_last_button'))
         self.settings_button.setText(t('ui.main_window.settings_button'))
+        self.verify_button.setText(t('ui.main_window.verify_button'))
+        self.compare_button.setText(t('ui.main_window.compare_button'))
 
-        # 重新设置表格标题
-        headers = [
-            t('ui.main_window.table_headers.time'),
-            t('ui.main_window.table_headers.note'),
-            t('ui.main_window.table_headers.restore'),
-            t('ui.main_window.table_headers.delete')
-        ]
-        self.manual_history_table.setHorizontalHeaderLabels(headers)
-        self.auto_history_table.setHorizontalHeaderLabels(headers)
+        # 重新设置表格标题和按钮文字
+        self.manual_history_table.model().retranslate()
+        self.auto_history_table.model().retranslate()
 
         # 重新设置标签页标题
         self.tab_widget.setTabText(0, t('ui.main_window.manual_backup_tab'))
@@ -490,9 +787,9 @@ class MainWindow(QMainWindow):
                 break
 
         self.status_label.setText(t('ui.main_window.status_ready'))
-        self.refresh_backup_list()
 
     def _check_game_running(self) -> bool:
+        from ..core import process_checker
         if process_checker.is_game_running():
             QMessageBox.warning(self, t('ui.dialogs.game_running'), t('ui.dialogs.game_running_message'))
             return True
@@ -523,6 +820,14 @@ class MainWindow(QMainWindow):
         """
         self._stop_update_thread()
         self._stop_download_thread()
+        self._stop_save_watcher()
+        if self.list_worker is not None:
+            self.list_worker.requestInterruption()
+            self.list_worker.wait()
+        if self._is_operation_running():
+            # Backup and restore must not be killed halfway; cancel at the next safe point and wait
+            self.operation_worker.cancel()
+            self.operation_worker.wait()
         event.accept()
 
     @staticmethod
@@ -37,6 +37,7 @@ class SettingsWindow(QDialog):
         self.restore_threshold_spinbox = QSpinBox()
         self.restore_threshold_spinbox.setRange(0, 9999)
         self.auto_launch_checkbox = QCheckBox(t('ui.settings_window.auto_launch_label'))
+        self.watch_checkbox = QCheckBox(t('ui.settings_window.watch_save_folder_label'))
 
         # Language selection
         self.language_combo = QComboBox()
@@ -84,6 +85,7 @@ class SettingsWindow(QDialog):
         self.form_layout.addRow(t('ui.settings_window.restore_threshold_label'), self.restore_threshold_spinbox)
         self.form_layout.addRow(t('ui.settings_window.language_label'), self.language_combo)
         self.form_layout.addRow("", self.auto_launch_checkbox)
+        self.form_layout.addRow("", self.watch_checkbox)
 
         # Buttons layout
         buttons_layout = QHBoxLayout()
@@ -98,6 +100,7 @@ class SettingsWindow(QDialog):
         """Retranslates all the UI elements."""
         self.setWindowTitle(t('ui.settings_window.title'))
         self.auto_launch_checkbox.setText(t('ui.settings_window.auto_launch_label'))
+        self.watch_checkbox.setText(t('ui.settings_window.watch_save_folder_label'))
         self.game_save_path_button.setText(t('ui.settings_window.select_button'))
         self.backup_root_path_button.setText(t('ui.settings_window.select_button'))
         self.save_button.setText(t('ui.settings_window.save_button'))
@@ -134,6 +137,7 @@ class SettingsWindow(QDialog):
         self.max_history_spinbox.setValue(self.config.get("max_history", 20))
         self.restore_threshold_spinbox.setValue(self.config.get("restore_confirm_threshold_minutes", 20))
         self.auto_launch_checkbox.setChecked(self.config.get("auto_launch_game", True))
+        self.watch_checkbox.setChecked(self.config.get("watch_save_folder", False))
 
         # 设置语言选择
         current_language = self.config.get("language")
@@ -172,6 +176,7 @@ class SettingsWindow(QDialog):
         self.config["max_history"] = self.max_history_spinbox.value()
         self.config["restore_confirm_threshold_minutes"] = self.restore_threshold_spinbox.value()
         self.config["auto_launch_game"] = self.auto_launch_checkbox.isChecked()
+        self.config["watch_save_folder"] = self.watch_checkbox.isChecked()
 
         # 保存语言设置
         selected_language = self.language_combo.itemData(self.language_combo.currentIndex())
@@ -0,0 +1,38 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from godforsaken_save_manager.core import config_manager
+from godforsaken_save_manager.common.constants import CONFIG_FILE_NAME, PROFILE_BRIEF_FILE_NAME
+
+
+def write_save(game_save: Path, files: dict, profile_mtime: float = 1_700_000_000):
+    """Writes a fake game save. `files` maps relative paths to bytes."""
+    game_save.mkdir(parents=True, exist_ok=True)
+    for rel, content in files.items():
+        path = game_save / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    profile = game_save / PROFILE_BRIEF_FILE_NAME
+    if not profile.exists():
+        profile.write_bytes(b"profile")
+    os.utime(profile, (profile_mtime, profile_mtime))
+
+
+@pytest.fixture
+def save_env(tmp_path, monkeypatch):
+    """Points the config at a temporary backup root and game save directory."""
+    backup_root = tmp_path / "game_save_my_bak"
+    game_save = tmp_path / "game_save"
+    backup_root.mkdir()
+    monkeypatch.setattr(config_manager, "DEFAULT_BACKUP_ROOT_PATH", backup_root)
+    config = {
+        "game_save_path": str(game_save),
+        "backup_root_path": str(backup_root),
+        "language": "en_US",
+    }
+    (backup_root / CONFIG_FILE_NAME).write_text(json.dumps(config), encoding="utf-8")
+    yield game_save, backup_root
+    config_manager.flush_config()
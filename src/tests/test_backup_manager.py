@@ -1 +1,488 @@
-# Tests for BackupManager will go here
+import os
+
+from godforsaken_save_manager.core.backup_manager import BackupManager
+from godforsaken_save_manager.common.constants import OBJECTS_DIR_NAME, PROFILE_BRIEF_FILE_NAME
+
+from .conftest import write_save
+
+
+def _object_count(backup_root):
+    return sum(1 for p in (backup_root / OBJECTS_DIR_NAME).rglob("*") if p.is_file())
+
+
+def test_backup_and_restore_round_trip(save_env):
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"slot zero", "sub/slot_1.sav": b"slot one"})
+    manager = BackupManager()
+
+    timestamp = manager.backup(note="first")
+    backups = manager.list_backups()
+    assert [b.timestamp for b in backups] == [timestamp]
+    assert backups[0].note == "first"
+
+    (game_save / "slot_0.sav").write_bytes(b"changed")
+    (game_save / "sub" / "slot_1.sav").unlink()
+    manager.restore(backups[0].path)
+
+    assert (game_save / "slot_0.sav").read_bytes() == b"slot zero"
+    assert (game_save / "sub" / "slot_1.sav").read_bytes() == b"slot one"
+    assert os.path.getmtime(game_save / PROFILE_BRIEF_FILE_NAME) == 1_700_000_000
+
+
+def test_unchanged_files_are_stored_once(save_env):
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"a" * 1000, "slot_1.sav": b"b" * 1000})
+    manager = BackupManager()
+    manager.backup()
+    objects_after_first = _object_count(backup_root)
+
+    (game_save / "slot_1.sav").write_bytes(b"c" * 1000)
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    manager.backup()
+
+    assert _object_count(backup_root) == objects_after_first + 1
+
+
+def test_delete_removes_unreferenced_objects(save_env):
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"old"})
+    manager = BackupManager()
+    manager.backup()
+    (game_save / "slot_0.sav").write_bytes(b"new")
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    manager.backup()
+
+    oldest = manager.list_backups()[-1]
+    manager.delete(oldest.path)
+
+    assert len(manager.list_backups()) == 1
+    assert _object_count(backup_root) == 2
+
+
+def test_garbage_collection_only_rereads_new_manifests_and_cleans_up_cancelled_backups(save_env, monkeypatch):
+    import pytest
+    from godforsaken_save_manager.core import backup_manager
+    from godforsaken_save_manager.core.file_operations import OperationCancelled
+
+    game_save, backup_root = save_env
+    manager = BackupManager()
+    for i in range(4):
+        write_save(game_save, {"slot_0.sav": b"version %d" % i}, profile_mtime=1_700_000_000 + i * 60)
+        manager.backup()
+
+    loads = []
+    original_load = backup_manager.Manifest.load
+    monkeypatch.setattr(backup_manager.Manifest, "load", lambda path: loads.append(path) or original_load(path))
+    manager.delete(manager.list_backups()[-1].path)
+    assert len(loads) == 4
+    loads.clear()
+    manager.delete(manager.list_backups()[-1].path)
+    assert loads == []
+    assert _object_count(backup_root) == 3
+
+    # Objects written before a cancelled backup stopped are removed again
+    checks = iter([False, False, True])
+    write_save(game_save, {"slot_0.sav": b"unsaved", "slot_1.sav": b"unsaved too"}, profile_mtime=1_700_001_000)
+    with pytest.raises(OperationCancelled):
+        manager.backup(cancel_check=lambda: next(checks))
+    assert _object_count(backup_root) == 3
+
+
+def test_incremental_backup_only_hashes_changed_files(save_env, monkeypatch):
+    from godforsaken_save_manager.core import object_store
+
+    game_save, backup_root = save_env
+    write_save(game_save, {f"slot_{i}.sav": bytes([i]) * 100 for i in range(5)})
+    manager = BackupManager()
+    manager.backup()
+
+    hashed = []
+    original_hash_file = object_store.hash_file
+    monkeypatch.setattr(object_store, "hash_file", lambda p: hashed.append(p.name) or original_hash_file(p))
+    (game_save / "slot_3.sav").write_bytes(b"changed")
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    manager.backup(incremental=True)
+
+    assert sorted(hashed) == [PROFILE_BRIEF_FILE_NAME, "slot_3.sav"]
+
+
+def test_list_backups_uses_index_until_directory_changes(save_env, monkeypatch):
+    import shutil
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"data"})
+    manager = BackupManager()
+    timestamp = manager.backup()
+    assert manager.list_backups()[0].size == len(b"data") + len(b"profile")
+
+    scanned = []
+    original_scan = manager._scan_snapshot
+    monkeypatch.setattr(manager, "_scan_snapshot", lambda e, a: scanned.append(e.name) or original_scan(e, a))
+    manager._index = None  # force reading the persisted index
+    assert [b.timestamp for b in manager.list_backups()] == [timestamp]
+    assert scanned == []
+
+    # A snapshot added behind the manager's back is picked up through the directory mtime
+    shutil.copytree(backup_root / "manual" / timestamp, backup_root / "auto" / "2020-01-01_00-00-00")
+    assert len(manager.list_backups()) == 2
+    assert scanned == ["2020-01-01_00-00-00"]
+
+
+def test_listed_times_survive_copies_that_drop_mtimes(save_env):
+    from godforsaken_save_manager.common.constants import INDEX_FILE_NAME, MANIFEST_FILE_NAME
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"slot zero"})
+    timestamp = BackupManager().backup()
+
+    # A copy or cloud sync of the backup root stamps the files with the time of the copy
+    snapshot = backup_root / "manual" / timestamp
+    os.utime(snapshot / MANIFEST_FILE_NAME, (1_750_000_000, 1_750_000_000))
+    (backup_root / INDEX_FILE_NAME).unlink()
+
+    backup = BackupManager().list_backups()[0]
+    assert backup.profile_mtime.timestamp() == 1_700_000_000
+
+
+def test_listing_from_another_manager_during_a_backup_does_not_hide_it(save_env, monkeypatch):
+    from godforsaken_save_manager.core.manifest import Manifest
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"slot zero"})
+    other = BackupManager()
+    original_save = Manifest.save
+
+    def save_while_listing(manifest, snapshot_dir):
+        # The CLI or the list worker may revalidate the index at any point of a backup
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        assert other.list_backups() == []
+        original_save(manifest, snapshot_dir)
+
+    monkeypatch.setattr(Manifest, "save", save_while_listing)
+    timestamp = BackupManager().backup()
+
+    assert [b.timestamp for b in BackupManager().list_backups()] == [timestamp]
+    assert [b.timestamp for b in other.list_backups()] == [timestamp]
+
+
+def test_get_backup_matches_listing(save_env):
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"data"})
+    manager = BackupManager()
+    timestamp = manager.backup(note="manual")
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    auto_timestamp = manager.backup(auto=True)
+
+    manual = manager.get_backup(timestamp, auto=False)
+    assert manual in manager.list_backups()
+    assert manual.note == "manual"
+    assert manager.get_backup(auto_timestamp, auto=True).auto
+    assert manager.get_backup(auto_timestamp, auto=False) is None
+    assert manager.get_backup("1999-01-01_00-00-00", auto=False) is None
+
+
+def test_prune_deletes_oldest_with_a_single_config_write(save_env, monkeypatch):
+    from godforsaken_save_manager.core import config_manager
+
+    game_save, backup_root = save_env
+    manager = BackupManager()
+    manager.config["max_history"] = 100
+    manager._save_config()
+    for i in range(6):
+        write_save(game_save, {"slot_0.sav": bytes([i])}, profile_mtime=1_700_000_000 + i * 60)
+        manager.backup(note=f"note {i}")
+
+    saves = []
+    original_save = config_manager.save_config
+    monkeypatch.setattr(config_manager, "save_config", lambda c: saves.append(1) or original_save(c))
+    victims = manager.prune(2)
+
+    assert len(victims) == 4
+    assert len(saves) == 1
+    remaining = manager.list_backups()
+    assert [b.note for b in remaining] == ["note 5", "note 4"]
+    assert set(manager.config["notes"]) == {b.timestamp for b in remaining}
+
+
+def test_backup_reports_progress_and_can_be_cancelled(save_env):
+    import pytest
+    from godforsaken_save_manager.core.file_operations import OperationCancelled
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"x" * 10, "slot_1.sav": b"y" * 20})
+    manager = BackupManager()
+
+    with pytest.raises(OperationCancelled):
+        manager.backup(cancel_check=lambda: True)
+    assert manager.list_backups() == []
+
+    reports = []
+    manager.backup(progress_callback=lambda p: reports.append((p.files_done, p.bytes_done)))
+    assert reports[-1] == (3, 30 + len(b"profile"))
+
+
+def test_restore_swaps_in_staged_copy_and_keeps_live_save_on_cancel(save_env):
+    import pytest
+    from godforsaken_save_manager.core.file_operations import OperationCancelled
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"backed up"})
+    manager = BackupManager()
+    manager.backup()
+    target = manager.list_backups()[0].path
+    (game_save / "slot_0.sav").write_bytes(b"live")
+
+    checks = []
+
+    def cancel_after_first_check():
+        # The first check happens before staging starts; cancel while copying into staging
+        checks.append(1)
+        return len(checks) > 1
+
+    with pytest.raises(OperationCancelled):
+        manager.restore(target, cancel_check=cancel_after_first_check)
+    assert (game_save / "slot_0.sav").read_bytes() == b"live"
+    assert [p.name for p in game_save.parent.iterdir() if p.name.startswith("game_save.")] == []
+
+    manager.restore(target)
+    assert (game_save / "slot_0.sav").read_bytes() == b"backed up"
+
+
+def test_archive_snapshots_round_trip(save_env):
+    import zipfile
+    from godforsaken_save_manager.common.constants import ARCHIVE_FILE_NAME, INDEX_FILE_NAME
+    from godforsaken_save_manager.core import snapshot_archive
+    from godforsaken_save_manager.core.manifest import Manifest
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"z" * 50_000, "sub/slot_1.sav": b"one"})
+    manager = BackupManager()
+    manager.config["snapshot_format"] = "archive"
+    manager._save_config()
+
+    timestamp = manager.backup()
+    snapshot = manager.list_backups()[0]
+    archive = snapshot.path / ARCHIVE_FILE_NAME
+    assert snapshot.timestamp == timestamp
+    assert archive.stat().st_size < 50_000
+    assert snapshot_archive.read_manifest(archive).profile_mtime == 1_700_000_000
+    # Listing reads the profile time from the manifest inside the archive
+    sidecar = Manifest.load(snapshot.path)
+    sidecar.profile_mtime = 1_750_000_000
+    sidecar.save(snapshot.path)
+    (backup_root / INDEX_FILE_NAME).unlink()
+    assert BackupManager().list_backups()[0].profile_mtime.timestamp() == 1_700_000_000
+    assert zipfile.ZipFile(archive).testzip() is None
+    assert not (backup_root / OBJECTS_DIR_NAME).exists()
+
+    (game_save / "slot_0.sav").write_bytes(b"changed")
+    manager.restore(snapshot.path)
+    assert (game_save / "slot_0.sav").read_bytes() == b"z" * 50_000
+    assert (game_save / "sub" / "slot_1.sav").read_bytes() == b"one"
+    assert os.path.getmtime(game_save / PROFILE_BRIEF_FILE_NAME) == 1_700_000_000
+
+
+def test_quick_check_compares_archive_member_mtimes(save_env):
+    from godforsaken_save_manager.core.manifest import Manifest
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"slot zero"})
+    os.utime(game_save / "slot_0.sav", (1_600_000_000.5, 1_600_000_000.5))
+    manager = BackupManager()
+    manager.config["snapshot_format"] = "archive"
+    manager._save_config()
+    snapshot = backup_root / "manual" / manager.backup()
+    assert manager.verify(snapshot, quick=True) == []
+
+    manifest = Manifest.load(snapshot)
+    manifest.files["slot_0.sav"].mtime += 10
+    manifest.save(snapshot)
+    assert manager.verify(snapshot, quick=True) == ["slot_0.sav: modified after backup"]
+
+
+def test_verify_detects_corruption_and_restore_refuses_incomplete_snapshot(save_env):
+    import pytest
+    from godforsaken_save_manager.core.integrity import CorruptSnapshotError
+    from godforsaken_save_manager.core.manifest import Manifest
+    from godforsaken_save_manager.core.object_store import ObjectStore
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"intact data", "slot_1.sav": b"shared"})
+    manager = BackupManager()
+    manager.backup()
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    manager.backup()
+    newest, oldest = manager.list_backups()
+    assert manager.verify(newest.path) == [] and manager.scrub() == {}
+
+    # Same size, different content: only a full check notices
+    record = Manifest.load(oldest.path).files["slot_0.sav"]
+    ObjectStore(backup_root).object_path(record.hash).write_bytes(b"bitrot data")
+    assert manager.verify(oldest.path, quick=True) == []
+    assert manager.verify(oldest.path) == ["slot_0.sav: content hash mismatch"]
+    assert set(manager.scrub()) == {newest.path, oldest.path}
+
+    ObjectStore(backup_root).object_path(record.hash).unlink()
+    (game_save / "slot_0.sav").write_bytes(b"live")
+    with pytest.raises(CorruptSnapshotError):
+        manager.restore(oldest.path)
+    assert (game_save / "slot_0.sav").read_bytes() == b"live"
+
+
+def test_link_snapshots_hard_link_unchanged_files(save_env, monkeypatch):
+    from godforsaken_save_manager.core import link_snapshot
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"unchanged", "slot_1.sav": b"first"})
+    manager = BackupManager()
+    manager.config["snapshot_format"] = "link"
+    manager._save_config()
+    manager.backup()
+    (game_save / "slot_1.sav").write_bytes(b"second")
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    manager.backup()
+    newest, oldest = manager.list_backups()
+
+    assert (newest.path / "slot_0.sav").stat().st_ino == (oldest.path / "slot_0.sav").stat().st_ino
+    assert (newest.path / "slot_1.sav").stat().st_ino != (oldest.path / "slot_1.sav").stat().st_ino
+    assert manager.verify(newest.path) == [] and manager.verify(newest.path, quick=True) == []
+
+    # The game rewriting a file in place must not reach the snapshots
+    with open(game_save / "slot_0.sav", 'r+b') as f:
+        f.write(b"rewritten")
+    assert (oldest.path / "slot_0.sav").read_bytes() == b"unchanged"
+
+    manager.restore(oldest.path)
+    assert (game_save / "slot_0.sav").read_bytes() == b"unchanged"
+    assert (game_save / "slot_1.sav").read_bytes() == b"first"
+    assert (game_save / "slot_0.sav").stat().st_nlink == 1
+
+    # Across volumes everything is copied
+    monkeypatch.setattr(link_snapshot, "same_volume", lambda a, b: False)
+    write_save(game_save, {}, profile_mtime=1_700_000_200)
+    manager.backup()
+    latest = manager.list_backups()[0]
+    assert (latest.path / "slot_0.sav").stat().st_nlink == 1
+
+
+def test_delta_compression_stores_small_changes_and_restores_chains(save_env):
+    from godforsaken_save_manager.core.object_store import DELTA_SUFFIX
+
+    game_save, backup_root = save_env
+    data = bytearray(os.urandom(512 * 1024))
+    write_save(game_save, {"world.sav": bytes(data)})
+    manager = BackupManager()
+    manager.config.update(delta_compression=True, delta_chain_length=4)
+    manager._save_config()
+
+    versions = []
+    for i in range(8):
+        data[i * 1000:i * 1000 + 4] = b"%04d" % i
+        write_save(game_save, {"world.sav": bytes(data)}, profile_mtime=1_700_000_000 + i * 100)
+        manager.backup()
+        versions.append(bytes(data))
+
+    objects = [p for p in (backup_root / OBJECTS_DIR_NAME).rglob("*") if p.is_file()]
+    # One full copy per chain of four; everything else is a small delta
+    assert sum(p.stat().st_size for p in objects) < 3 * 512 * 1024
+    assert sum(1 for p in objects if p.name.endswith(DELTA_SUFFIX)) == 6
+    assert manager.scrub() == {}
+
+    # Deleting the oldest snapshot keeps the bases later deltas depend on
+    manager.delete(manager.list_backups()[-1].path)
+    for backup, expected in zip(manager.list_backups(), reversed(versions)):
+        manager.restore(backup.path)
+        assert (game_save / "world.sav").read_bytes() == expected
+
+
+def test_diff_between_snapshots_and_against_the_live_save(save_env, monkeypatch):
+    game_save, backup_root = save_env
+    write_save(game_save, {"keep.sav": b"same", "edit.sav": b"before", "gone.sav": b"old"})
+    manager = BackupManager()
+    manager.backup()
+    (game_save / "edit.sav").write_bytes(b"after!!!")
+    (game_save / "gone.sav").unlink()
+    (game_save / "new.sav").write_bytes(b"fresh")
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    manager.backup()
+    newest, oldest = [b.path for b in manager.list_backups()]
+
+    diff = manager.diff(oldest, newest)
+    assert [(c.path, c.status, c.size_delta) for c in diff.changes] == [
+        ("edit.sav", "changed", 2), ("gone.sav", "removed", -3), ("new.sav", "added", 5),
+    ]
+    # The profile only got a new mtime; its content hash is the same
+    assert diff.unchanged_count == 2 and diff.size_delta == 4
+
+    # Against the live save, files matching the latest snapshot reuse its hashes
+    from godforsaken_save_manager.core import snapshot_diff
+    hashed = []
+    monkeypatch.setattr(snapshot_diff, "hash_file", lambda path: hashed.append(path.name) or "x")
+    assert manager.diff(newest).identical
+    assert hashed == []
+
+    (game_save / "edit.sav").write_bytes(b"after???")
+    os.utime(game_save / "edit.sav", (1_800_000_000, 1_800_000_000))
+    diff = manager.diff(newest)
+    assert [c.path for c in diff.changed] == ["edit.sav"] and hashed == ["edit.sav"]
+
+
+def test_operations_on_one_backup_root_are_serialised(save_env):
+    import threading
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"old"})
+    first = BackupManager()
+    first.backup()
+    (game_save / "slot_0.sav").write_bytes(b"new")
+    write_save(game_save, {}, profile_mtime=1_700_000_100)
+    # A write in progress elsewhere must survive garbage collection
+    in_flight = next((backup_root / OBJECTS_DIR_NAME).iterdir()) / "0123.abcd.tmp"
+    in_flight.write_bytes(b"partial")
+
+    started, resume = threading.Event(), threading.Event()
+
+    def hold(progress):
+        started.set()
+        resume.wait(5)
+
+    backup_thread = threading.Thread(target=first.backup, kwargs={"progress_callback": hold})
+    backup_thread.start()
+    assert started.wait(5)
+
+    # A second manager, as used by the save watcher, cannot take the root while the backup runs
+    second = BackupManager()
+    lock = second.operation_lock()
+    assert not lock.acquire(blocking=False)
+    oldest = second.list_backups()[-1]
+    delete_thread = threading.Thread(target=second.delete, args=(oldest.path,))
+    delete_thread.start()
+    delete_thread.join(0.2)
+    assert delete_thread.is_alive()
+
+    resume.set()
+    backup_thread.join(5)
+    delete_thread.join(5)
+    assert [b.profile_mtime.timestamp() for b in second.list_backups()] == [1_700_000_100]
+    assert in_flight.exists()
+    in_flight.unlink()
+    assert _object_count(backup_root) == 2
+
+    second.restore(second.list_backups()[0].path)
+    assert (game_save / "slot_0.sav").read_bytes() == b"new"
+
+
+def test_restore_keeps_read_only_files(save_env):
+    import stat
+
+    game_save, backup_root = save_env
+    write_save(game_save, {"slot_0.sav": b"locked"})
+    os.chmod(game_save / "slot_0.sav", stat.S_IREAD)
+    manager = BackupManager()
+    manager.backup()
+
+    manager.restore(manager.list_backups()[0].path)
+
+    restored = game_save / "slot_0.sav"
+    assert restored.read_bytes() == b"locked"
+    assert not os.stat(restored).st_mode & stat.S_IWRITE
@@ -0,0 +1,57 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from godforsaken_save_manager import cli
+
+from .conftest import write_save
+
+
+def _run_json(capsys, *argv):
+    code = cli.main(["--json", *argv])
+    return code, json.loads(capsys.readouterr().out)
+
+
+def test_backup_list_verify_prune_as_json(save_env, capsys):
+    game_save, _ = save_env
+    for i in range(3):
+        write_save(game_save, {"slot_0.sav": bytes([i])}, profile_mtime=1_700_000_000 + i * 60)
+        code, result = _run_json(capsys, "backup", "--note", f"n{i}")
+        assert code == 0 and result["created"]
+
+    code, listed = _run_json(capsys, "list")
+    assert [item["note"] for item in listed] == ["n2", "n1", "n0"]
+
+    code, verified = _run_json(capsys, "verify")
+    assert code == 0 and verified["ok"]
+
+    code, pruned = _run_json(capsys, "prune", "--max-history", "1")
+    assert [item["note"] for item in pruned["deleted"]] == ["n1", "n0"]
+
+    code, stats = _run_json(capsys, "stats")
+    assert stats["manual_count"] == 1
+
+
+def test_unknown_backup_is_reported_as_json_error(save_env, capsys):
+    code, result = _run_json(capsys, "restore", "1999-01-01_00-00-00")
+    assert code == 1
+    assert "not found" in result["error"]
+
+
+def test_cli_does_not_import_qt():
+    code = ("import sys, godforsaken_save_manager.cli; "
+            "sys.exit(any(m.startswith(('PySide6', 'godforsaken_save_manager.ui')) for m in sys.modules))")
+    src_dir = Path(cli.__file__).parents[1]
+    assert subprocess.run([sys.executable, "-c", code], cwd=src_dir).returncode == 0
+
+
+def test_diff_against_the_live_save_as_json(save_env, capsys):
+    game_save, _ = save_env
+    write_save(game_save, {"slot_0.sav": b"zero"})
+    _run_json(capsys, "backup")
+    (game_save / "slot_1.sav").write_bytes(b"one")
+
+    code, result = _run_json(capsys, "diff", cli.BackupManager().list_backups()[0].timestamp)
+    assert code == 0 and result["to"] == "live"
+    assert [(c["path"], c["status"]) for c in result["changes"]] == [("slot_1.sav", "added")]
@@ -1 +1,48 @@
-# Tests for ConfigManager will go here
+import json
+import os
+
+from godforsaken_save_manager.core import config_manager
+from godforsaken_save_manager.common.constants import CONFIG_FILE_NAME
+
+
+def test_saves_are_coalesced_into_one_atomic_write(save_env, monkeypatch):
+    _, backup_root = save_env
+    store = config_manager.ConfigStore(debounce_seconds=60)
+    monkeypatch.setattr(config_manager, "_store", store)
+    writes = []
+    original_replace = os.replace
+    monkeypatch.setattr(config_manager.os, "replace", lambda a, b: writes.append(b) or original_replace(a, b))
+
+    for i in range(10):
+        config = config_manager.load_config()
+        config["notes"][f"ts_{i}"] = f"note {i}"
+        config_manager.save_config(config)
+    assert writes == []
+    assert len(config_manager.load_config()["notes"]) == 10
+
+    config_manager.flush_config()
+    assert len(writes) == 1
+    on_disk = json.loads((backup_root / CONFIG_FILE_NAME).read_text(encoding="utf-8"))
+    assert len(on_disk["notes"]) == 10
+
+
+def test_load_only_rereads_when_file_changes(save_env, monkeypatch):
+    _, backup_root = save_env
+    store = config_manager.ConfigStore()
+    monkeypatch.setattr(config_manager, "_store", store)
+    reads = []
+    original_load = json.load
+    monkeypatch.setattr(config_manager.json, "load", lambda f: reads.append(1) or original_load(f))
+
+    config_manager.load_config()
+    config_manager.load_config()["notes"]["leak"] = "must not reach the cache"
+    assert len(reads) == 1
+    assert config_manager.load_config()["notes"] == {}
+
+    config_file = backup_root / CONFIG_FILE_NAME
+    data = json.loads(config_file.read_text(encoding="utf-8"))
+    data["max_history"] = 7
+    config_file.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(config_file, ns=(1, 1))
+    assert config_manager.load_config()["max_history"] == 7
+    assert len(reads) == 2
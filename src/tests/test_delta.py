@@ -0,0 +1,60 @@
+import io
+import os
+
+import pytest
+
+from godforsaken_save_manager.core import delta
+
+
+def _round_trip(base: bytes, target: bytes) -> bytes:
+    patch = io.BytesIO()
+    delta.encode(io.BytesIO(base), io.BytesIO(target), patch)
+    patch.seek(0)
+    out = io.BytesIO()
+    assert delta.apply(io.BytesIO(base), patch, out) == len(target)
+    return patch.getvalue(), out.getvalue()
+
+
+def test_small_edits_produce_small_deltas():
+    base = os.urandom(256 * 1024)
+    target = bytearray(base)
+    target[1000:1010] = b"x" * 10
+    target[200_000:200_004] = b"edit"
+    target += b"appended tail"
+
+    patch, rebuilt = _round_trip(base, bytes(target))
+    assert rebuilt == target
+    assert len(patch) < 3 * delta.DEFAULT_BLOCK_SIZE
+
+
+def test_shifted_data_is_still_copied():
+    base = os.urandom(300 * 1024)
+    # Inserting and removing bytes moves everything behind them off the block grid
+    target = base[:100_000] + os.urandom(700) + base[100_000:200_000] + base[200_500:]
+
+    patch, rebuilt = _round_trip(base, target)
+    assert rebuilt == target
+    assert len(patch) < len(target) // 50
+
+
+def test_unrelated_and_empty_inputs_round_trip():
+    for base, target in [(b"", b"new file"), (b"old file", b""), (os.urandom(10_000), os.urandom(9_000))]:
+        _, rebuilt = _round_trip(base, target)
+        assert rebuilt == target
+
+
+def test_encoding_stops_once_the_budget_is_exceeded():
+    base, target = os.urandom(512 * 1024), os.urandom(512 * 1024)
+    patch = io.BytesIO()
+    size = delta.encode(io.BytesIO(base), io.BytesIO(target), patch, max_size=len(target) // 4)
+
+    assert size > len(target) // 4
+    assert len(patch.getvalue()) == size < len(target) // 2
+
+
+def test_apply_rejects_wrong_base():
+    patch = io.BytesIO()
+    delta.encode(io.BytesIO(b"a" * 5000), io.BytesIO(b"a" * 4000 + b"b"), patch)
+    patch.seek(0)
+    with pytest.raises(delta.DeltaError):
+        delta.apply(io.BytesIO(b"a" * 10), patch, io.BytesIO())
@@ -1 +1,58 @@
-# Tests for FileOperations will go here
+import os
+
+import pytest
+
+from godforsaken_save_manager.core import file_operations
+
+
+def _make_tree(root):
+    (root / "sub" / "empty").mkdir(parents=True)
+    (root / "a.sav").write_bytes(b"a" * 3000)
+    (root / "sub" / "b.sav").write_bytes(os.urandom(5000))
+    os.utime(root / "a.sav", (1_600_000_000, 1_600_000_000))
+
+
+@pytest.mark.parametrize("use_sendfile", [True, False])
+def test_copy_tree_copies_content_metadata_and_reports_progress(tmp_path, monkeypatch, use_sendfile):
+    monkeypatch.setattr(file_operations, "_HAS_SENDFILE", use_sendfile and hasattr(os, "sendfile"))
+    monkeypatch.setattr(file_operations, "COPY_BUFFER_SIZE", 1024)
+    monkeypatch.setattr(file_operations, "_buffers", type(file_operations._buffers)())
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+
+    reports = []
+    stats = file_operations.copy_directory(
+        src, dst, progress_callback=lambda p: reports.append((p.files_done, p.bytes_done, p.bytes_total))
+    )
+
+    assert (dst / "sub" / "empty").is_dir()
+    assert (dst / "sub" / "b.sav").read_bytes() == (src / "sub" / "b.sav").read_bytes()
+    assert os.path.getmtime(dst / "a.sav") == 1_600_000_000
+    assert reports[-1] == (2, 8000, 8000)
+    assert stats.files == 2 and stats.bytes == 8000
+
+
+def test_copy_directory_refuses_existing_destination(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    dst.mkdir()
+    with pytest.raises(FileExistsError):
+        file_operations.copy_directory(src, dst)
+
+
+def test_parallel_copy_tree_matches_source(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    for i in range(20):
+        (src / f"dir_{i % 3}").mkdir(parents=True, exist_ok=True)
+        (src / f"dir_{i % 3}" / f"slot_{i}.sav").write_bytes(os.urandom(100 + i))
+
+    stats = file_operations.copy_tree(src, dst, workers=4)
+
+    assert stats.files == 20
+    for path in src.rglob("*.sav"):
+        assert (dst / path.relative_to(src)).read_bytes() == path.read_bytes()
+
+
+def test_run_parallel_stops_on_cancel():
+    with pytest.raises(file_operations.OperationCancelled):
+        file_operations.run_parallel(lambda x: x, list(range(10)), workers=4, cancel_check=lambda: True)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from godforsaken_save_manager.core.backup_manager import BackupManager
+from godforsaken_save_manager.core.save_watcher import SaveWatcher
+
+from .conftest import write_save
+
+
+def test_write_burst_produces_one_settled_snapshot(save_env):
+    game_save, _ = save_env
+    write_save(game_save, {"slot_0.sav": b"start"})
+    manager = BackupManager()
+    created = []
+    done = threading.Event()
+
+    def on_settled():
+        created.append(manager.backup_if_changed())
+        done.set()
+        return True
+
+    watcher = SaveWatcher(game_save, on_settled, settle_seconds=0.3, poll_interval=0.05)
+    watcher.start()
+    try:
+        for i in range(5):
+            (game_save / "slot_0.sav").write_bytes(bytes([i]) * 10)
+            write_save(game_save, {}, profile_mtime=1_700_000_000 + i)
+            time.sleep(0.05)
+        assert done.wait(5)
+        time.sleep(0.5)
+    finally:
+        watcher.stop(timeout=5)
+
+    assert len(created) == 1
+    backups = manager.list_backups()
+    assert [b.timestamp for b in backups] == created
+    assert backups[0].auto
+
+
+class _OneShotBackend:
+    """Reports a single change, then stays quiet like an idle native backend."""
+
+    def __init__(self, changed):
+        self.changed = changed
+        self.woken = False
+
+    def wait(self, stop_event):
+        if not self.woken:
+            self.woken = True
+            self.changed.wait()
+            return True
+        stop_event.wait()
+        return False
+
+    def close(self):
+        pass
+
+
+def test_declined_report_is_retried_without_another_change(save_env, monkeypatch):
+    game_save, _ = save_env
+    write_save(game_save, {"slot_0.sav": b"start"})
+    calls = []
+    accepted = threading.Event()
+    changed = threading.Event()
+
+    def on_settled():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return False
+        accepted.set()
+        return True
+
+    watcher = SaveWatcher(game_save, on_settled, settle_seconds=0.1, poll_interval=0.05, retry_seconds=0.1)
+    backend = _OneShotBackend(changed)
+    monkeypatch.setattr(watcher, "_create_backend", lambda: backend)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        (game_save / "slot_0.sav").write_bytes(b"changed")
+        changed.set()
+        assert accepted.wait(5)
+    finally:
+        watcher.stop(timeout=5)
+    assert len(calls) == 2
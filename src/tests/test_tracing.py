@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from godforsaken_save_manager.core import tracing
+
+from .conftest import write_save
+
+
+def test_disabled_tracing_leaves_functions_untouched():
+    if tracing.ENABLED:
+        return
+
+    def func():
+        return 1
+
+    assert tracing.traced()(func) is func
+    with tracing.span("noop") as span:
+        span.add("bytes", 10)
+    assert tracing.totals() == {}
+
+
+def test_chrome_trace_records_backup_counters(save_env, tmp_path):
+    game_save, backup_root = save_env
+    write_save(game_save, {f"slot_{i}.sav": bytes([i]) * 1000 for i in range(4)})
+    trace_file = tmp_path / "trace.json"
+    # Tracing is switched on at import time, so it needs a fresh interpreter
+    code = textwrap.dedent(f"""
+        from pathlib import Path
+        from godforsaken_save_manager.core import config_manager
+        config_manager.DEFAULT_BACKUP_ROOT_PATH = Path({str(backup_root)!r})
+        from godforsaken_save_manager.core.backup_manager import BackupManager
+        manager = BackupManager()
+        manager.config["copy_workers"] = 2
+        manager.backup()
+    """)
+    env = dict(os.environ, GFSM_TRACE="chrome", GFSM_TRACE_FILE=str(trace_file))
+    src_dir = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", code], cwd=src_dir, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    trace = json.loads(trace_file.read_text(encoding="utf-8"))
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    backup = events["backup_manager.BackupManager.backup"]
+    # Copies made on worker threads count towards the backup span
+    assert backup["args"]["files"] == 5
+    assert backup["args"]["bytes"] == 4000 + len(b"profile")
+    assert "config.write" in events
+    assert trace["otherData"]["totals"]["files"] == 5
@@ -0,0 +1,66 @@
+import json
+
+from godforsaken_save_manager.i18n import translator
+from godforsaken_save_manager.i18n.translator import Language, Translator
+
+
+def _translator_with(tmp_path, tree, cache_dir=None) -> Translator:
+    langs = tmp_path / "i18n" / "langs"
+    langs.mkdir(parents=True, exist_ok=True)
+    (langs / "en_US.json").write_text(json.dumps(tree), encoding="utf-8")
+    instance = Translator(cache_dir=cache_dir)
+    instance._base_path = tmp_path
+    assert instance.set_language(Language.ENGLISH)
+    return instance
+
+
+def test_lookup_formatting_and_misses(tmp_path):
+    instance = _translator_with(tmp_path, {"ui": {
+        "title": "Manager v{version}",
+        "size": "{mb:.1f} MB",
+        "plain": "Use {{braces}}",
+        "positional": "Item {0}",
+    }})
+
+    assert instance.t("ui.title", version="1.0") == "Manager v1.0"
+    assert instance.t("ui.size", mb=2.25) == "2.2 MB"
+    # Missing parameters and positional fields leave the text as it is
+    assert instance.t("ui.title") == "Manager v{version}"
+    assert instance.t("ui.title", other=1) == "Manager v{version}"
+    assert instance.t("ui.positional", x=1) == "Item {0}"
+    assert instance.t("ui.plain") == "Use {{braces}}"
+    assert instance.t("ui.plain", x=1) == "Use {braces}"
+
+    assert instance.t("ui.nope") == "ui.nope"
+    assert instance.t("ui") == "ui"
+    instance.t("ui.nope")
+    assert instance.get_misses() == {"ui.nope": 2, "ui": 1}
+    assert "ui.nope" in instance.misses_report()
+
+
+def test_compiled_table_is_cached_until_the_json_changes(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    instance = _translator_with(tmp_path / "first", {"a": {"b": "first {n}"}}, cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+    cache_file = next(cache_dir.iterdir())
+
+    # The same file extracted to another directory reads the cache without parsing the JSON
+    def no_parse(tree):
+        raise AssertionError("the JSON should not be compiled again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(translator, "_compile", no_parse)
+        cached = _translator_with(tmp_path / "second", {"a": {"b": "first {n}"}}, cache_dir)
+    assert cached.t("a.b", n=1) == "first 1"
+
+    instance = _translator_with(tmp_path / "second", {"a": {"b": "second {n}"}}, cache_dir)
+    assert instance.t("a.b", n=2) == "second 2"
+    assert list(cache_dir.iterdir()) == [cache_file]
+
+
+def test_shipped_languages_have_the_same_keys():
+    flat = {}
+    for language in Language.get_all_languages():
+        path = translator.get_base_path() / "i18n" / "langs" / f"{language}.json"
+        flat[language] = translator._flatten(json.loads(path.read_text(encoding="utf-8")))
+    assert flat[Language.ENGLISH].keys() == flat[Language.CHINESE_SIMPLIFIED].keys()
@@ -0,0 +1,241 @@
+import hashlib
+import io
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from godforsaken_save_manager.core import delta, updater
+from godforsaken_save_manager.core.updater import NEW_EXE_NAME, Updater
+
+
+class StandIn:
+    """A local HTTP server that serves files from memory and can cut responses short."""
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        self.support_ranges = True
+        # Closes the connection after this many body bytes, once
+        self.cut_after = None
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in.requests.append((self.path, dict(self.headers)))
+                body = stand_in.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start, end, status = 0, len(body) - 1, 200
+                range_header = self.headers.get("Range")
+                if range_header and stand_in.support_ranges:
+                    first, last = range_header.removeprefix("bytes=").split("-")
+                    start = int(first)
+                    end = min(int(last), end) if last else end
+                    if start >= len(body):
+                        self.send_error(416)
+                        return
+                    status = 206
+                payload = body[start:end + 1]
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                self.end_headers()
+                if stand_in.cut_after is not None:
+                    cut, stand_in.cut_after = stand_in.cut_after, None
+                    self.wfile.write(payload[:cut])
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload)
+
+        return Handler
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    server.server = ThreadingHTTPServer(("127.0.0.1", 0), server.handler())
+    thread = threading.Thread(target=server.server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def _updater_for(stand_in, tmp_path, payload: bytes, **kwargs) -> Updater:
+    stand_in.files["/app.exe"] = payload
+    instance = Updater(session=requests.Session(), download_dir=str(tmp_path), **kwargs)
+    instance.latest_version_info = {
+        "version": "9.9.9",
+        "url": stand_in.url("/app.exe"),
+        "sha256": hashlib.sha256(payload).hexdigest(),
+    }
+    return instance
+
+
+def test_download_verifies_and_reports_progress(stand_in, tmp_path):
+    payload = bytes(range(256)) * 10_000
+    progress = []
+    path = _updater_for(stand_in, tmp_path, payload).download_and_verify(progress.append)
+
+    assert path == str(tmp_path / NEW_EXE_NAME)
+    assert (tmp_path / NEW_EXE_NAME).read_bytes() == payload
+    assert progress[-1] == 100
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_checksum_mismatch_discards_the_download(stand_in, tmp_path):
+    instance = _updater_for(stand_in, tmp_path, b"new build")
+    instance.latest_version_info["sha256"] = hashlib.sha256(b"other").hexdigest()
+
+    assert instance.download_and_verify() is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_interrupted_download_resumes_with_range(stand_in, tmp_path):
+    payload = bytes(range(256)) * 8_000
+    stand_in.cut_after = 300_000
+    path = _updater_for(stand_in, tmp_path, payload).download_and_verify()
+
+    assert path and (tmp_path / NEW_EXE_NAME).read_bytes() == payload
+    ranges = [headers.get("Range") for _, headers in stand_in.requests]
+    assert ranges == [None, "bytes=300000-"]
+
+
+def test_cancelled_download_is_resumed_by_the_next_attempt(stand_in, tmp_path, monkeypatch):
+    monkeypatch.setattr(updater, "DOWNLOAD_BUFFER_SIZE", 64 * 1024)
+    payload = bytes(range(256)) * 4_000
+    instance = _updater_for(stand_in, tmp_path, payload)
+    assert instance.download_and_verify(cancel_check=lambda: True) is None
+    kept = next(tmp_path.glob("*.part")).stat().st_size
+    assert 0 < kept < len(payload)
+
+    assert instance.download_and_verify()
+    assert (tmp_path / NEW_EXE_NAME).read_bytes() == payload
+    assert stand_in.requests[-1][1]["Range"] == f"bytes={kept}-"
+
+
+def test_server_without_ranges_restarts_from_the_beginning(stand_in, tmp_path):
+    payload = b"x" * 500_000
+    stand_in.support_ranges = False
+    stand_in.cut_after = 100_000
+    assert _updater_for(stand_in, tmp_path, payload).download_and_verify()
+    assert (tmp_path / NEW_EXE_NAME).read_bytes() == payload
+
+
+def test_parallel_ranged_download(stand_in, tmp_path, monkeypatch):
+    monkeypatch.setattr(updater, "DOWNLOAD_CHUNK_SIZE", 64 * 1024)
+    payload = hashlib.sha256(b"seed").digest() * 40_000
+    path = _updater_for(stand_in, tmp_path, payload, download_workers=4).download_and_verify()
+
+    assert path and (tmp_path / NEW_EXE_NAME).read_bytes() == payload
+    chunk_requests = [h["Range"] for _, h in stand_in.requests if h.get("Range") not in (None, "bytes=0-0")]
+    assert len(chunk_requests) == -(-len(payload) // (64 * 1024))
+
+
+def _publish_release(stand_in, version: str):
+    stand_in.files["/version.json"] = json.dumps({"version": version, "url": stand_in.url("/app.exe"),
+                                                  "sha256": "0" * 64}).encode()
+    stand_in.files["/releases/latest"] = json.dumps({
+        "tag_name": f"v{version}",
+        "assets": [{"name": "version.json", "browser_download_url": stand_in.url("/version.json")}],
+    }).encode()
+
+
+def _checking_updater(stand_in, tmp_path, check_interval: float) -> Updater:
+    instance = Updater(session=requests.Session(), check_interval=check_interval,
+                       cache_path=str(tmp_path / "update_cache.json"))
+    instance.api_url = stand_in.url("/releases/latest")
+    instance.current_version = "1.0.0"
+    return instance
+
+
+def test_update_check_revalidates_cached_metadata(stand_in, tmp_path):
+    _publish_release(stand_in, "1.1.0")
+    assert _checking_updater(stand_in, tmp_path, 0).check_for_update()["version"] == "1.1.0"
+    assert len(stand_in.requests) == 2
+
+    stand_in.requests.clear()
+    assert _checking_updater(stand_in, tmp_path, 0).check_for_update()["version"] == "1.1.0"
+    assert len(stand_in.requests) == 2
+    assert all("If-None-Match" in headers for _, headers in stand_in.requests)
+
+    # A new release replaces the cached documents
+    _publish_release(stand_in, "1.2.0")
+    assert _checking_updater(stand_in, tmp_path, 0).check_for_update()["version"] == "1.2.0"
+
+
+def test_update_check_is_throttled_by_the_interval(stand_in, tmp_path):
+    _publish_release(stand_in, "1.1.0")
+    _checking_updater(stand_in, tmp_path, 3600).check_for_update()
+    stand_in.requests.clear()
+
+    assert _checking_updater(stand_in, tmp_path, 3600).check_for_update()["version"] == "1.1.0"
+    assert stand_in.requests == []
+
+    assert _checking_updater(stand_in, tmp_path, 3600).check_for_update(force=True)
+    assert len(stand_in.requests) == 2
+
+
+def _delta_release(stand_in, tmp_path, base: bytes, target: bytes) -> Updater:
+    encoded = io.BytesIO()
+    delta.encode(io.BytesIO(base), io.BytesIO(target), encoded)
+    stand_in.files["/app.delta"] = encoded.getvalue()
+    instance = _updater_for(stand_in, tmp_path, target)
+    instance.current_version = "1.0.0"
+    instance.latest_version_info["deltas"] = [{
+        "from": "1.0.0",
+        "url": stand_in.url("/app.delta"),
+        "sha256": hashlib.sha256(encoded.getvalue()).hexdigest(),
+        "base_size": len(base),
+    }]
+    instance.base_executable = str(tmp_path / "current.exe")
+    (tmp_path / "current.exe").write_bytes(base)
+    return instance
+
+
+def test_delta_update_patches_the_running_executable(stand_in, tmp_path):
+    base = random.Random(0).randbytes(300_000)
+    target = base[:100_000] + b"patched" * 100 + base[100_000:]
+    progress = []
+    path = _delta_release(stand_in, tmp_path, base, target).download_and_verify(progress.append)
+
+    assert path and (tmp_path / NEW_EXE_NAME).read_bytes() == target
+    assert [p for p, _ in stand_in.requests] == ["/app.delta"]
+    assert progress[-1] == 100
+    assert not (tmp_path / updater.DELTA_FILE_NAME).exists()
+
+
+def test_delta_update_falls_back_to_the_full_download(stand_in, tmp_path):
+    base = random.Random(0).randbytes(300_000)
+    target = base[:100_000] + b"patched" * 100 + base[100_000:]
+    instance = _delta_release(stand_in, tmp_path, base, target)
+    # Same size but different content: the patched result fails verification
+    (tmp_path / "current.exe").write_bytes(bytes(len(base)))
+
+    assert instance.download_and_verify()
+    assert (tmp_path / NEW_EXE_NAME).read_bytes() == target
+    assert [p for p, _ in stand_in.requests] == ["/app.delta", "/app.exe"]